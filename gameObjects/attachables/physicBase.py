@@ -16,7 +16,7 @@ import inspect
 import traceback
 import uuid as uid
 
-import pybullet as p
+import modules.physicsApi as p
 
 from dataclasses import dataclass, field
 
@@ -207,6 +207,11 @@ class PhysicBase( PhysicLink ):
             kwargs["contactStiffness"] = collision.stiffness
             kwargs["contactDamping"] = collision.damping
 
+        # bodies are created before the physics clock reads the scene, use the scene setting
+        if link_index < 0:
+            sleeping = self.context.scene.getCurrentScene()["physics_sleeping"]
+            kwargs["activationState"] = p.ACTIVATION_STATE_ENABLE_SLEEPING if sleeping else p.ACTIVATION_STATE_DISABLE_SLEEPING
+
         p.changeDynamics( self.physics_id, link_index, **kwargs )
 
         # when link/joint is not base, ensure it spins freely
@@ -327,28 +332,16 @@ class PhysicBase( PhysicLink ):
 
         is_base_physic = bool(self.gameObject.children)
 
-        world_position, world_rotation_quat = p.getBasePositionAndOrientation(self.physics_id)
-        # getLinkState
-
-        # Update world transform (ignore scale for physics)
-        _model_matrix = (
-            self.gameObject.transform.compose_matrix(
-                world_position,
-                Quaternion([
-                    world_rotation_quat[0], 
-                    world_rotation_quat[1], 
-                    world_rotation_quat[2], 
-                    -world_rotation_quat[3] # ~handedness
-                ]),
-                self.gameObject.transform.local_scale
-            )
-        )
-
-        # Recompute local transform when base physic (PhysicBase + nested children) 
-        # or gameObject a single world physic with mass
+        # Physics-owned transform when base physic (PhysicBase + nested children) 
+        # or gameObject a single world physic with mass, local transform is derived on read
         if is_base_physic or self.inertia.mass > 0.0:
-            self.gameObject.transform.world_model_matrix = _model_matrix
-            self.gameObject.transform._update_local_from_world( ignore_scale=True )
+            # composed by the bulk readback (ignore scale for physics), None when sleeping
+            _model_matrix = self.context.physics_sync.matrix( self.gameObject.uuid )
+
+            if _model_matrix is None:
+                return False
+
+            self.gameObject.transform.set_world_matrix_from_physics( _model_matrix )
 
             # do this in compute?
             # visual matrix
@@ -18,7 +18,7 @@ import inspect
 import traceback
 import uuid as uid
 
-import pybullet as p
+import modules.physicsApi as p
 
 class PhysicLink:
     class GeometryType_(enum.IntEnum):
@@ -349,41 +349,14 @@ class PhysicLink:
         if not self.runtime_base_physic or self.runtime_base_physic.physics_id is None:
             return False
 
-        # linkWorldPosition (COM)	    state[0]
-        # linkWorldOrientation (COM)	state[1]
-        # localInertialFramePosition	state[2]
-        # localInertialFrameOrientation	state[3]
-        # worldLinkFramePosition	    state[4]
-        # worldLinkFrameOrientation	    state[5]
-        state = p.getLinkState(
-            self.runtime_base_physic.physics_id,
-            self.runtime_link_index,
-            computeForwardKinematics=True
-        )
+        # worldLinkFrame state of the bulk readback (getLinkStates), None when sleeping
+        _model_matrix = self.context.physics_sync.matrix( self.gameObject.uuid )
 
-        if not state:
+        if _model_matrix is None:
             return False
 
-        world_position = state[4]
-        world_rotation_quat = state[5]
-
-        # Update world transform (ignore scale for physics)
-        _model_matrix = (
-            self.gameObject.transform.compose_matrix(
-                world_position,
-                Quaternion([
-                    world_rotation_quat[0],
-                    world_rotation_quat[1],
-                    world_rotation_quat[2],
-                    -world_rotation_quat[3]
-                ]),
-                self.gameObject.transform.local_scale
-            )
-        )
-
-        # Always recompute local transform when parented (PhysicLink)
-        self.gameObject.transform.world_model_matrix = _model_matrix
-        self.gameObject.transform._update_local_from_world( ignore_scale=True )
+        # physics-owned, local transform relative to the parent is derived on read
+        self.gameObject.transform.set_world_matrix_from_physics( _model_matrix )
 
         # legacy, pre-compute on CPU
         # else, matrices are uploaded to SSBO, and composed on the GPU
@@ -29,6 +29,11 @@ class Transform:
         # physic stuff
         self.is_physic_shape = False
 
+        # physics-owned: world matrix set by the physics engine, local position and rotation
+        # are derived on first read, relative to the parent matrix at the time of the step
+        self._local_stale           : bool = False
+        self._physics_parent_matrix : Matrix44 = None
+
         # coordination
         # row-major, post-multiply, intrinsic rotation
         # R = Rx * Ry * Rz
@@ -37,13 +42,20 @@ class Transform:
         self._local_rotation        = self.vectorInterface( rotation,   local_callback, name )
         self._local_scale           = self.vectorInterface( scale,      local_callback, name )
         self._local_rotation_quat   : Quaternion = Quaternion(self.euler_to_quat(self._local_rotation))
+
+        # bumped on every world_model_matrix assignment, world decompositions are cached per version
+        self._world_version         : int = 0
+        self._position_version      : int = -1
+        self._rotation_version      : int = -1
+        self._scale_version         : int = -1
+
         self.world_model_matrix     : Matrix44 = self._createWorldModelMatrix()
 
         # Proxy/passthrough: unlike local transforms, world transforms are not stored;
         # they are always computed from the current model matrix.
         #
         # Each vectorInterface instance acts as a *live proxy*:
-        #   - data is updated on every access.
+        #   - data is refreshed on the first access after world_model_matrix changed.
         #   - Element-wise writes (e.g. position[1] = 10) trigger the setter.
         #   - Whole-value writes (e.g. position = [0,0,0]) also trigger the setter.
         #   - This allows transparent editing from scripts and the editor GUI.
@@ -51,6 +63,8 @@ class Transform:
         self._world_rotation_proxy  = self.vectorInterface( self.extract_euler(),       None, name, setter=self.set_rotation )
         self._world_scale_proxy     = self.vectorInterface( self.extract_scale(),       None, name, setter=self.set_scale )
 
+        self._position_version = self._rotation_version = self._scale_version = self._world_version
+
     @staticmethod
     def vec_to_degrees( v ):
         return [math.degrees(x) for x in v]
@@ -130,10 +144,16 @@ class Transform:
     # local position
     @property
     def local_position(self):
+        if self._local_stale:
+            self._sync_local_from_physics()
+
         return self._local_position
     
     @local_position.setter
     def local_position(self, data):
+        if self._local_stale:
+            self._sync_local_from_physics()
+
         self._local_position.__setitem__(slice(None), data)
 
     def set_local_position( self, data : list ):
@@ -143,10 +163,16 @@ class Transform:
     # local rotation (euler)
     @property
     def local_rotation(self):
+        if self._local_stale:
+            self._sync_local_from_physics()
+
         return self._local_rotation
     
     @local_rotation.setter
     def local_rotation(self, data):
+        if self._local_stale:
+            self._sync_local_from_physics()
+
         self._local_rotation.__setitem__(slice(None), data)
 
     def set_local_rotation( self, data : list ):
@@ -169,6 +195,18 @@ class Transform:
     #
     # WORLD (slave)
     # 
+    # model matrix
+    @property
+    def world_model_matrix( self ) -> Matrix44:
+        return self._world_model_matrix
+
+    @world_model_matrix.setter
+    def world_model_matrix( self, matrix : Matrix44 ) -> None:
+        """Assign a new model matrix, invalidates the cached world decompositions.
+        Always assign a new matrix, in-place changes are not detected."""
+        self._world_model_matrix = matrix
+        self._world_version += 1
+
     # world position
     @property
     def position( self ):
@@ -178,12 +216,15 @@ class Transform:
             world transforms are not stored, it is always computed from the latest model matrix
             A persistent proxy Transform.VectorInterface instance:
 
-            - dats is updated on every access
+            - data is updated on first access after the model matrix changed
             - writes are forwarded to set_position() - as list
             - allows writes from scripts and editor gui
 
         """
-        self._world_position_proxy.__setitem__(slice(None), tuple(self.extract_position()))
+        if self._position_version != self._world_version:
+            self._world_position_proxy.__setitem__(slice(None), tuple(self.extract_position()))
+            self._position_version = self._world_version
+
         return self._world_position_proxy
 
     @position.setter
@@ -213,12 +254,15 @@ class Transform:
             world transforms are not stored, it is always computed from the latest model matrix
             A persistent proxy Transform.VectorInterface instance:
 
-            - dats is updated on every access
+            - data is updated on first access after the model matrix changed
             - writes are forwarded to set_rotation() - as list
             - allows writes from scripts and editor gui
 
         """
-        self._world_rotation_proxy.__setitem__(slice(None), tuple(self.extract_euler()))
+        if self._rotation_version != self._world_version:
+            self._world_rotation_proxy.__setitem__(slice(None), tuple(self.extract_euler()))
+            self._rotation_version = self._world_version
+
         return self._world_rotation_proxy
 
     @rotation.setter
@@ -249,12 +293,15 @@ class Transform:
             world transforms are not stored, it is always computed from the latest model matrix
             A persistent proxy Transform.VectorInterface instance:
 
-            - dats is updated on every access
+            - data is updated on first access after the model matrix changed
             - writes are forwarded to set_scale() - as list
             - allows writes from scripts and editor gui
 
         """      
-        self._world_scale_proxy.__setitem__(slice(None), tuple(self.extract_scale()))
+        if self._scale_version != self._world_version:
+            self._world_scale_proxy.__setitem__(slice(None), tuple(self.extract_scale()))
+            self._scale_version = self._world_version
+
         return self._world_scale_proxy
 
     @scale.setter
@@ -278,13 +325,23 @@ class Transform:
         """Lambda/Proxy wrapper"""
         self.scale = list( data )
 
-    def _update_local_from_world( self, ignore_scale : bool = False ):
-        """Recompute local transform from world transform and parent safely."""
+    def _update_local_from_world( self, ignore_scale : bool = False, parent_matrix : Matrix44 = None ):
+        """Recompute local transform from world transform and parent safely.
+        
+        :param ignore_scale: Keep the current local scale
+        :type ignore_scale: bool
+        :param parent_matrix: Parent world matrix to use instead of the current one
+        :type parent_matrix: Matrix44
+        """
+        self._local_stale = False
     
         world_matrix = Matrix44(self.world_model_matrix)
 
         if self.gameObject.parent is not None:
-            parent_inv = self._getParentModelMatrix().inverse
+            if parent_matrix is None:
+                parent_matrix = self._getParentModelMatrix()
+
+            parent_inv = parent_matrix.inverse
             local_matrix = parent_inv * world_matrix
         else:
             local_matrix = world_matrix
@@ -299,6 +356,27 @@ class Transform:
         self._local_rotation_quat = Quaternion(rot_quat)
         self.local_rotation = tuple(self.quat_to_euler(self._local_rotation_quat))
 
+    #
+    # physics-owned
+    #
+    def set_world_matrix_from_physics( self, matrix : Matrix44 ) -> None:
+        """Fast path for physics driven transforms, stores the world matrix directly.
+        Local position and rotation are only derived when read (inspector, scripts, save).
+
+        :param matrix: The new world matrix, not modified afterwards
+        :type matrix: Matrix44
+        """
+        self.world_model_matrix = matrix
+
+        # children of another gameObject derive locals relative to the parent at this step
+        self._physics_parent_matrix = self._getParentModelMatrix() if self.gameObject.parent is not None else None
+        self._local_stale = True
+
+    def _sync_local_from_physics( self ) -> None:
+        """Derive local position and rotation from the physics-owned world matrix"""
+        self._update_local_from_world( ignore_scale=True, parent_matrix=self._physics_parent_matrix )
+        self._physics_parent_matrix = None
+
     def compose_matrix( self, position, quat, scale) -> Matrix44:
         T = Matrix44.from_translation(position)
         R = Matrix44.from_quaternion(quat)
@@ -325,6 +403,9 @@ class Transform:
         if local_matrix is not None:
             _local_model_matrix = local_matrix
         else:
+            if self._local_stale:
+                self._sync_local_from_physics()
+
             _local_model_matrix = self.compose_matrix(
                 self._local_position,
                 self._local_rotation_quat,
@@ -16,6 +16,7 @@ from modules.cubemap import Cubemap
 from modules.material import Materials
 from modules.images import Images
 from modules.models import Models
+from modules.debugDraw import DebugDraw
 from gameObjects.attachables.transform import Transform
 from modules.script import Script
 
@@ -31,7 +32,7 @@ import importlib
 import traceback
 
 import copy
-import pybullet as p
+import modules.physicsApi as p
 import uuid as uid
 
 class GameObject( Context, Transform ):
@@ -102,6 +103,8 @@ class GameObject( Context, Transform ):
 
         self._dirty         : GameObject.DirtyFlag_ = GameObject.DirtyFlag_.all
         self._removed       : bool = False   
+        self.context.transform_system.mark( self )
+        self.context.update_scheduler.mark_dirty( self )
         
         #
         # attachables
@@ -152,8 +155,16 @@ class GameObject( Context, Transform ):
                      Defaults to DirtyFlag_.all.
         :type flag: DirtyFlag_
         """
-        if not self._dirty:
-            self._dirty = flag
+        # merge, an object that is already dirty for other state(s) still needs these
+        changed : bool = ( self._dirty & flag ) != flag
+
+        # world matrix may have been resolved already while the flag is still set
+        if flag & GameObject.DirtyFlag_.transform:
+            changed |= self.context.transform_system.mark( self )
+
+        if changed:
+            self._dirty |= flag
+            self.context.update_scheduler.mark_dirty( self )
 
             for c in self.children.values():
                 c._mark_dirty( flag )
@@ -429,6 +440,8 @@ class GameObject( Context, Transform ):
             parent.children[self.uuid] = self
 
         self.parent = parent
+        self.context.transform_system.invalidate()
+        self.context.update_scheduler.reparent( self )
 
         # update local transform in relation to new parent
         if update:
@@ -450,7 +463,17 @@ class GameObject( Context, Transform ):
         self.dispatch_script_base_method("onStart")
 
     def onUpdateScripts(self):
-        self.dispatch_script_base_method("onUpdate")
+        """Invoke onUpdate for each attached script that is due this frame, see Script.update()"""
+        if not self.hierachyActive():
+            return
+
+        for script in filter( lambda x: x.instance is not None, self.scripts ):
+            try:
+                script.update( self.renderer.deltaTime )
+
+            except Exception as e:
+                _, _, exc_tb = sys.exc_info()
+                self.console.error( e, traceback.format_tb( exc_tb ) )
 
     def onEnableScripts(self):
         self.dispatch_script_base_method("onEnable")
@@ -474,6 +497,7 @@ class GameObject( Context, Transform ):
 
         # append the script to the GameObject, even if it contains errors
         self.scripts.append( script )
+        self.context.update_scheduler.set_scripted( self )
 
     def removeScript( self, script : Script ):
         """Remove script from a gameObject
@@ -485,6 +509,7 @@ class GameObject( Context, Transform ):
         for x in self.scripts:
             if x.path == script.path:
                 self.scripts.remove( script )
+                self.context.update_scheduler.set_scripted( self )
                 return
 
     def dispatch_script_base_method( self, method_name : str ):
@@ -585,6 +610,8 @@ class GameObject( Context, Transform ):
         self.material                   = state["material"]
         self.children                   = state["children"]
         self.parent                     = state["parent"]
+        self.context.transform_system.invalidate()
+        self.context.update_scheduler.reparent( self )
         #self.scripts                    = copy.deepcopy(state["scripts")
 
         if "PhysicBase" in state: 
@@ -648,8 +675,8 @@ class GameObject( Context, Transform ):
 
         if self._dirty & GameObject.DirtyFlag_.transform:
             #if self.hierachyActive(): # not required
-            self.transform._local_rotation_quat = self.transform.euler_to_quat( self.transform.local_rotation )
-            self.transform._createWorldModelMatrix()
+            # batched, the first dirty object of a frame resolves all pending transforms
+            self.context.transform_system.resolve( self )
 
             _physic = self.get_physic()
 
@@ -713,32 +740,17 @@ class GameObject( Context, Transform ):
             _physic = None
 
         if _physic is not None:
-            _color = (1.0, 0.55, 0.0, 0.25)
-            glUniform4f( self.renderer.shader.uniforms['uColor'],  _color[0],  _color[1], _color[2], _color[3] )
-
-            #glDisable(GL_DEPTH_TEST)
-            glEnable(GL_BLEND)
-            glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
-
-            glDepthMask(GL_FALSE)
-            glEnable(GL_POLYGON_OFFSET_FILL)
-            glPolygonOffset(-1.0, -1.0)
-
-            glLineWidth(3)
-            glPolygonMode(GL_FRONT_AND_BACK, GL_LINE)
-
-            _collision_model = _physic.collision.model or self.context.models.default_cube
-
-            self.models.draw(
-                _collision_model,
-                _physic.collision.transform._getModelMatrix(),
-                True
-            )
-
-            glDisable(GL_POLYGON_OFFSET_FILL)
-            glDepthMask(GL_TRUE)    # re-enable depth writes
-            glDisable(GL_BLEND)
-            #glEnable(GL_DEPTH_TEST)
-
-            glPolygonMode(GL_FRONT_AND_BACK, GL_FILL)
-            glLineWidth(1)
+            # collected, rendered in batches by DebugDraw.flush()
+            _collision  = _physic.collision
+            _matrix     = _collision.transform._getModelMatrix()
+            _debug      : DebugDraw = self.context.debug
+
+            match _collision.geom_type:
+                case PhysicLink.GeometryType_.box:
+                    _debug.shape( DebugDraw.Shape_.box, _matrix, DebugDraw.COLLIDER_COLOR )
+                case PhysicLink.GeometryType_.sphere:
+                    _debug.shape( DebugDraw.Shape_.sphere, _matrix, DebugDraw.COLLIDER_COLOR )
+                case PhysicLink.GeometryType_.cilinder:
+                    _debug.shape( DebugDraw.Shape_.cylinder, _matrix, DebugDraw.COLLIDER_COLOR )
+                case _:
+                    _debug.mesh( _collision.model or self.context.models.default_cube, _matrix, DebugDraw.COLLIDER_COLOR )
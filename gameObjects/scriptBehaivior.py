@@ -15,6 +15,8 @@ class ScriptBehaivior:
         self.renderer   = context.renderer
         self.scene      = context.scene
         self.console    = context.console
+        self.debug      = context.debug     # debug lines and shapes, eg. self.debug.line( a, b, color )
+        self.transforms = context.transform_system  # bulk transforms, eg. self.transforms.set_local_positions( objects, positions )
 
         self.events     = context.events
         self.key        = context.key
@@ -23,6 +25,9 @@ class ScriptBehaivior:
         self.gameObject = gameObject
         self.transform  = self.gameObject.transform
 
+        # elapsed time in seconds since the previous onUpdate of this script, see update_interval and update_rate
+        self.update_delta : float = 0.0
+
     def onStart( self ):
         """Implemented by script"""
         pass
@@ -39,6 +44,20 @@ class ScriptBehaivior:
         """Implemented by script"""
         pass
 
+    #
+    # update rate
+    #
+    # Scripts can opt into a lower onUpdate rate by overriding these class attributes:
+    #
+    #   class Spawner:
+    #       update_interval : int = 10      # onUpdate every 10th frame
+    #       update_rate     : float = 5.0   # or, onUpdate on a fixed 5 Hz tick (takes precedence)
+    #
+    # use self.update_delta instead of the frame time to scale per-update work
+    #
+    update_interval : int   = 1
+    update_rate     : float = 0.0
+
     #
     # export class attributes
     #
@@ -37,6 +37,13 @@ class Skybox( Context ):
         self.procedural_cubemap_fbo = None
         self.procedural_cubemap_update = False
 
+        # time-sliced updates render into a back buffer, swapped in once all faces are complete
+        self._back_cubemap      = None
+        self._update_face       : int = -1      # next face to render, -1 when idle
+        self._update_state      : tuple = None  # sun and sky parameters the update is rendered with
+        self._last_state        : tuple = None  # state of the cubemap currently in use
+        self._full_update       : bool = False  # render all faces at once (cubemap has no content yet)
+
         size = 256
         self.skyboxVertices = np.array([
             # positions          
@@ -98,38 +105,74 @@ class Skybox( Context ):
         glBindBuffer( GL_ARRAY_BUFFER, 0 );
         glBindVertexArray( 0 );
 
-    def extract_procedural_cubemap( self, scene : "SceneManager.Scene" = None ) -> None:
-        """Extract the prodedural sky to a cubemap.
-        
-        Used in:
+    def _sky_state( self, scene : "SceneManager.Scene" ) -> tuple:
+        """Sun direction, sun color and sky parameters the procedural cubemap depends on
 
-            - Environmental reflections (IBL)
-            - Optimization when the procedural skybox is NOT in realtime mode.
+        :return: (light_dir, light_color, sky parameters)
+        :rtype: tuple
+        """
+        _sun : "GameObject" = self.scene.getSun()
+        _sun_active = _sun and _sun.hierachyActive()
+
+        if not self.renderer.game_runtime:
+            _sun_active = _sun_active and _sun.hierachyVisible()
+
+        light_dir   = _sun.transform.local_position if _sun_active else self.settings.default_light_color
+        light_color = _sun.light.light_color        if _sun_active else self.settings.default_ambient_color
+
+        params = tuple( tuple( float(c) for c in scene[key] ) for key in (
+            "procedural_sky_color", "procedural_horizon_color", "procedural_ground_color",
+            "procedural_sunset_color", "procedural_night_color" 
+        ) ) + ( float(scene["procedural_night_brightness"]), )
+
+        return tuple( float(c) for c in light_dir[:3] ), tuple( float(c) for c in light_color[:3] ), params
+
+    def _sky_state_changed( self, state : tuple ) -> bool:
+        """Whether a new state differs enough from the cubemap in use to re-render it.
+        Sun direction changes below 'sky_update_angle' degrees are ignored."""
+        if self._last_state is None:
+            return True
+
+        light_dir, light_color, params = state
+        last_dir, last_color, last_params = self._last_state
+
+        if light_color != last_color or params != last_params:
+            return True
+
+        a = np.array( light_dir, dtype=np.float64 )
+        b = np.array( last_dir, dtype=np.float64 )
+        la, lb = np.linalg.norm( a ), np.linalg.norm( b )
+
+        if la < 1e-8 or lb < 1e-8:
+            return la != lb
+
+        angle = math.degrees( math.acos( float( np.clip( np.dot( a, b ) / ( la * lb ), -1.0, 1.0 ) ) ) )
+        return angle >= self.settings.sky_update_angle
+
+    def _render_faces( self, scene : "SceneManager.Scene", faces : range, cubemap : int, state : tuple ) -> bool:
+        """Render faces of the prodedural sky into a cubemap texture.
 
         Steps:
 
-            1. For each of the 6 cubemap faces:
+            1. For each of the requested cubemap faces:
                 - Position the camera at the origin
                 - Orient the camera using the face side look direction and up vector
                 - Set a 90deg Field-of-view projection
             2. Render the procedural skybox using the same pipeline as realtime mode
                (i.e., call self._draw_procedural, with extract_cubemap=True)
             3. Render into the procedural-sky framebuffer and texture.
-        
+
         :param scene: The scene data
         :type scene: Scene
+        :param faces: The face indices to render (0-5)
+        :type faces: range
+        :param cubemap: The GL cubemap texture to render into
+        :type cubemap: uint32/uintc
+        :param state: The sun and sky state to render with, see _sky_state()
+        :type state: tuple
+        :return: False on framebuffer errors
+        :rtype: bool
         """
-        if self.procedural_cubemap is None:
-            print("Procedural cubemap GlTexture is not invalid")
-            return
-
-        if self.procedural_cubemap_fbo is None:
-            print("Procedural cubemap FBO is not invalid")
-            return
-
-        if scene is None:
-            scene = self.scene.getCurrentScene()
-
         _current_shader = self.renderer.shader
         _current_fbo    = self.renderer.current_fbo
 
@@ -137,9 +180,6 @@ class Skybox( Context ):
         glBindFramebuffer( GL_FRAMEBUFFER, self.procedural_cubemap_fbo )
         glDrawBuffer( GL_COLOR_ATTACHMENT0 )
 
-        cubemap = self.context.cubemaps.cubemap[self.procedural_cubemap]
-        size = self.procedural_cubemap_size
-
         targets = [
             np.array([-1, 0, 0]),  # +X
             np.array([1, 0, 0]),   # -X
@@ -165,7 +205,9 @@ class Skybox( Context ):
             far     = 1000
         )
 
-        for i in range(6):
+        result = True
+
+        for i in faces:
             _view = matrix44.create_look_at( np.zeros(3), targets[i], ups[i] )
 
             glFramebufferTexture2D( GL_FRAMEBUFFER, GL_COLOR_ATTACHMENT0,
@@ -175,16 +217,18 @@ class Skybox( Context ):
             status = glCheckFramebufferStatus( GL_FRAMEBUFFER )
             if status != GL_FRAMEBUFFER_COMPLETE:
                 print( "Framebuffer error:", hex( status ) )
-                return
+                result = False
+                break
 
             glViewport( 0, 0, self.procedural_cubemap_size, self.procedural_cubemap_size )
-            glDisable( GL_DEPTH_TEST )
+            self.renderer.state.disable( GL_DEPTH_TEST )
 
             self._draw_procedural( 
                 scene, 
                 _view, 
                 _projection, 
-                extract_cubemap = True
+                extract_cubemap = True,
+                state           = state
             )
 
         # reset renderer
@@ -195,11 +239,128 @@ class Skybox( Context ):
             self.renderer.bind_fbo( _current_fbo )
 
         self.renderer.setup_projection_matrix()
+
+        return result
+
+    def _on_cubemap_complete( self, state : tuple ) -> None:
+        self._last_state = state
+
+        # prefiltered specular and SH irradiance for IBL
+        # not cached on disk, every sky state differs and is not seen again
+        self.context.cubemaps.process_environment( self.procedural_cubemap, cache=False )
  
         # Update Gui preview
         if self.context.gui.initialized:
             self.context.gui.scene_settings.test_cubemap_update = True
 
+    def extract_procedural_cubemap( self, scene : "SceneManager.Scene" = None ) -> None:
+        """Extract the prodedural sky to a cubemap, all six faces at once.
+        
+        Used in:
+
+            - Environmental reflections (IBL)
+            - Optimization when the procedural skybox is NOT in realtime mode.
+
+        Regular updates are time-sliced, see update_procedural_cubemap()
+        
+        :param scene: The scene data
+        :type scene: Scene
+        """
+        if self.procedural_cubemap is None:
+            print("Procedural cubemap GlTexture is not invalid")
+            return
+
+        if self.procedural_cubemap_fbo is None:
+            print("Procedural cubemap FBO is not invalid")
+            return
+
+        if scene is None:
+            scene = self.scene.getCurrentScene()
+
+        state = self._sky_state( scene )
+        cubemap = self.context.cubemaps.cubemap[self.procedural_cubemap]
+
+        # cancels a time-sliced update in progress
+        self._update_face = -1
+
+        if self._render_faces( scene, range(6), cubemap, state ):
+            self._on_cubemap_complete( state )
+
+    def update_procedural_cubemap( self, scene : "SceneManager.Scene" ) -> None:
+        """Time-sliced procedural cubemap update.
+
+        Requests (procedural_cubemap_update) are skipped when the sun moved less than 'sky_update_angle' degrees
+        and the sky parameters are unchanged. Otherwise 'sky_faces_per_frame' faces are rendered each frame 
+        into a back buffer with the state at the start of the update, the cubemap in use is swapped 
+        once all six faces are complete. Requests during an update start a new one afterwards.
+
+        :param scene: The scene data
+        :type scene: Scene
+        """
+        if self.procedural_cubemap is None or self.procedural_cubemap_fbo is None:
+            return
+
+        if self._full_update:
+            self._full_update = False
+            self.procedural_cubemap_update = False
+            self.extract_procedural_cubemap( scene )
+            return
+
+        # idle, start an update if requested and changed enough
+        if self._update_face < 0:
+            if not self.procedural_cubemap_update:
+                return
+
+            self.procedural_cubemap_update = False
+
+            state = self._sky_state( scene )
+            if not self._sky_state_changed( state ):
+                return
+
+            if self._back_cubemap is None:
+                self._back_cubemap = self._create_cubemap_texture( self.procedural_cubemap_size )
+
+            self._update_state  = state
+            self._update_face   = 0
+
+        faces = range( self._update_face, min( 6, self._update_face + max( 1, self.settings.sky_faces_per_frame ) ) )
+
+        if not self._render_faces( scene, faces, self._back_cubemap, self._update_state ):
+            self._update_face = -1
+            return
+
+        self._update_face = faces.stop
+
+        if self._update_face < 6:
+            return
+
+        # swap the completed back buffer in
+        cubemaps = self.context.cubemaps.cubemap
+        cubemaps[self.procedural_cubemap], self._back_cubemap = self._back_cubemap, cubemaps[self.procedural_cubemap]
+
+        self._update_face = -1
+        self._on_cubemap_complete( self._update_state )
+
+    def _create_cubemap_texture( self, size : int ) -> int:
+        """Create an empty RGBA16F cubemap texture"""
+        cubemap = glGenTextures( 1 )
+
+        glBindTexture( GL_TEXTURE_CUBE_MAP, cubemap )
+
+        for i in range(6):
+            glTexImage2D(GL_TEXTURE_CUBE_MAP_POSITIVE_X + i,
+                         0, GL_RGBA16F,
+                         size, size, 0,
+                         GL_RGBA, GL_FLOAT, None)
+
+        glTexParameteri(GL_TEXTURE_CUBE_MAP, GL_TEXTURE_MAG_FILTER, GL_LINEAR)
+        glTexParameteri(GL_TEXTURE_CUBE_MAP, GL_TEXTURE_MIN_FILTER, GL_LINEAR)
+        glTexParameteri(GL_TEXTURE_CUBE_MAP, GL_TEXTURE_WRAP_S, GL_CLAMP_TO_EDGE)
+        glTexParameteri(GL_TEXTURE_CUBE_MAP, GL_TEXTURE_WRAP_T, GL_CLAMP_TO_EDGE)
+        glTexParameteri(GL_TEXTURE_CUBE_MAP, GL_TEXTURE_WRAP_R, GL_CLAMP_TO_EDGE)
+
+        return cubemap
+
     def create_procedural_cubemap( self, scene : "SceneManager.Scene" = None ) -> int:
         """Create the procedural cubemap Texture:GL_TEXTURE_CUBE_MAP and FBO, then extract
         
@@ -215,26 +376,15 @@ class Skybox( Context ):
         if self.procedural_cubemap is None:
             self.procedural_cubemap = self.context.cubemaps._num_cubemaps
 
-            size = self.procedural_cubemap_size
-
-            cubemap = self.context.cubemaps.cubemap[self.procedural_cubemap]
-
-            glBindTexture( GL_TEXTURE_CUBE_MAP, cubemap )
- 
-            for i in range(6):
-                glTexImage2D(GL_TEXTURE_CUBE_MAP_POSITIVE_X + i,
-                             0, GL_RGBA16F,
-                             size, size, 0,
-                             GL_RGBA, GL_FLOAT, None)
-
-            glTexParameteri(GL_TEXTURE_CUBE_MAP, GL_TEXTURE_MAG_FILTER, GL_LINEAR)
-            glTexParameteri(GL_TEXTURE_CUBE_MAP, GL_TEXTURE_MIN_FILTER, GL_LINEAR)
-            glTexParameteri(GL_TEXTURE_CUBE_MAP, GL_TEXTURE_WRAP_S, GL_CLAMP_TO_EDGE)
-            glTexParameteri(GL_TEXTURE_CUBE_MAP, GL_TEXTURE_WRAP_T, GL_CLAMP_TO_EDGE)
-            glTexParameteri(GL_TEXTURE_CUBE_MAP, GL_TEXTURE_WRAP_R, GL_CLAMP_TO_EDGE)
+            # replace the pre-generated texture of the slot
+            glDeleteTextures( [self.context.cubemaps.cubemap[self.procedural_cubemap]] )
+            self.context.cubemaps.cubemap[self.procedural_cubemap] = self._create_cubemap_texture( self.procedural_cubemap_size )
 
             self.context.cubemaps._num_cubemaps += 1
 
+            # no content yet, render all faces at once
+            self._full_update = True
+
         # Create FBO
         if self.procedural_cubemap_fbo is None:
             self.procedural_cubemap_fbo = glGenFramebuffers(1)
@@ -264,14 +414,15 @@ class Skybox( Context ):
         if view is None:
             view = self.renderer.view
 
-        glUniformMatrix4fv( self.renderer.shader.uniforms['uPMatrix'], 1, GL_FALSE, projection )
-        glUniformMatrix4fv( self.renderer.shader.uniforms['uVMatrix'], 1, GL_FALSE, view )
+        self.renderer.state.uniform_matrix4( self.renderer.shader.uniforms['uPMatrix'], projection )
+        self.renderer.state.uniform_matrix4( self.renderer.shader.uniforms['uVMatrix'], view )
 
     def _draw_procedural( self, 
                           scene             : "SceneManager.Scene", 
                           view              : Matrix44 = None, 
                           projection        : Matrix44 = None, 
-                          extract_cubemap   : bool = False
+                          extract_cubemap   : bool = False,
+                          state             : tuple = None
         ) -> None:
         """Draw the procedural sky, ether realtime, or to extract a cubemap
         
@@ -283,6 +434,8 @@ class Skybox( Context ):
         :type projection: Matrix44
         :param extract_cubemap: The scene data
         :type extract_cubemap: bool
+        :param state: Sun and sky state to render with, None for the current state (see _sky_state())
+        :type state: tuple
         """
         if not scene:
             return
@@ -291,38 +444,27 @@ class Skybox( Context ):
 
         self.__set_mvp( view, projection )
 
-        _sun : "GameObject" = self.scene.getSun()
-        _sun_active = _sun and _sun.hierachyActive()
-
-        if not self.renderer.game_runtime:
-            _sun_active = _sun_active and _sun.hierachyVisible()
+        if state is None:
+            state = self._sky_state( scene )
 
-        light_dir   = _sun.transform.local_position if _sun_active else self.settings.default_light_color
-        light_color = _sun.light.light_color        if _sun_active else self.settings.default_ambient_color
+        light_dir, light_color, params = state
 
-        _sky_color      = scene["procedural_sky_color"]
-        _horizon_color  = scene["procedural_horizon_color"]
-        _ground_color   = scene["procedural_ground_color"]
+        _sky_color, _horizon_color, _ground_color, _sunset_color, _night_color, _night_brightness = params
 
-        _sunset_color   = scene["procedural_sunset_color"]
-        _night_color    = scene["procedural_night_color"]
+        self.renderer.state.uniform_3f( self.renderer.shader.uniforms["uSkyColor"], _sky_color[0], _sky_color[1], _sky_color[2] )
+        self.renderer.state.uniform_3f( self.renderer.shader.uniforms["uHorizonColor"], _horizon_color[0], _horizon_color[1], _horizon_color[2] )
+        self.renderer.state.uniform_3f( self.renderer.shader.uniforms["uGroundColor"], _ground_color[0], _ground_color[1], _ground_color[2] )
 
-        _night_brightness = scene["procedural_night_brightness"]
+        self.renderer.state.uniform_3f( self.renderer.shader.uniforms["uSunsetColor"], _sunset_color[0], _sunset_color[1], _sunset_color[2] )
+        self.renderer.state.uniform_3f( self.renderer.shader.uniforms["uNightColor"], _night_color[0], _night_color[1], _night_color[2] )
 
-        glUniform3f( self.renderer.shader.uniforms["uSkyColor"], _sky_color[0], _sky_color[1], _sky_color[2] )
-        glUniform3f( self.renderer.shader.uniforms["uHorizonColor"], _horizon_color[0], _horizon_color[1], _horizon_color[2] )
-        glUniform3f( self.renderer.shader.uniforms["uGroundColor"], _ground_color[0], _ground_color[1], _ground_color[2] )
-
-        glUniform3f( self.renderer.shader.uniforms["uSunsetColor"], _sunset_color[0], _sunset_color[1], _sunset_color[2] )
-        glUniform3f( self.renderer.shader.uniforms["uNightColor"], _night_color[0], _night_color[1], _night_color[2] )
-
-        glUniform3f( self.renderer.shader.uniforms["uSunDirection"], light_dir[0], light_dir[1], light_dir[2] )
-        glUniform3f( self.renderer.shader.uniforms["uSunColor"], light_color[0], light_color[1], light_color[2] )
+        self.renderer.state.uniform_3f( self.renderer.shader.uniforms["uSunDirection"], light_dir[0], light_dir[1], light_dir[2] )
+        self.renderer.state.uniform_3f( self.renderer.shader.uniforms["uSunColor"], light_color[0], light_color[1], light_color[2] )
             
-        glUniform1f( self.renderer.shader.uniforms["uNightBrightness"], _night_brightness )
+        self.renderer.state.uniform_1f( self.renderer.shader.uniforms["uNightBrightness"], _night_brightness )
 
         # flip the vertex.x handedness for cubemap extraction
-        glUniform1i( self.renderer.shader.uniforms['uExtractCubemap'], int(extract_cubemap) )
+        self.renderer.state.uniform_1i( self.renderer.shader.uniforms['uExtractCubemap'], int(extract_cubemap) )
 
         self.__render()
 
@@ -333,16 +475,14 @@ class Skybox( Context ):
         """
         self.renderer.use_shader( self.renderer.skybox )
 
-        self.__set_mvp()
-
         self.context.cubemaps.bind( self.context.environment_map, GL_TEXTURE0, "sEnvironment", 0 )
 
         self.__render()
 
     def __render( self ):
         """Issue the glDrawArrays drawcall, then reset"""
-        glDisable(GL_DEPTH_TEST);
-        glBindVertexArray( self.VAO )
+        self.renderer.state.disable( GL_DEPTH_TEST )
+        self.renderer.state.bind_vao( self.VAO )
 
         glBindBuffer( GL_ARRAY_BUFFER, self.VBO );
         glEnableVertexAttribArray( 0 )
@@ -351,10 +491,10 @@ class Skybox( Context ):
         glDrawArrays(GL_TRIANGLES, 0, 36);
          
         # reset 
-        glEnable(GL_DEPTH_TEST);
+        self.renderer.state.enable( GL_DEPTH_TEST )
         glBindBuffer( GL_ARRAY_BUFFER, 0 );
-        glBindVertexArray( 0 )
-        glUseProgram(0);
+        self.renderer.state.bind_vao( 0 )
+        self.renderer.state.use_program( 0 )
 
     def draw( self,  scene : "SceneManager.Scene" ) -> None:
         """Issue render commands to draw the skybox"""
@@ -364,16 +504,10 @@ class Skybox( Context ):
         _sky_type : Skybox.Type_ = Skybox.Type_( scene["sky_type"] )
         use_procedural : bool = _sky_type == Skybox.Type_.procedural
 
-        # update requested
-        if self.procedural_cubemap_update:
-            if use_procedural:
-                self.extract_procedural_cubemap()
-
-                # update Gui preview
-                if self.context.gui.initialized:
-                    self.context.gui.scene_settings.test_cubemap_update = True
-
-
+        # update requested, time-sliced
+        if use_procedural:
+            self.update_procedural_cubemap( scene )
+        else:
             self.procedural_cubemap_update = False
 
         if use_procedural and self.realtime:
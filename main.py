@@ -8,6 +8,9 @@ import pygame
 from pygame.locals import *
 from pyrr import matrix44, Vector3
 
+# configures PyOpenGL, must precede the first OpenGL.GL import
+from modules.render import fastGL
+
 from OpenGL.GL import *
 from OpenGL.GLU import *
 
@@ -16,6 +19,7 @@ import re
 import sys
 import uuid as uid
 import traceback
+import multiprocessing
 
 from modules.settings import Settings
 
@@ -29,8 +33,14 @@ from modules.camera import Camera as CameraHandler
 from modules.cubemap import Cubemap
 from modules.images import Images
 from modules.models import Models
+from modules.uploadScheduler import UploadScheduler
+from modules.debugDraw import DebugDraw
 from modules.material import Materials
 from modules.world import World
+from modules.transformSystem import TransformSystem
+from modules.physicsSync import PhysicsSync
+from modules.updateScheduler import UpdateScheduler
+from modules.scriptModules import ScriptModules
 
 from gameObjects.gameObject import GameObject
 from gameObjects.camera import Camera
@@ -69,14 +79,22 @@ class EmberEngine:
         self.images     : Images            = Images( self )
         self.materials  : Materials         = Materials( self )
         self.models     : Models            = Models( self )
+        self.uploads    : UploadScheduler   = UploadScheduler( self )
         self.cubemaps   : Cubemap           = Cubemap( self )
         self.skybox     : Skybox            = Skybox( self )
+        self.debug      : DebugDraw         = DebugDraw( self )
 
+        self.transform_system : TransformSystem = TransformSystem( self )
+        self.update_scheduler : UpdateScheduler = UpdateScheduler( self )
+        self.script_modules : ScriptModules = ScriptModules( self )
         self.world      : World             = World( self )
+        self.physics_sync : PhysicsSync     = PhysicsSync( self )
 
+        # programs link on driver threads while the debug draw buffers are created
         self.renderer.create_shaders()
+        self.debug.initialize()
+        self.renderer.finish_shaders()
         self.renderer.ubo.initialize()
-        self.renderer.create_editor_vaos()
 
         self.roughnessOverride = -1.0
         self.metallicOverride = -1.0
@@ -137,24 +155,11 @@ class EmberEngine:
         elif _scene["sky_type"] == Skybox.Type_.procedural:
             self.environment_map = self.skybox.create_procedural_cubemap( _scene )
 
-    def prepare_gameObjects(self, 
-        parent : GameObject = None,
-        objects : Dict[uid.UUID, GameObject] = {}
-    ):
+    def _prepare_hierarchy( self, objects : Dict[uid.UUID, GameObject] ) -> None:
         """
-        Recursively prepare and update GameObjects in a parent–child nested hierarchy.
-
-        This method traverses the GameObject tree starting from the given parent
+        Recursively enable or disable and update GameObjects in a parent–child nested hierarchy,
+        used on frames that start or stop the game.
 
-            Depending on the application state, it handles:
-            - Enabling objects when the game starts
-            - Disabling objects when the game stops
-            - Running per-frame update logic
-            - Processing child GameObjects recursively
-
-        :param parent: The parent GameObject whose children are processed.
-                       Use None to start traversal from root-level objects.
-        :type parent: GameObject or None
         :param objects: A mapping of GameObject UUIDs to GameObject instances
                         representing the current level of the hierarchy.
         :type objects: Dict[uuid.UUID, GameObject]
@@ -162,10 +167,8 @@ class EmberEngine:
         if not objects:
             return
 
-        for obj in objects.values():
-            if obj.parent != parent or obj.parent and parent == None:
-                continue
-
+        # scripts may reparent or add gameObjects
+        for obj in list( objects.values() ):
             # (re)store states
             if not app.settings.is_exported:
                 if self.renderer.game_start:
@@ -183,7 +186,25 @@ class EmberEngine:
 
             # render children if any
             if obj.children:
-                self.prepare_gameObjects( obj, obj.children )
+                self._prepare_hierarchy( obj.children )
+
+    def prepare_gameObjects( self ) -> None:
+        """
+        Prepare and update the GameObjects that need work this frame.
+
+            Depending on the application state, it handles:
+            - Enabling objects when the game starts (full hierarchy)
+            - Disabling objects when the game stops (full hierarchy)
+            - Running per-frame update logic of the active set (dirty, scripts and physics),
+              see UpdateScheduler
+        """
+        if self.renderer.game_start or self.renderer.game_stop:
+            self.update_scheduler.discard_dirty()
+            self._prepare_hierarchy( self.update_scheduler.roots )
+            return
+
+        for obj in self.update_scheduler.collect():
+            obj.onUpdate();  # engine update
 
     def run( self ) -> None: 
         """The main loop of the appliction, remains active as long as 'self.renderer.running'
@@ -203,12 +224,14 @@ class EmberEngine:
                 #
                 # lazy model loading, flush loaded models set ready from thread
                 #
-                self.models.model_loader_thread_flush()
-                self.images.image_upload_queue_flush()
+                self.uploads.flush()
+                self.cubemaps.update()
+                self.images.collect_unreferenced()
+                self.renderer.update_shaders()
 
                 # triggers update systems in the registered gameObjects
                 # handles onEnable, onDisable, onStart, onUpdate and _dirty flags
-                self.prepare_gameObjects( None, self.world.gameObjects )
+                self.prepare_gameObjects()
 
                 # collect active model meshes (build the draw list, unsorted/batched)
                 if not self.renderer.USE_FULL_GPU_DRIVEN:
@@ -223,27 +246,21 @@ class EmberEngine:
                 # dispatch world draw calls
                 self.renderer.dispatch_drawcalls( _scene )
 
-                # dispatch editor visuals
-                # eg: grid, axis, colliders (instant drawing, not indirect)
+                # dispatch editor visuals and debug geometry pushed by scripts
+                # eg: grid, axis, colliders (collected, then drawn in batches)
                 if not app.settings.is_exported and not app.renderer.game_runtime:
-                    self.renderer.draw_grid()
-                    self.renderer.draw_axis( 2.0 )
+                    self.debug.grid()
+                    self.debug.axis()
 
                 if self.settings.drawColliders:
-                    self.renderer.use_shader( self.renderer.color )
-
-                    # bind projection matrix
-                    glUniformMatrix4fv(self.renderer.shader.uniforms['uPMatrix'], 1, GL_FALSE, self.renderer.projection)
-        
-                    # viewmatrix
-                    glUniformMatrix4fv(self.renderer.shader.uniforms['uVMatrix'], 1, GL_FALSE, self.renderer.view)
-
                     for uuid in self.world.physics_bases.keys():
                         self.world.gameObjects[uuid].onRenderColliders()
 
                     for uuid in self.world.physic_links.keys():
                         self.world.gameObjects[uuid].onRenderColliders()
 
+                self.debug.flush()
+
                 #
                 # cleanup _removed objects
                 #
@@ -259,6 +276,9 @@ class EmberEngine:
         self.renderer.shutdown()
 
 if __name__ == '__main__':
+    # physics server worker process in frozen (exported) builds
+    multiprocessing.freeze_support()
+
     app = EmberEngine()
 
     # debug
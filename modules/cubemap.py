@@ -1,10 +1,15 @@
 from pathlib import Path
+from typing import Dict
+import hashlib
+from concurrent.futures import ThreadPoolExecutor, Future
 
 from OpenGL.GL import *
 from OpenGL.GLU import *
 
-from modules.render.image import create_image_pygame as create_image
+from modules.render.image import ImageUpload
 from modules.render.image import load_cubemap_pygame as load_cubemap
+from modules.render.shader import Shader
+from modules.render import environment
 from modules.context import Context
 
 import numpy as np
@@ -23,87 +28,141 @@ class Cubemap( Context ):
 
         basepath = self.settings.cubemap_path
 
+        # environment processing, prefiltered specular cubemap and SH irradiance per cubemap index
+        self.prefiltered    : Dict[int, int] = {}
+        self.env_max_lod    : Dict[int, float] = {}
+        self.sh             : Dict[int, np.ndarray] = {}
+
+        self._env_pool      : ThreadPoolExecutor = ThreadPoolExecutor( max_workers=1, thread_name_prefix="environment" )
+        self._env_jobs      : Dict[int, Future] = {}
+        self._env_queued    : Dict[int, tuple[np.ndarray, bool]] = {}
+
         # BRDF Lut
         self.create_brdf_lut()
 
         return
 
     @staticmethod
-    def create_brdf_texture( size : int ):
-        """Create the BRDF lut used for IBL contributions - Currently unused
+    def create_brdf_texture( size : int, num_samples : int ) -> np.ndarray:
+        """Create the split-sum BRDF lut used for IBL contributions (GGX importance sampled).
+        Vectorized over the whole table, loops only over the samples.
         
-        :param size: the dimension of the LUT, required to calculate each pixel
+        :param size: the dimension of the LUT
         :type size: int
+        :param num_samples: the number of importance samples per texel
+        :type num_samples: int
+        :return: (size, size, 2) float16 scale and bias, row 0 is the bottom row, x: NdotV, y: 1.0 - roughness
+        :rtype: np.ndarray
         """
-        brdf_texture = np.zeros((size, size, 4), dtype=np.float32)
-
-        for i in range( size ):
-            for j in range(size):
-                print(f"Processing incident angle index: {i}, reflection angle index: {j}")  # Debug statement
-
-                # Calculate theta and phi from i and j
-                theta_i = np.pi * (i + 0.5) / size  # incident angle (0 to pi)
-                phi_i = 2 * np.pi * (j + 0.5) / size  # incident azimuthal angle (0 to 2pi)
-
-                # Convert spherical coordinates to Cartesian coordinates
-                wi = np.array([
-                    np.sin(theta_i) * np.cos(phi_i),
-                    np.cos(theta_i),
-                    np.sin(theta_i) * np.sin(phi_i)
-                ])
-
-                # Loop through reflection angles
-                for k in range(size):
-                    for l in range(size):
-                        print(f"  Checking reflection angle index: {k}, {l}")  # Debug statement
-
-                        theta_r = np.pi * (k + 0.5) / size
-                        phi_r = 2 * np.pi * (l + 0.5) / size
-
-                        wr = np.array([
-                            np.sin(theta_r) * np.cos(phi_r),
-                            np.cos(theta_r),
-                            np.sin(theta_r) * np.sin(phi_r)
-                        ])
-
-                        # Calculate the BRDF value (specular: GGX)
-                        N = np.array([0, 1, 0])  # Normal facing up
-                        F0 = np.array([0.04, 0.04, 0.04])  # Fresnel reflectance for dielectrics
-                        alpha = 0.5  # Roughness
-
-                        # Calculate the halfway vector
-                        H = (wi + wr) / np.linalg.norm(wi + wr)
-                        V = wi
-                        L = wr
-
-                        # Fresnel Schlick approximation
-                        F = F0 + (1 - F0) * np.power(1 - np.dot(V, H), 5)
-
-                        # Calculate D and G from GGX model
-                        D_num = alpha ** 2
-                        D_den = np.pi * (np.dot(N, H) ** 2 * (alpha ** 2 - 1) + 1) ** 2
-                        D = D_num / D_den if D_den > 0 else 0
-
-                        G_num = np.dot(N, V) * np.dot(N, L)
-                        G_den = np.dot(V, H) * np.dot(L, H)
-                        G = G_num / G_den if G_den > 0 else 0
-
-                        # BRDF value
-                        brdf_value = (F * D * G) / (4 * np.dot(N, V) * np.dot(N, L) + 1e-5)
-
-                        # Store in texture with an alpha value of 1.0
-                        brdf_texture[k, l, :] = np.array([brdf_value[0], brdf_value[1], brdf_value[2], 1.0])
-        
-        return brdf_texture
+        coords      = ( np.arange( size, dtype=np.float32 ) + 0.5 ) / size
+        NdotV       = np.broadcast_to( coords[None, :], ( size, size ) )
+        roughness   = np.broadcast_to( 1.0 - coords[:, None], ( size, size ) )
+
+        # view vector in tangent space, N = +Z
+        Vx = np.sqrt( 1.0 - NdotV * NdotV )
+        Vz = NdotV
+
+        a  = roughness * roughness
+        a2 = a * a
+        k  = a / 2.0
+
+        G_V = NdotV / ( NdotV * ( 1.0 - k ) + k )
+
+        A = np.zeros( ( size, size ), dtype=np.float32 )
+        B = np.zeros( ( size, size ), dtype=np.float32 )
+
+        for Xi_x, Xi_y in environment.hammersley( num_samples ):
+            phi         = 2.0 * np.pi * Xi_x
+            cos_theta   = np.sqrt( ( 1.0 - Xi_y ) / ( 1.0 + ( a2 - 1.0 ) * Xi_y ) )
+            sin_theta   = np.sqrt( 1.0 - cos_theta * cos_theta )
+
+            Hx = np.cos( phi ) * sin_theta
+            Hz = cos_theta
+
+            VdotH = Vx * Hx + Vz * Hz
+            NdotL = np.maximum( 2.0 * VdotH * Hz - Vz, 0.0 )
+            VdotH = np.maximum( VdotH, 0.0 )
+
+            valid = NdotL > 0.0
+
+            G       = G_V * ( NdotL / ( NdotL * ( 1.0 - k ) + k ) )
+            G_Vis   = np.where( valid, ( G * VdotH ) / np.maximum( Hz * NdotV, 1e-8 ), 0.0 )
+            Fc      = ( 1.0 - VdotH ) ** 5
+
+            A += ( 1.0 - Fc ) * G_Vis
+            B += Fc * G_Vis
+
+        return ( np.stack( [ A, B ], axis=-1 ) / num_samples ).astype( np.float16 )
+
+    def create_brdf_texture_compute( self, size : int, num_samples : int ) -> np.ndarray:
+        """Create the split-sum BRDF lut on the GPU, see shaders/brdf_lut.comp
+
+        :return: (size, size, 2) float16, same layout as create_brdf_texture()
+        :rtype: np.ndarray
+        """
+        shader = Shader( self.context, "brdf_lut", compute=True )
+
+        texture = glGenTextures( 1 )
+        glBindTexture( GL_TEXTURE_2D, texture )
+        glTexStorage2D( GL_TEXTURE_2D, 1, GL_RG16F, size, size )
+
+        self.renderer.state.use_program( shader.program )
+        glUniform1i( shader.uniforms['uSize'], size )
+        glUniform1i( shader.uniforms['uSamples'], num_samples )
+        glBindImageTexture( 0, texture, 0, GL_FALSE, 0, GL_WRITE_ONLY, GL_RG16F )
+
+        glDispatchCompute( ( size + 7 ) // 8, ( size + 7 ) // 8, 1 )
+        glMemoryBarrier( GL_TEXTURE_UPDATE_BARRIER_BIT )
+
+        data = np.empty( ( size, size, 2 ), dtype=np.float16 )
+        glGetTexImage( GL_TEXTURE_2D, 0, GL_RG, GL_HALF_FLOAT, data )
+
+        self.renderer.state.use_program( 0 )
+        glDeleteTextures( [texture] )
+
+        self.renderer.state.forget_program( shader.program )
+        glDeleteProgram( shader.program )
+
+        return data
 
     def create_brdf_lut( self ) -> None:
-        """Load the BRDF lut used for IBL contributions
-        Should be generated, but staticly loaded for now"""
-        #self.brdf_lut_texture  = glGenTextures(1)
-        #data = self.create_brdf_texture( size )
-        #create_image( size, data, self.brdf_lut )
-        #load_image( f"{self.basepath}brdf.jpg", self.brdf_lut_texture )
-        self.brdf_lut = self.context.images.loadOrFindFullPath( Path(f"{self.settings.shader_path}brdf.jpg") )
+        """Load the BRDF lut used for IBL contributions from the disk cache, 
+        generate (compute shader or NumPy) and cache it on a miss."""
+        size        = self.settings.brdf_lut_size
+        num_samples = self.settings.brdf_lut_samples
+
+        cache_dir = Path( self.settings.lut_cache_path )
+        cache_dir.mkdir( parents=True, exist_ok=True )
+        cache_path = cache_dir / f"brdf_lut_{size}_{num_samples}.npy"
+
+        data = None
+
+        if cache_path.is_file():
+            try:
+                data = np.load( cache_path, mmap_mode="r" )
+            except Exception as e:
+                self.console.warn( f"BRDF lut cache unreadable, regenerating: {e}" )
+
+        if data is None or data.shape != ( size, size, 2 ) or data.dtype != np.float16:
+            if self.settings.brdf_lut_use_compute and self.renderer.has_extension( "GL_ARB_compute_shader" ):
+                data = self.create_brdf_texture_compute( size, num_samples )
+            else:
+                data = self.create_brdf_texture( size, num_samples )
+
+            np.save( cache_path, data )
+
+        self.brdf_lut = self.context.images.acquire( self.context.images.queue_upload( 
+            upload_data = ImageUpload(
+                path                = f"*brdf_lut_{size}_{num_samples}",
+                width               = size,
+                height              = size,
+                buffer              = np.ascontiguousarray( data ).tobytes(),
+                _format             = GL_HALF_FLOAT,
+                _internal_format    = GL_RG16F,
+                _pixel_format       = GL_RG,
+                wrap                = GL_CLAMP_TO_EDGE
+            )
+        ) )
         return
 
     def loadOrFind( self, path : str ) -> int:
@@ -116,8 +175,144 @@ class Cubemap( Context ):
         load_cubemap( path, ".bmp", self.cubemap[index] )
 
         self._num_cubemaps += 1
+
+        self.process_environment( index )
         return index
 
+    #
+    # environment processing
+    #
+    def _read_faces( self, index : int ) -> np.ndarray:
+        """Read back mip 0 of a cubemap, (6, size, size, 3) float32"""
+        self.renderer.state.bind_texture( GL_TEXTURE0, GL_TEXTURE_CUBE_MAP, self.cubemap[index] )
+        size = int( glGetTexLevelParameteriv( GL_TEXTURE_CUBE_MAP_POSITIVE_X, 0, GL_TEXTURE_WIDTH ) )
+
+        faces = np.empty( ( 6, size, size, 3 ), dtype=np.float32 )
+        glPixelStorei( GL_PACK_ALIGNMENT, 1 )
+
+        for i in range( 6 ):
+            glGetTexImage( GL_TEXTURE_CUBE_MAP_POSITIVE_X + i, 0, GL_RGB, GL_FLOAT, faces[i] )
+
+        return faces
+
+    def process_environment( self, index : int, cache : bool = True ) -> None:
+        """Read back a cubemap and build its prefiltered specular mip chain and SH irradiance in a worker.
+        Results are applied by update() once ready, until then the raw cubemap is bound and 
+        SH irradiance is disabled.
+
+        :param index: The index of the cubemap
+        :type index: int
+        :param cache: Cache the results on disk by content, disable for transient cubemaps (eg. procedural sky)
+        :type cache: bool
+        """
+        faces = self._read_faces( index )
+
+        # latest request wins while a job is running
+        if index in self._env_jobs:
+            self._env_queued[index] = ( faces, cache )
+            return
+
+        self._env_jobs[index] = self._env_pool.submit( self._environment_job, faces, cache )
+
+    def _environment_job( self, faces : np.ndarray, cache : bool = True ) -> tuple:
+        """Worker job, load the environment from the disk cache or compute (and cache) it"""
+        size        = self.settings.env_prefilter_size
+        num_levels  = int( np.log2( size ) )
+        num_samples = self.settings.env_prefilter_samples
+
+        cache_path = None
+
+        if cache:
+            digest = hashlib.sha1( faces.tobytes() )
+            digest.update( f"|{size}|{num_levels}|{num_samples}".encode() )
+
+            cache_dir = Path( self.settings.env_cache_path )
+            cache_dir.mkdir( parents=True, exist_ok=True )
+            cache_path = cache_dir / f"env_{digest.hexdigest()}.npz"
+
+            if cache_path.is_file():
+                try:
+                    with np.load( cache_path ) as data:
+                        return [ data[f"level_{i}"] for i in range( num_levels ) ], data["sh"]
+
+                except Exception as e:
+                    self.console.warn( f"Environment cache unreadable, regenerating: {e}" )
+
+        levels  = [ level.astype( np.float16 ) for level in environment.prefilter_specular( faces, size, num_levels, num_samples ) ]
+        sh      = environment.project_sh9( faces )
+
+        if cache_path is not None:
+            np.savez( cache_path, sh=sh, **{ f"level_{i}" : level for i, level in enumerate( levels ) } )
+
+        return levels, sh
+
+    def _upload_environment( self, index : int, levels : list, sh : np.ndarray ) -> None:
+        if index not in self.prefiltered:
+            self.prefiltered[index] = glGenTextures( 1 )
+
+        self.renderer.state.bind_texture( GL_TEXTURE0, GL_TEXTURE_CUBE_MAP, self.prefiltered[index] )
+        glPixelStorei( GL_UNPACK_ALIGNMENT, 1 )
+
+        for level, faces in enumerate( levels ):
+            size = faces.shape[1]
+
+            for i in range( 6 ):
+                glTexImage2D( GL_TEXTURE_CUBE_MAP_POSITIVE_X + i, level, GL_RGB16F, size, size, 0, GL_RGB, GL_HALF_FLOAT, np.ascontiguousarray( faces[i] ) )
+
+        glTexParameteri( GL_TEXTURE_CUBE_MAP, GL_TEXTURE_MAX_LEVEL, len(levels) - 1 )
+        glTexParameteri( GL_TEXTURE_CUBE_MAP, GL_TEXTURE_MIN_FILTER, GL_LINEAR_MIPMAP_LINEAR )
+        glTexParameteri( GL_TEXTURE_CUBE_MAP, GL_TEXTURE_MAG_FILTER, GL_LINEAR )
+        glTexParameteri( GL_TEXTURE_CUBE_MAP, GL_TEXTURE_WRAP_S, GL_CLAMP_TO_EDGE )
+        glTexParameteri( GL_TEXTURE_CUBE_MAP, GL_TEXTURE_WRAP_T, GL_CLAMP_TO_EDGE )
+        glTexParameteri( GL_TEXTURE_CUBE_MAP, GL_TEXTURE_WRAP_R, GL_CLAMP_TO_EDGE )
+
+        self.env_max_lod[index] = float( len(levels) - 1 )
+        self.sh[index]          = np.ascontiguousarray( sh, dtype=np.float32 )
+
+    def update( self ) -> None:
+        """Apply finished environment jobs, start queued requests"""
+        for index, job in list( self._env_jobs.items() ):
+            if not job.done():
+                continue
+
+            del self._env_jobs[index]
+
+            try:
+                levels, sh = job.result()
+                self._upload_environment( index, levels, sh )
+
+            except Exception as e:
+                self.console.error( f"Environment processing failed: {e}" )
+
+            if index in self._env_queued:
+                self._env_jobs[index] = self._env_pool.submit( self._environment_job, *self._env_queued.pop( index ) )
+
+    def bind_environment( self, index : int, texture_index, shader_uniform : str, shader_index : int ):
+        """Bind the prefiltered environment and SH irradiance if processed, the raw cubemap otherwise
+
+        :param index: The index of the cubemap
+        :type index: int
+        :param texture_index: The texture unit index in GLSL (eg. GL_TEXTURE0-GL_TEXTURE31)
+        :type texture_index: uint32/uintc
+        :param shader_uniform: The varaible name of the GLSL uniform sampler
+        :type shader_uniform: str
+        :param shader_index: Represent the number also indicated with 'texture_index'. revisit this?
+        :type shader_index: int
+        """
+        state = self.renderer.state
+        uniforms = self.renderer.shader.uniforms
+
+        state.bind_texture( texture_index, GL_TEXTURE_CUBE_MAP, self.prefiltered.get( index, self.cubemap[index] ) )
+        state.uniform_1i( self.renderer.shader.location( shader_uniform ), shader_index )
+
+        state.uniform_1f( uniforms['in_envMaxLod'], self.env_max_lod.get( index, 6.0 ) )
+
+        sh = self.sh.get( index )
+        state.uniform_1i( uniforms['in_shEnabled'], int( sh is not None ) )
+
+        if sh is not None:
+            state.uniform_3fv( uniforms['u_SH'], 9, sh )
+
 
     def bind( self, texture_id, texture_index, shader_uniform : str, shader_index : int ):
         """Bind texture using OpenGL with image index
@@ -131,7 +326,6 @@ class Cubemap( Context ):
         :param shader_index: Represent the number also indicated with 'texture_index'. revisit this?
         :type shader_index: int
         """
-        glActiveTexture( texture_index )
-        glBindTexture( GL_TEXTURE_CUBE_MAP, self.cubemap[texture_id] )
-        glUniform1i(glGetUniformLocation( self.renderer.shader.program, shader_uniform ), shader_index)
+        self.renderer.state.bind_texture( texture_index, GL_TEXTURE_CUBE_MAP, self.cubemap[texture_id] )
+        self.renderer.state.uniform_1i( self.renderer.shader.location( shader_uniform ), shader_index )
 
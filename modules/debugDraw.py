@@ -0,0 +1,404 @@
+import math
+from typing import TYPE_CHECKING
+
+from OpenGL.GL import *  # pylint: disable=W0614
+
+import numpy as np
+from pyrr import Matrix44
+
+from modules.context import Context
+from modules.render.vao import VAO
+from modules.render import fastGL
+
+if TYPE_CHECKING:
+    from main import EmberEngine
+    from modules.models import Models
+    from gameObjects.attachables.model import Model
+
+class DebugDraw( Context ):
+    class Shape_:
+        """Unit line shapes, matching the engine collision models"""
+        box         = 0     # [-1, 1] on each axis
+        sphere      = 1     # radius 1
+        cylinder    = 2     # radius 0.5, height 1 along Z
+
+    LINE_FLOATS         = 7     # vec3 position, vec4 color
+    INSTANCE_FLOATS     = 20    # mat4 model, vec4 color
+    INSTANCE_STRIDE     = INSTANCE_FLOATS * 4
+
+    COLOR_LOCATION      = 9
+    COLLIDER_COLOR      = ( 1.0, 0.55, 0.0, 0.25 )
+    CIRCLE_SEGMENTS     = 32
+
+    LINE_WIDTH          = 1.0
+    SHAPE_LINE_WIDTH    = 3.0
+    OVERLAY_LINE_WIDTH  = 2.0
+
+    def __init__( self, context ):
+        """Batched debug geometry, eg. colliders, grid, axis and lines pushed by scripts.
+        Everything pushed during a frame is rendered by flush() with a single state setup:
+        one draw for lines, one instanced draw per shape and per collider mesh.
+
+        :param context: This is the main context of the application
+        :type context: EmberEngine
+        """
+        super().__init__( context )
+
+        self.models     : "Models" = None
+
+        # per frame, cleared by flush()
+        self.lines      : list[np.ndarray] = []             # (n, 7) chunks, depth tested
+        self.overlay    : list[np.ndarray] = []             # (n, 7) chunks, drawn on top
+        self._line_data : list[float] = []                  # single line() calls, depth tested
+        self.shapes     : dict[int, list] = { shape : [] for shape in ( DebugDraw.Shape_.box, DebugDraw.Shape_.sphere, DebugDraw.Shape_.cylinder ) }
+        self.meshes     : dict[tuple, list] = {}            # (model_index, mesh_index, color) -> [matrix]
+
+        # last flush stats
+        self.draw_calls : int = 0
+
+    def initialize( self ) -> None:
+        """Create the GL buffers, requires a context"""
+        self.models = self.context.models
+
+        # unit shapes, one line list
+        shapes = [ DebugDraw._box_lines(), DebugDraw._sphere_lines(), DebugDraw._cylinder_lines() ]
+        self.shape_ranges : list[tuple[int, int]] = []
+
+        first = 0
+        for vertices in shapes:
+            self.shape_ranges.append( ( first, len(vertices) ) )
+            first += len(vertices)
+
+        shape_vertices = np.concatenate( shapes ).astype( np.float32 )
+
+        self.shape_vao = glGenVertexArrays( 1 )
+        glBindVertexArray( self.shape_vao )
+
+        self.shape_vbo = glGenBuffers( 1 )
+        glBindBuffer( GL_ARRAY_BUFFER, self.shape_vbo )
+        glBufferData( GL_ARRAY_BUFFER, shape_vertices.nbytes, shape_vertices, GL_STATIC_DRAW )
+
+        glEnableVertexAttribArray( 0 )
+        glVertexAttribPointer( 0, 3, GL_FLOAT, GL_FALSE, 0, None )
+
+        # per instance model matrix and color, pointers are set per shape in flush()
+        self.instance_vbo = glGenBuffers( 1 )
+        for location in range( VAO.INSTANCE_MATRIX_LOCATION, DebugDraw.COLOR_LOCATION + 1 ):
+            glEnableVertexAttribArray( location )
+            glVertexAttribDivisor( location, 1 )
+
+        # world space lines
+        self.line_vao = glGenVertexArrays( 1 )
+        glBindVertexArray( self.line_vao )
+
+        self.line_vbo = glGenBuffers( 1 )
+        glBindBuffer( GL_ARRAY_BUFFER, self.line_vbo )
+
+        stride = DebugDraw.LINE_FLOATS * 4
+        glEnableVertexAttribArray( 0 )
+        glVertexAttribPointer( 0, 3, GL_FLOAT, GL_FALSE, stride, ctypes.c_void_p(0) )
+        glEnableVertexAttribArray( DebugDraw.COLOR_LOCATION )
+        glVertexAttribPointer( DebugDraw.COLOR_LOCATION, 4, GL_FLOAT, GL_FALSE, stride, ctypes.c_void_p(12) )
+
+        glBindVertexArray( 0 )
+
+        # collider meshes, tightly packed matrices (see VAO.set_instance_matrices)
+        self.mesh_vbo = glGenBuffers( 1 )
+
+        # editor visuals
+        self.grid_vertices = DebugDraw._grid_lines( self.settings.grid_size, self.settings.grid_spacing, self.settings.grid_color )
+        self.axis_vertices = DebugDraw._axis_lines( 100.0 )
+
+    #
+    # unit geometry
+    #
+    @staticmethod
+    def _circle( radius : float, axis : int, offset : float = 0.0 ) -> np.ndarray:
+        """Line list of a circle around an axis (0: X, 1: Y, 2: Z)"""
+        angles = np.linspace( 0.0, 2.0 * math.pi, DebugDraw.CIRCLE_SEGMENTS + 1, dtype=np.float32 )
+        a, b = radius * np.cos( angles ), radius * np.sin( angles )
+
+        points = np.zeros( ( len(angles), 3 ), dtype=np.float32 )
+        u, v = [ i for i in range( 3 ) if i != axis ]
+        points[:, u], points[:, v], points[:, axis] = a, b, offset
+
+        return np.repeat( points, 2, axis=0 )[1:-1]
+
+    @staticmethod
+    def _box_lines() -> np.ndarray:
+        corners = np.array( [ [x, y, z] for x in ( -1, 1 ) for y in ( -1, 1 ) for z in ( -1, 1 ) ], dtype=np.float32 )
+        edges = [ ( i, j ) for i in range( 8 ) for j in range( i + 1, 8 ) if bin( i ^ j ).count( "1" ) == 1 ]
+
+        return corners[ np.array( edges ).reshape( -1 ) ]
+
+    @staticmethod
+    def _sphere_lines() -> np.ndarray:
+        return np.concatenate( [ DebugDraw._circle( 1.0, axis ) for axis in range( 3 ) ] )
+
+    @staticmethod
+    def _cylinder_lines() -> np.ndarray:
+        sides = np.array( [ [ x, y, z ] for x, y in ( ( 0.5, 0 ), ( -0.5, 0 ), ( 0, 0.5 ), ( 0, -0.5 ) ) for z in ( -0.5, 0.5 ) ], dtype=np.float32 )
+
+        return np.concatenate( [ DebugDraw._circle( 0.5, 2, -0.5 ), DebugDraw._circle( 0.5, 2, 0.5 ), sides ] )
+
+    @staticmethod
+    def _colored( points : np.ndarray, color ) -> np.ndarray:
+        """Attach a color to a line list, (n, 3) -> (n, 7)"""
+        vertices = np.empty( ( len(points), DebugDraw.LINE_FLOATS ), dtype=np.float32 )
+        vertices[:, :3] = points
+        vertices[:, 3:] = color
+
+        return vertices
+
+    @staticmethod
+    def _grid_lines( size : float, spacing : float, color ) -> np.ndarray:
+        points = []
+        for i in np.arange( -size, size + spacing, spacing ):
+            points += [ [ i, 0, -size ], [ i, 0, size ], [ -size, 0, i ], [ size, 0, i ] ]
+
+        return DebugDraw._colored( np.array( points, dtype=np.float32 ), ( color[0], color[1], color[2], 1.0 ) )
+
+    @staticmethod
+    def _axis_lines( length : float ) -> np.ndarray:
+        vertices = []
+        for axis in range( 3 ):
+            end = [ 0.0, 0.0, 0.0 ]; end[axis] = length
+            color = [ 0.0, 0.0, 0.0, 1.0 ]; color[axis] = 1.0
+
+            vertices += [ [ 0.0, 0.0, 0.0 ] + color, end + color ]
+
+        return np.array( vertices, dtype=np.float32 )
+
+    #
+    # collect
+    #
+    def line( self, start, end, color = ( 1.0, 1.0, 1.0, 1.0 ), overlay : bool = False ) -> None:
+        """Push a single line segment in world space
+
+        :param start: The start position
+        :type start: Vector3 | list[float]
+        :param end: The end position
+        :type end: Vector3 | list[float]
+        :param color: RGBA color
+        :type color: tuple[float]
+        :param overlay: Draw on top of the scene, ignoring depth
+        :type overlay: bool
+        """
+        if overlay:
+            self.overlay.append( DebugDraw._colored( np.array( [ start[:3], end[:3] ], dtype=np.float32 ), color[:4] ) )
+            return
+
+        self._line_data += ( start[0], start[1], start[2], *color[:4], end[0], end[1], end[2], *color[:4] )
+
+    def lines( self, vertices : np.ndarray, overlay : bool = False ) -> None:
+        """Push a prebuilt line list
+
+        :param vertices: (n, 7) float32 position and RGBA color per vertex, two vertices per line
+        :type vertices: np.ndarray
+        :param overlay: Draw on top of the scene, ignoring depth
+        :type overlay: bool
+        """
+        ( self.overlay if overlay else self.lines ).append( vertices )
+
+    def shape( self, shape : int, matrix : Matrix44, color = ( 1.0, 1.0, 1.0, 1.0 ) ) -> None:
+        """Push a unit shape, see DebugDraw.Shape_
+
+        :param shape: The unit shape
+        :type shape: int
+        :param matrix: The model matrix
+        :type matrix: Matrix44
+        :param color: RGBA color
+        :type color: tuple[float]
+        """
+        self.shapes[shape].append( ( matrix, color ) )
+
+    def box( self, center, half_extents, color = ( 1.0, 1.0, 1.0, 1.0 ) ) -> None:
+        """Push an axis-aligned box"""
+        matrix = Matrix44.from_translation( center[:3] ) * Matrix44.from_scale( half_extents[:3] )
+        self.shape( DebugDraw.Shape_.box, matrix, color )
+
+    def sphere( self, center, radius : float, color = ( 1.0, 1.0, 1.0, 1.0 ) ) -> None:
+        """Push a sphere outline"""
+        matrix = Matrix44.from_translation( center[:3] ) * Matrix44.from_scale( ( radius, radius, radius ) )
+        self.shape( DebugDraw.Shape_.sphere, matrix, color )
+
+    def mesh( self, model : "Model", matrix : Matrix44, color = ( 1.0, 1.0, 1.0, 1.0 ) ) -> None:
+        """Push a wireframe model, instanced per mesh
+
+        :param model: The model object
+        :type model: Model
+        :param matrix: The model matrix
+        :type matrix: Matrix44
+        :param color: RGBA color
+        :type color: tuple[float]
+        """
+        color = tuple( color[:4] )
+
+        def collect( model_index : int, mesh_index : int, world_matrix : Matrix44 ):
+            self.meshes.setdefault( ( model_index, mesh_index, color ), [] ).append( world_matrix )
+
+        self.models.visit_meshes( model, matrix, collect )
+
+    def grid( self ) -> None:
+        """Push the editor grid"""
+        if self.settings.drawGrid:
+            self.lines.append( self.grid_vertices )
+
+    def axis( self ) -> None:
+        """Push the editor axis, drawn on top"""
+        if self.settings.drawAxis:
+            self.overlay.append( self.axis_vertices )
+
+    def clear( self ) -> None:
+        self.lines.clear()
+        self.overlay.clear()
+        self._line_data.clear()
+        self.meshes.clear()
+
+        for items in self.shapes.values():
+            items.clear()
+
+    #
+    # render
+    #
+    def _draw_lines( self, chunks : list[np.ndarray] ) -> None:
+        vertices = np.ascontiguousarray( np.concatenate( chunks ), dtype=np.float32 )
+
+        self.renderer.state.uniform_1i( self.renderer.shader.uniforms['uInstanced'], 0 )
+        self.renderer.state.bind_vao( self.line_vao )
+
+        glBindBuffer( GL_ARRAY_BUFFER, self.line_vbo )
+        glBufferData( GL_ARRAY_BUFFER, vertices.nbytes, vertices, GL_STREAM_DRAW )
+
+        fastGL.glDrawArrays( GL_LINES, 0, len(vertices) )
+        self.draw_calls += 1
+
+    def _draw_shapes( self ) -> None:
+        instances = []
+        for shape, items in self.shapes.items():
+            if not items:
+                continue
+
+            data = np.empty( ( len(items), DebugDraw.INSTANCE_FLOATS ), dtype=np.float32 )
+            data[:, :16] = np.array( [ matrix for matrix, _ in items ], dtype=np.float32 ).reshape( -1, 16 )
+            data[:, 16:] = [ color[:4] for _, color in items ]
+
+            instances.append( ( shape, data ) )
+
+        if not instances:
+            return
+
+        buffer = np.concatenate( [ data for _, data in instances ] )
+
+        self.renderer.state.uniform_1i( self.renderer.shader.uniforms['uInstanced'], 1 )
+        self.renderer.state.bind_vao( self.shape_vao )
+
+        glBindBuffer( GL_ARRAY_BUFFER, self.instance_vbo )
+        glBufferData( GL_ARRAY_BUFFER, buffer.nbytes, buffer, GL_STREAM_DRAW )
+
+        offset = 0
+        for shape, data in instances:
+            for column in range( 4 ):
+                fastGL.glVertexAttribPointer( VAO.INSTANCE_MATRIX_LOCATION + column, 4, GL_FLOAT, GL_FALSE,
+                    DebugDraw.INSTANCE_STRIDE, ctypes.c_void_p( offset + column * 16 ) )
+
+            fastGL.glVertexAttribPointer( DebugDraw.COLOR_LOCATION, 4, GL_FLOAT, GL_FALSE,
+                DebugDraw.INSTANCE_STRIDE, ctypes.c_void_p( offset + 64 ) )
+
+            first, count = self.shape_ranges[shape]
+            glDrawArraysInstanced( GL_LINES, first, count, len(data) )
+
+            offset += data.nbytes
+            self.draw_calls += 1
+
+    def _draw_meshes( self ) -> None:
+        keys = list( self.meshes.keys() )
+        matrices = np.array( [ matrix for key in keys for matrix in self.meshes[key] ], dtype=np.float32 )
+
+        self.renderer.state.uniform_1i( self.renderer.shader.uniforms['uInstanced'], 1 )
+        self.renderer.state.set_polygon_mode( GL_LINE )
+
+        glBindBuffer( GL_ARRAY_BUFFER, self.mesh_vbo )
+        glBufferData( GL_ARRAY_BUFFER, matrices.nbytes, matrices, GL_STREAM_DRAW )
+
+        first = 0
+        for model_index, mesh_index, color in keys:
+            count = len( self.meshes[( model_index, mesh_index, color )] )
+            mesh = self.models.model_mesh[model_index][mesh_index]
+
+            vao : VAO = mesh["vao_simple"]
+            self.renderer.state.bind_vao( vao.vao )
+            vao.set_instance_matrices( self.mesh_vbo, first * VAO.INSTANCE_MATRIX_STRIDE )
+
+            # color is not an array on model VAOs, use the current generic attribute
+            glVertexAttrib4f( DebugDraw.COLOR_LOCATION, *color )
+
+            if self.renderer.SHARED_VAO:
+                fastGL.glDrawElementsInstancedBaseVertex( GL_TRIANGLES, mesh["num_indices"], GL_UNSIGNED_INT,
+                    ctypes.c_void_p(mesh["firstIndex"] * 4),
+                    count,
+                    mesh["baseVertex"]
+                )
+            else:
+                fastGL.glDrawElementsInstanced( GL_TRIANGLES, mesh["num_indices"], GL_UNSIGNED_INT, None, count )
+
+            first += count
+            self.draw_calls += 1
+
+        self.renderer.state.set_polygon_mode( GL_FILL )
+
+    def flush( self ) -> None:
+        """Render and clear everything pushed this frame, the main framebuffer must be bound"""
+        self.draw_calls = 0
+
+        if self._line_data:
+            self.lines.append( np.array( self._line_data, dtype=np.float32 ).reshape( -1, DebugDraw.LINE_FLOATS ) )
+
+        has_shapes = any( self.shapes.values() )
+
+        if not ( self.lines or self.overlay or has_shapes or self.meshes ):
+            return
+
+        state = self.renderer.state
+
+        depth_test_enabled  = glIsEnabled( GL_DEPTH_TEST )
+        blend_enabled       = glIsEnabled( GL_BLEND )
+
+        # shared state: alpha blended, no depth writes
+        self.renderer.use_shader( self.renderer.debug )
+
+        state.enable( GL_BLEND )
+        glBlendFunc( GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA )
+        glDepthMask( GL_FALSE )
+        state.enable( GL_DEPTH_TEST )
+
+        if self.lines:
+            glLineWidth( DebugDraw.LINE_WIDTH )
+            self._draw_lines( self.lines )
+
+        if has_shapes or self.meshes:
+            glLineWidth( DebugDraw.SHAPE_LINE_WIDTH )
+            state.enable( GL_POLYGON_OFFSET_LINE )
+            glPolygonOffset( -1.0, -1.0 )
+
+            if has_shapes:
+                self._draw_shapes()
+
+            if self.meshes:
+                self._draw_meshes()
+
+            state.disable( GL_POLYGON_OFFSET_LINE )
+
+        if self.overlay:
+            state.disable( GL_DEPTH_TEST )
+            glLineWidth( DebugDraw.OVERLAY_LINE_WIDTH )
+            self._draw_lines( self.overlay )
+
+        # restore
+        glLineWidth( 1.0 )
+        glDepthMask( GL_TRUE )
+        state.set_enabled( GL_DEPTH_TEST, bool( depth_test_enabled ) )
+        state.set_enabled( GL_BLEND, bool( blend_enabled ) )
+        state.bind_vao( 0 )
+
+        self.clear()
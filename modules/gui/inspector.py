@@ -34,7 +34,7 @@ from pathlib import Path
 import enum
 import uuid as uid
 
-import pybullet as p
+import modules.physicsApi as p
 
 class Inspector( Context ):
     def __init__( self, context : 'EmberEngine' ):
@@ -303,6 +303,13 @@ class Inspector( Context ):
             imgui.pop_id()
             return
 
+        # onUpdate cost
+        if self.renderer.game_runtime and script.instance is not None:
+            _color = imgui.ImVec4(1.0, 0.3, 0.3, 1.0) if script.over_budget else imgui.ImVec4(1.0, 1.0, 1.0, 0.6)
+            imgui.text_colored( _color, 
+                f"onUpdate: {script.update_time:.3f} ms (avg {script.update_time_avg:.3f}, max {script.update_time_max:.3f})" 
+            )
+
         # exported attributes
         self._draw_script_exported_attributes( script )
 
@@ -455,6 +462,7 @@ class Inspector( Context ):
 
             if any_changed:
                 gameObject._dirty |= GameObject.DirtyFlag_.light
+                self.context.update_scheduler.mark_dirty( gameObject )
 
             imgui.tree_pop()
 
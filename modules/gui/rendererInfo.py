@@ -291,7 +291,7 @@ class RendererInfo( Context ):
                        imgui.TableFlags_.scroll_x | \
                        imgui.TableFlags_.scroll_y
 
-        if imgui.begin_table( "Textures", 7, _table_flags ):
+        if imgui.begin_table( "Textures", 8, _table_flags ):
         
             imgui.table_setup_column("#")
             imgui.table_setup_column("")
@@ -299,13 +299,14 @@ class RendererInfo( Context ):
             imgui.table_setup_column("Bindless Handle")
             imgui.table_setup_column("Dim")
             imgui.table_setup_column("Raw Memory")
+            imgui.table_setup_column("Refs")
             imgui.table_setup_column("Path / Identifier")
             imgui.table_headers_row()
 
             for i in range(self.context.images._num_images):
                 texture_id = self.context.images.images[i]
                 meta = self.context.images.image_meta[i]
-                _bindless = self.context.images.texture_to_bindless[i]
+                _bindless = self.context.images.texture_to_bindless.get( i, 0 )
 
                 imgui.table_next_row()
 
@@ -329,11 +330,114 @@ class RendererInfo( Context ):
                 imgui.text( f"{meta.size/1024:.2f} kb" )
 
                 imgui.table_set_column_index(6)
-                imgui.text( f"{meta.path}" )
+                imgui.text( f"{meta.refcount}" )
+
+                imgui.table_set_column_index(7)
+                imgui.text( f"{meta.path}" if texture_id else "(free)" if not meta.pending else "(pending)" )
 
             imgui.end_table()
 
 
+    def _shaders( self ):
+        _table_flags = imgui.TableFlags_.resizable | \
+                       imgui.TableFlags_.borders_v | \
+                       imgui.TableFlags_.borders_outer | \
+                       imgui.TableFlags_.row_bg | \
+                       imgui.TableFlags_.scroll_y
+
+        if imgui.begin_table( "Shaders", 5, _table_flags ):
+        
+            imgui.table_setup_column("Shader")
+            imgui.table_setup_column("Program")
+            imgui.table_setup_column("Binary cache")
+            imgui.table_setup_column("Compile")
+            imgui.table_setup_column("Ready (wall)")
+            imgui.table_headers_row()
+
+            for shader in self.renderer.shaders:
+                imgui.table_next_row()
+
+                imgui.table_set_column_index(0)
+                imgui.text( f"{shader.uid}" )
+
+                imgui.table_set_column_index(1)
+                _state = " (linking)" if shader.pending is not None else " (reload failed)" if shader.error else ""
+                imgui.text( f"{shader.program}{_state}" )
+                if shader.error and imgui.is_item_hovered():
+                    imgui.set_tooltip( shader.error )
+
+                imgui.table_set_column_index(2)
+                imgui.text( "hit" if shader.from_cache else "miss" )
+
+                imgui.table_set_column_index(3)
+                imgui.text( f"{shader.compile_time_ms:.2f} ms" )
+
+                imgui.table_set_column_index(4)
+                imgui.text( f"{shader.ready_time_ms:.2f} ms" )
+                if imgui.is_item_hovered():
+                    imgui.set_tooltip( "Submit until the program was swapped in, includes parallel compilation of other programs and the poll delay" )
+
+            imgui.end_table()
+
+    def _scripts( self ):
+        _over_budget_color = imgui.color_convert_float4_to_u32( imgui.ImVec4(1, 0, 0, 0.5) )
+
+        self.helper.draw_color_legend_item( "Over budget", _over_budget_color )
+
+        _, self.settings.script_budget_ms = imgui.drag_float(
+            f"Budget (ms)", self.settings.script_budget_ms, 0.1, 0.0, 100.0
+        )
+
+        _table_flags = imgui.TableFlags_.resizable | \
+                       imgui.TableFlags_.borders_v | \
+                       imgui.TableFlags_.borders_outer | \
+                       imgui.TableFlags_.row_bg | \
+                       imgui.TableFlags_.scroll_y
+
+        if imgui.begin_table( "Scripts", 6, _table_flags ):
+        
+            imgui.table_setup_column("GameObject")
+            imgui.table_setup_column("Script")
+            imgui.table_setup_column("Rate")
+            imgui.table_setup_column("Last")
+            imgui.table_setup_column("Average")
+            imgui.table_setup_column("Max")
+            imgui.table_headers_row()
+
+            # most expensive first
+            scripts = [ script for obj in self.context.update_scheduler.scripted.values() 
+                               for script in obj.scripts if script.instance is not None ]
+            scripts.sort( key=lambda x: x.update_time_avg, reverse=True )
+
+            for script in scripts:
+                imgui.table_next_row()
+
+                if script.over_budget:
+                    imgui.table_set_bg_color( 1, _over_budget_color )
+
+                imgui.table_set_column_index(0)
+                imgui.text( f"{script.gameObject.name}" )
+
+                imgui.table_set_column_index(1)
+                imgui.text( f"{script.class_name_f}" )
+                imgui.set_item_tooltip( str(script.path) )
+
+                imgui.table_set_column_index(2)
+                _rate       = script.instance.update_rate
+                _interval   = script.instance.update_interval
+                imgui.text( f"{_rate:g} Hz" if _rate > 0.0 else f"1/{_interval} frames" if _interval > 1 else "every frame" )
+
+                imgui.table_set_column_index(3)
+                imgui.text( f"{script.update_time:.3f} ms" )
+
+                imgui.table_set_column_index(4)
+                imgui.text( f"{script.update_time_avg:.3f} ms" )
+
+                imgui.table_set_column_index(5)
+                imgui.text( f"{script.update_time_max:.3f} ms" )
+
+            imgui.end_table()
+
     def render( self ):
         if imgui.begin_popup_modal("Renderer Info", None, imgui.WindowFlags_.no_resize)[0]:
             imgui.set_window_size( imgui.ImVec2(1200, 600) )  # Example: width=4
@@ -364,6 +468,14 @@ class RendererInfo( Context ):
                     self._textures()
                     imgui.end_tab_item()
 
+                if imgui.begin_tab_item("Shaders##Tab4")[0]:
+                    self._shaders()
+                    imgui.end_tab_item()
+
+                if imgui.begin_tab_item("Scripts##Tab5")[0]:
+                    self._scripts()
+                    imgui.end_tab_item()
+
                 # End tab bar
                 imgui.end_tab_bar()
 
@@ -282,6 +282,37 @@ class SceneSettings( Context ):
 
             imgui.tree_pop()
 
+    def _physics_settings( self, scene : SceneManager.Scene ) -> None:
+        self.helper._node_sep()
+        if imgui.tree_node_ex( f"{fa.ICON_FA_PERSON_FALLING_BURST} Physics", imgui.TreeNodeFlags_.default_open ):
+            self.helper._node_header_pad()
+
+            _, scene["physics_step_rate"] = imgui.drag_float(
+                f"Step rate (Hz)", scene["physics_step_rate"], 1.0, 1.0, 1000.0
+            )
+
+            _, scene["physics_max_substeps"] = imgui.drag_int(
+                f"Max substeps", scene["physics_max_substeps"], 1, 1, 64
+            )
+
+            _, scene["physics_solver_iterations"] = imgui.drag_int(
+                f"Solver iterations", scene["physics_solver_iterations"], 1, 1, 500
+            )
+
+            _, scene["physics_sleeping"] = imgui.checkbox( f"Allow sleeping", scene["physics_sleeping"] )
+
+            _, scene["physics_sleep_threshold"] = imgui.drag_float(
+                f"Sleep threshold", scene["physics_sleep_threshold"], 0.0001, 0.0, 1.0, "%.4f"
+            )
+
+            if self.renderer.game_running:
+                physics_time = self.renderer.physics_time
+
+                imgui.text( f"Steps: {physics_time.steps} ({physics_time.step_time:.2f} ms)" )
+                imgui.text( f"Dropped: {physics_time.dropped:.2f} s" )
+
+            imgui.tree_pop()
+
     def _general_settings( self, scene : SceneManager.Scene ) -> None:
         if imgui.tree_node_ex( f"{fa.ICON_FA_SLIDERS} General", imgui.TreeNodeFlags_.default_open ):
             self.helper._node_header_pad()
@@ -297,5 +328,6 @@ class SceneSettings( Context ):
         self._general_settings( _scene )
         self._sky_settings( _scene )
         self._fog_settings( _scene )
+        self._physics_settings( _scene )
 
         imgui.end()
\ No newline at end of file
@@ -1,20 +1,26 @@
+import os
 import sys
 from pathlib import Path
-from typing import List
+from typing import List, Dict
 
 
 from OpenGL.GL import *
 from OpenGL.GLU import *
 from OpenGL.GL.ARB.bindless_texture import *
+from OpenGL.GL.EXT.texture_compression_s3tc import GL_COMPRESSED_RGBA_S3TC_DXT5_EXT
 
-from modules.render.image import ImageUpload, upload_image
-from modules.render.types import ImageMeta
+from modules.render.image import ImageUpload, upload_image, upload_image_pbo, decode_image, pack_orm, pack_orm_channels
+from modules.render.textureCache import TextureCache
+from modules.render.types import ImageMeta, ImageHandle
 from modules.context import Context
 
 import traceback
 
 from dataclasses import dataclass, field
 import queue
+import threading
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
 
 import pygame
 import numpy as np
@@ -28,6 +34,15 @@ class Images( Context ):
         flip_y          : bool = field( default=True )
         base            : "Images.ImageUpload" = field( default=None )
 
+    @dataclass(slots=True)
+    class InFlight:
+        """Texture streamed through a PBO, published once the fence signals"""
+        image_index     : int  = field( default=-1 )
+        texture_id      : int  = field( default=0 )
+        pbo             : int  = field( default=0 )
+        fence           : object = field( default=None )
+        base            : "Images.ImageUpload" = field( default=None )
+
     @staticmethod
     def create_white_image( size ):
         white_surface = pygame.Surface(size)
@@ -46,29 +61,75 @@ class Images( Context ):
         white_surface.fill((127, 127, 127, 255))
         return white_surface
 
-    def image_upload_queue_flush( self ) -> None:
-        while not self.upload_queue.empty():
-            item = self.upload_queue.get()
-            image_index = item.image_index
+    def _publish( self, image_index : int, texture_id : int, base : ImageUpload ) -> None:
+        """Make an uploaded texture visible to the renderer, until then the default image is bound"""
+        self.images[image_index] = texture_id
 
-            texture_id = glGenTextures( 1 ) 
+        _path = str(base.path)
+        print(f"load: {_path}")
+        _meta : ImageMeta = self.image_meta[image_index]
+        _meta.path       = _path
+        _meta.dimension  = (base.width, base.height)
+        #_meta.size       = base.width * base.height * 4
+        _meta.size       = len(base.buffer)
+        _meta.pending    = False
 
-            upload_image( texture_id, item.base )
+        handle = self.make_bindless( image_index, texture_id )
+        self.context.renderer.ubo.ubo_materials._dirty = True
 
-            # check if texture is valid
-            # ..later
+        # driver compressed on upload, read back once so the next load skips decoding and compression
+        if base.cache_path is not None:
+            try:
+                if not self.texture_cache.store_texture( base.cache_path, texture_id, base ):
+                    self.texture_cache.store( base.cache_path, base, internal_format=GL_RGBA )
 
-            self.images[image_index] = texture_id
+            except Exception as e:
+                exc_type, exc_value, exc_tb = sys.exc_info()
+                self.console.error( e, traceback.format_tb(exc_tb) )
 
-            _path = str(item.base.path)
-            print(f"load: {_path}")
-            self.image_meta[image_index].path       = _path
-            self.image_meta[image_index].dimension  = (item.base.width, item.base.height)
-            #self.image_meta[image_index].size       = item.base.width * item.base.height * 4
-            self.image_meta[image_index].size       = len(item.base.buffer)
+            base.cache_path = None
 
-            handle = self.make_bindless( image_index, texture_id )
-            self.context.renderer.ubo.ubo_materials._dirty = True
+    def poll_uploads( self ) -> None:
+        """Publish PBO uploads whose fence has signaled, release the PBO and fence"""
+        if not self._in_flight:
+            return
+
+        in_flight = []
+
+        for item in self._in_flight:
+            status = glClientWaitSync( item.fence, 0, 0 )
+
+            if status not in ( GL_ALREADY_SIGNALED, GL_CONDITION_SATISFIED ):
+                in_flight.append( item )
+                continue
+
+            glDeleteSync( item.fence )
+            glDeleteBuffers( 1, [item.pbo] )
+
+            self._publish( item.image_index, item.texture_id, item.base )
+
+        self._in_flight = in_flight
+
+    def upload( self, item : "Images.Queue" ) -> None:
+        """Upload a decoded image, PBO uploads are published by poll_uploads() once their fence signals"""
+        image_index = item.image_index
+
+        texture_id = glGenTextures( 1 ) 
+
+        if not self.settings.image_use_pbo:
+            upload_image( texture_id, item.base )
+            self._publish( image_index, texture_id, item.base )
+            return
+
+        pbo, fence = upload_image_pbo( texture_id, item.base )
+
+        self._in_flight.append( Images.InFlight(
+            image_index = image_index,
+            texture_id  = texture_id,
+            pbo         = pbo,
+            fence       = fence,
+            base        = item.base
+        ) )
 
     def __init__( self, context ):
         """Setup image buffers that store the GPU texture uid's and paths for fast loading
@@ -81,11 +142,21 @@ class Images( Context ):
 
         self._num_images = 0
 
-        # lookup table containing GPU texture ids
-        self.images = [None] * 300
+        # lookup table containing GPU texture ids, grows on demand
+        self.images : List[int] = []
+
+        # store meta data, eg: path, size, refcount
+        self.image_meta : List[ImageMeta] = []
 
-        # store meta data, eg: path, size
-        self.image_meta : List[ImageMeta] = [ImageMeta() for _ in range(300) ]
+        # registry index: path or content key -> image index
+        self.image_map : Dict[str, int] = {}
+
+        # slots released by collect_unreferenced(), reused before growing
+        self._free_slots : List[int] = []
+
+        # models (and so materials) are loaded from a worker thread
+        self._lock = threading.Lock()
+        self._collect_requested : bool = False
 
         # The actual GPU upload is using a queue, this allows for model load threading optimization
         # because the OpenGL context is not shared across threads.
@@ -93,6 +164,19 @@ class Images( Context ):
         # for that frame, default texture is used.
         self.upload_queue = queue.Queue()
 
+        # image files are decoded (flip, mip chain) by a worker pool,
+        # uploads are streamed through PBOs and stay in flight until their fence signals.
+        self._decode_pool = ThreadPoolExecutor( 
+            max_workers         = self.settings.image_decode_workers, 
+            thread_name_prefix  = "image_decode"
+        )
+        self._in_flight : List[Images.InFlight] = []
+
+        self.texture_cache : TextureCache = TextureCache( Path( self.settings.texture_cache_path ) ) \
+            if self.settings.texture_cache_enabled else None
+        self._cache_compress : bool = self.settings.texture_cache_compress \
+            and self.renderer.has_extension( "GL_EXT_texture_compression_s3tc" )
+
         # bindless texture mapping
         self.texture_to_bindless : dict = {}
 
@@ -107,21 +191,228 @@ class Images( Context ):
         self.whiteImage     = self.loadOrFindFullPath( Path(f"{self.settings.engine_texture_path}whiteimage.jpg") )
         self.blackImage     = self.loadOrFindFullPath( Path(f"{self.settings.engine_texture_path}blackimage.jpg") )
 
+        # engine images are pinned, they are never collected
+        for image_index in ( self.defaultImage, self.defaultRMO, self.defaultNormal, self.whiteImage, self.blackImage ):
+            self.acquire( image_index )
+
+    #
+    # registry
+    #
+    @staticmethod
+    def content_key( buffer ) -> str:
+        """Create a registry key from raw image data, used for images without a path (eg. embedded textures)
+
+        :param buffer: The encoded or decoded image data
+        :type buffer: bytes
+        :return: The content key
+        :rtype: str
+        """
+        return f"*content_{hashlib.blake2b( buffer, digest_size=16 ).hexdigest()}"
+
     def get_by_path( self, path : Path ):
-        for i, meta in enumerate(self.image_meta):
-            if str(path) == meta.path:
-                return i
+        """Find an image index by path or content key
+
+        :param path: The path or content key the image was registered with
+        :type path: Path | str
+        :return: The image index, None if not registered
+        :rtype: int | None
+        """
+        if path is None:
+            return None
+
+        return self.image_map.get( str(path) )
+
+    def _allocate( self, key : str = None ) -> int:
+        """Reserve a slot in the registry, reuses freed slots before growing the storage
+
+        :param key: The path or content key to register the slot with, None for anonymous images
+        :type key: str
+        :return: The image index
+        :rtype: int
+        """
+        with self._lock:
+            if self._free_slots:
+                index = self._free_slots.pop()
+                generation = self.image_meta[index].generation
+            else:
+                index = len(self.images)
+                generation = 0
+                self.images.append( None )
+                self.image_meta.append( None )
+
+            self.image_meta[index] = ImageMeta(
+                key         = key,
+                generation  = generation,
+                pending     = True
+            )
+
+            if key is not None:
+                self.image_map[key] = index
+
+            self._num_images = len(self.images)
+
+        return index
+
+    def acquire( self, image_index : int ) -> int:
+        """Add a reference to an image, referenced images are never collected
+
+        :param image_index: the image index
+        :type image_index: int
+        :return: the image index
+        :rtype: int
+        """
+        if image_index is None:
+            return image_index
+
+        with self._lock:
+            self.image_meta[image_index].refcount += 1
+
+        return image_index
+
+    def release( self, image_index : int ) -> None:
+        """Remove a reference to an image, request a collect when it is no longer referenced
+
+        :param image_index: the image index
+        :type image_index: int
+        """
+        if image_index is None:
+            return
+
+        with self._lock:
+            meta : ImageMeta = self.image_meta[image_index]
+            meta.refcount = max( 0, meta.refcount - 1 )
+
+            if meta.refcount == 0:
+                self._collect_requested = True
+
+    def _discard_failed( self, image_index : int ) -> None:
+        """Unregister a slot whose decode failed, so the source is loaded again on the next request.
+        The default image is used until then, the slot itself is freed by collect_unreferenced()
+        once materials dropped it, references may still be acquired while models load
+
+        :param image_index: the image index
+        :type image_index: int
+        """
+        with self._lock:
+            meta : ImageMeta = self.image_meta[image_index]
+            meta.pending    = False
+            meta.failed     = True
+
+            if meta.key is not None and self.image_map.get( meta.key ) == image_index:
+                del self.image_map[meta.key]
+
+            self._collect_requested = True
+
+    def request_collect( self ) -> None:
+        """Flag the registry to search for unreferenced images on the next collect_unreferenced()"""
+        self._collect_requested = True
+
+    def get_handle( self, image_index : int ) -> ImageHandle:
+        """Get a generation-checked handle for an image index
+
+        :param image_index: the image index
+        :type image_index: int
+        :return: The handle, stays detectable as stale when the slot is freed
+        :rtype: ImageHandle
+        """
+        return ImageHandle( image_index, self.image_meta[image_index].generation )
+
+    def is_valid( self, handle : ImageHandle ) -> bool:
+        """Check whether a handle still points to the image it was created for"""
+        if handle.index < 0 or handle.index >= self._num_images:
+            return False
+
+        return self.image_meta[handle.index].generation == handle.generation
+
+    def resolve( self, handle : ImageHandle ) -> int:
+        """Resolve a handle to an image index, stale handles resolve to the default image
+
+        :param handle: The handle
+        :type handle: ImageHandle
+        :return: the image index
+        :rtype: int
+        """
+        return handle.index if self.is_valid( handle ) else self.defaultImage
+
+    def _busy_loading( self ) -> bool:
+        """Whether models (and their materials) are still being loaded, references may not be acquired yet"""
+        models = getattr( self.context, "models", None )
+        uploads = getattr( self.context, "uploads", None )
+
+        if models is None:
+            return True
 
-        return None
+        if uploads is not None and uploads.has_pending( uploads.Kind_.model ):
+            return True
+
+        return bool( models.model_load_queue.unfinished_tasks ) or not models.model_ready_queue.empty()
+
+    def free( self, image_index : int ) -> None:
+        """Delete the GPU texture of a slot and make the slot available for reuse.
+        Bindless handles are made non-resident first.
+
+        :param image_index: the image index
+        :type image_index: int
+        """
+        texture_id = self.images[image_index]
+        handle = self.texture_to_bindless.get( image_index, 0 )
+
+        if handle and self.context.renderer.USE_BINDLESS_TEXTURES:
+            glMakeTextureHandleNonResidentARB( handle )
+
+        if texture_id:
+            glDeleteTextures( [texture_id] )
+
+        with self._lock:
+            meta : ImageMeta = self.image_meta[image_index]
+
+            if meta.key is not None and self.image_map.get( meta.key ) == image_index:
+                del self.image_map[meta.key]
+
+            self.image_meta[image_index] = ImageMeta( generation = meta.generation + 1 )
+            self.images[image_index] = None
+            self.texture_to_bindless[image_index] = 0
+            self._free_slots.append( image_index )
+
+    def collect_unreferenced( self, force : bool = False ) -> int:
+        """Find and free uploaded images that are no longer referenced.
+        Only runs when requested (see release() and request_collect()) and no models are loading.
+
+        :param force: Ignore the request flag
+        :type force: bool
+        :return: The number of freed images
+        :rtype: int
+        """
+        if not (force or self._collect_requested) or self._busy_loading():
+            return 0
+
+        self._collect_requested = False
+        freed = 0
+
+        for image_index, meta in enumerate( self.image_meta ):
+            if meta.refcount > 0 or meta.pending:
+                continue
+
+            if not self.images[image_index] and not meta.failed:
+                continue
+
+            self.free( image_index )
+            freed += 1
+
+        if freed:
+            self.context.renderer.ubo.ubo_materials._dirty = True
+            self.console.note( f"Freed {freed} unreferenced texture(s)" )
+
+        return freed
 
     def tex_to_bindless( self, index ):
-        if index in self.texture_to_bindless:
-            handle = self.texture_to_bindless[index]
+        handle = self.texture_to_bindless.get( index )
+
+        if handle is None:
+            handle = self.texture_to_bindless.get( self.defaultImage )
 
-            # todomeh, fix this. init to 0
-            return handle if handle is not None else 0
-        else:
-            self.texture_to_bindless[self.defaultImage]
+        # todomeh, fix this. init to 0
+        return handle if handle is not None else 0
 
     def get_gl_texture( self, image_index ):
         """Get the GPU uid of a texture
@@ -131,7 +422,10 @@ class Images( Context ):
         :param: the texture uid in GPU memory
         :rtype: uint32/uintc
         """
-        return self.images[image_index] if self.images[image_index] else self.images[self.defaultImage]
+        if image_index is None or image_index >= self._num_images or not self.images[image_index]:
+            return self.images[self.defaultImage]
+
+        return self.images[image_index]
 
     def make_bindless( self, image_index : int, texture_id ):
         """Create a bindless handle for a texture an map it"""
@@ -150,53 +444,25 @@ class Images( Context ):
         """Create a 256x256 texture where each channel represents a phyisical kind, occlusion, roughness, metallic
         Current map format is ORM (occlusion, roughness, metallic )"""
         size = 256
-        image_size = (size, size)
-
-        roughness = Images.create_grey_image( image_size )
-        metallic = Images.create_black_image( image_size )
-        ambient = Images.create_white_image( image_size )
-
-        combined_image = pygame.Surface(image_size)
-        roughness.lock()
-        metallic.lock()
-        ambient.lock()
-        combined_image.lock()
-
-        roughness_array = pygame.surfarray.array3d(roughness).astype(np.float32) / 255.0
-        metallic_array = pygame.surfarray.array3d(metallic).astype(np.float32) / 255.0
-        ambient_occlusion_array = pygame.surfarray.array3d(ambient).astype(np.float32) / 255.0
-
-        # you may need to transpose based on your orientation.
-        combined_array = np.zeros((size, size, 4), dtype=np.float32)
-
-        # RMO
-        #combined_array[..., 0] = roughness_array[..., 0]                            # Roughness from R channel
-        #combined_array[..., 1] = metallic_array[..., 1]                             # Metallic from G channel
-        #combined_array[..., 2] = ambient_occlusion_array[..., 2]                    # AO from B channel
 
-        # ORM
-        combined_array[..., 0] = ambient_occlusion_array[..., 2]                    # AO from B channel
-        combined_array[..., 1] = roughness_array[..., 0]                            # Roughness from R channel
-        combined_array[..., 2] = metallic_array[..., 1]                             # Metallic from G channel
+        upload_data = pack_orm_channels( 
+            occlusion   = 255,     # white
+            roughness   = 127,     # grey
+            metallic    = 0,       # black
+            size        = ( size, size )
+        )
+        upload_data.path = "*physicalmap_default"
 
-        combined_array[..., 3] = 1.0
-        combined_array = np.rot90(combined_array, k=1)
+        return self.queue_upload( upload_data )
 
-        return self.queue_upload( 
-            upload_data = ImageUpload(
-                path                = "*physicalmap_default",
-                width               = size,
-                height              = size,
-                buffer              = combined_array.tobytes(),
-                _internal_format    = GL_RGBA16F,
-                _format             = GL_FLOAT,
-                mipmap              = True
-            )
-        )
+    @staticmethod
+    def physical_map_key( roughness_path : Path, metallic_path : Path, ao_path : Path ) -> str:
+        """Registry key of a packed ORM map, built from its three source paths"""
+        return f"*orm|{roughness_path or ''}|{metallic_path or ''}|{ao_path or ''}"
 
     def loadOrFindPhysicalMap( self, roughness_path : Path, metallic_path : Path, ao_path : Path ) -> int:
-        """Load/Create/Combine a physical RMO texture.
-        Find from cache is not implemented yet.
+        """Load/Create/Combine a physical ORM texture.
+        Packing runs in the decode pool, the result is cached by its three source paths.
 
         :param roughness_path: 
         :type roughness_path: Path
@@ -207,119 +473,77 @@ class Images( Context ):
         :return: the image index point to image list containing the texture uid in GPU memory
         :rtype: int
         """
-        index = self._num_images
+        # TODO: fix missing file issue..
+        roughness_path  = roughness_path if roughness_path and os.path.isfile( roughness_path ) else False
+        metallic_path   = metallic_path  if metallic_path  and os.path.isfile( metallic_path )  else False
+        ao_path         = ao_path        if ao_path        and os.path.isfile( ao_path )        else False
+
+        if not roughness_path and not metallic_path and not ao_path:
+            self.console.error( "No map found!" )
+            return self.defaultRMO
+
+        # find
+        key = Images.physical_map_key( roughness_path, metallic_path, ao_path )
 
+        exists = self.get_by_path( key )
+        if exists is not None:
+            return exists
+
+        # reserve the slot, pack in the worker pool and queue GPU upload
+        index = self._allocate( key )
+        self._decode_pool.submit( self._pack_job, index, key, roughness_path, metallic_path, ao_path )
+
+        return index
+
+    def _pack_job( self, image_index : int, key : str, roughness_path : Path, metallic_path : Path, ao_path : Path ) -> None:
+        """Worker pool job, load a packed ORM map from the texture cache or pack it, then queue the GPU upload"""
         try:
-            size = (-1, -1)
-
-            # Load images and get highest dimension
-            # TODO: fix missing file issue..
-            if roughness_path:
-                roughness = pygame.image.load( roughness_path )
-                if size < roughness.get_size() : size = roughness.get_size()
-
-            if metallic_path:
-                metallic = pygame.image.load( metallic_path )
-                if size < metallic.get_size() : size = metallic.get_size()
-
-            if ao_path:
-                ambient_occlusion = pygame.image.load( ao_path )
-                if size < ambient_occlusion.get_size() : size = ambient_occlusion.get_size()
-
-            if size == (-1, -1):
-                raise ValueError("No map found!")
-
-            # fill empty channels
-            if not roughness_path:
-                roughness = Images.create_grey_image( size )
-
-            if not metallic_path:
-                metallic = Images.create_black_image( size )
-
-            if not ao_path:
-                ambient_occlusion = Images.create_white_image( size )
-
-            # Ensure all images are the same size
-            # todo: should probably auto-scale to highest dimension ..
-            if roughness.get_size() != metallic.get_size() or roughness.get_size() != ambient_occlusion.get_size():
-                raise ValueError("All images must be the same size!")
-
-            # Get image dimensions
-            image_width, image_height = roughness.get_size()
-
-            # Create a new surface to hold combined image data
-            combined_image = pygame.Surface((image_width, image_height))
-
-            # Lock surfaces to access pixel data
-            roughness.lock()
-            metallic.lock()
-            ambient_occlusion.lock()
-            combined_image.lock()
-
-            roughness_array = pygame.surfarray.array3d(roughness).astype(np.float32) / 255.0
-            metallic_array = pygame.surfarray.array3d(metallic).astype(np.float32) / 255.0
-            ambient_occlusion_array = pygame.surfarray.array3d(ambient_occlusion).astype(np.float32) / 255.0
-
-            combined_array = np.zeros((image_width, image_height, 4), dtype=np.float32)
-            # RMO
-            #combined_array[..., 0] = roughness_array[..., 0]                            # Roughness from R channel
-            #combined_array[..., 1] = metallic_array[..., 1]                             # Metallic from G channel
-            #combined_array[..., 2] = ambient_occlusion_array[..., 2]                    # AO from B channel
-
-            # ORM
-            combined_array[..., 0] = ambient_occlusion_array[..., 2]                    # AO from B channel
-            combined_array[..., 1] = roughness_array[..., 0]                            # Roughness from R channel
-            combined_array[..., 2] = metallic_array[..., 1]                             # Metallic from G channel
-
-
-            combined_array[..., 3] = 1.0
-            combined_array = np.rot90(combined_array, k=1)
-
-            # Unlock surfaces
-            roughness.unlock()
-            metallic.unlock()
-            ambient_occlusion.unlock()
-            combined_image.unlock()
-
-            base : ImageUpload = ImageUpload(
-                path                = f"rmomap_placeholder_{index}",
-                width               = image_width,
-                height              = image_height,
-                buffer              = combined_array.tobytes(),
-                _internal_format    = GL_RGBA16F,
-                _format             = GL_FLOAT,
-                mipmap              = True
-            )
+            cache_path = self._cache_key( [roughness_path, metallic_path, ao_path], "orm8" ) if self.texture_cache else None
+            base = self._load_cached( cache_path, key ) if cache_path else None
 
-            self.upload_queue.put(Images.Queue(
-                image_index     = index,
-                base            = base,
-            ))
+            if base is None:
+                base = pack_orm( roughness_path, metallic_path, ao_path )
+                base.path = key
+                self._store_cached( cache_path, base )
 
         except Exception as e:
             exc_type, exc_value, exc_tb = sys.exc_info()
             self.console.error( e, traceback.format_tb(exc_tb) )
 
-            return self.defaultImage
+            self._discard_failed( image_index )
+            return
 
-        self._num_images += 1
-        return index
+        self.upload_queue.put(Images.Queue(
+            image_index = image_index,
+            base        = base
+        ))
+
+    def queue_upload( self, upload_data : ImageUpload, key : str = False ) -> int:
+        """Reserve a registry slot and queue the GPU upload
+
+        :param upload_data: The decoded image
+        :type upload_data: ImageUpload
+        :param key: The registry key, defaults to the upload path. None registers an anonymous image
+        :type key: str
+        :return: the image index
+        :rtype: int
+        """
+        if key is False:
+            key = str(upload_data.path) if upload_data.path is not None else None
 
-    def queue_upload( self, upload_data : ImageUpload ) -> int:
-        index = self._num_images
+        index = self._allocate( key )
 
         self.upload_queue.put(Images.Queue(
             image_index = index,
             base        = upload_data
         ))
 
-        self._num_images += 1
         return index
 
     def pixelsToImage( self, data, path : Path = None ):
         exists = self.get_by_path( path )
         if path is not None:
-            if exists:
+            if exists is not None:
                 return None, None, None
 
         byte_stream = io.BytesIO(data)
@@ -334,11 +558,12 @@ class Images( Context ):
     def loadFromPixels( self, width, height, buffer, path : Path = None ):
         """Submit image data to the upload queue, Path is optional"""
 
-        # find
-        if path is not None:
-            exists = self.get_by_path( path )
-            if exists:
-                return exists
+        # find, anonymous pixel data is registered by content
+        key = str(path) if path is not None else Images.content_key( buffer )
+
+        exists = self.get_by_path( key )
+        if exists is not None:
+            return exists
 
         return self.queue_upload( 
             upload_data = ImageUpload(
@@ -348,7 +573,8 @@ class Images( Context ):
                     buffer              = buffer,
                     _format             = GL_UNSIGNED_BYTE,
                     _internal_format    = GL_RGBA
-                )
+                ),
+            key = key
             )
 
     def loadOrFindFullPath( self, path : Path, flip_x: bool = False, flip_y: bool = True ) -> int:
@@ -366,15 +592,57 @@ class Images( Context ):
 
         # find
         exists = self.get_by_path( path )
-        if exists:
+        if exists is not None:
             return exists
 
-        # load and queue GPU upload
-        base_buffer = pygame.transform.flip( pygame.image.load( path ), flip_x, flip_y )
-        width, height = base_buffer.get_rect().size
-        buffer = pygame.image.tostring( base_buffer, "RGBA" )
+        # reserve the slot, decode in the worker pool and queue GPU upload
+        index = self._allocate( str(path) )
+        self._decode_pool.submit( self._decode_job, index, path, flip_x, flip_y )
+
+        return index
+
+    def _decode_job( self, image_index : int, path : Path, flip_x : bool, flip_y : bool ) -> None:
+        """Worker pool job, load an image from the texture cache or decode it, then queue the GPU upload"""
+        try:
+            cache_path = self._cache_key( [path], f"rgba8|flip_x={int(flip_x)}|flip_y={int(flip_y)}" ) if self.texture_cache else None
+            base = self._load_cached( cache_path, path ) if cache_path else None
+
+            if base is None:
+                base = decode_image( path, flip_x=flip_x, flip_y=flip_y, mipmap=True )
+                self._store_cached( cache_path, base )
+
+        except Exception as e:
+            exc_type, exc_value, exc_tb = sys.exc_info()
+            self.console.error( e, traceback.format_tb(exc_tb) )
+
+            self._discard_failed( image_index )
+            return
+
+        self.upload_queue.put(Images.Queue(
+            image_index = image_index,
+            flip_x      = flip_x,
+            flip_y      = flip_y,
+            base        = base
+        ))
+
+    def _cache_key( self, sources : list, options : str ) -> Path:
+        return self.texture_cache.key( sources, f"{options}|s3tc={int(self._cache_compress)}" )
+
+    def _load_cached( self, cache_path : Path, source ) -> ImageUpload:
+        """Memory-map a texture from the cache, None on a miss"""
+        return self.texture_cache.load( cache_path, source=source )
+
+    def _store_cached( self, cache_path : Path, base : ImageUpload ) -> None:
+        """Write a decoded texture to the cache, compressed textures are written after upload (see _publish)"""
+        if cache_path is None:
+            return
+
+        if self._cache_compress:
+            base._internal_format   = GL_COMPRESSED_RGBA_S3TC_DXT5_EXT
+            base.cache_path         = cache_path
+            return
 
-        return self.loadFromPixels( width, height, buffer, path )
+        self.texture_cache.store( cache_path, base )
 
     def bind_gl( self, texture_id : int, texture_index, shader_uniform : str, shader_index : int ):
         """Bind texture using OpenGL with image index
@@ -388,9 +656,8 @@ class Images( Context ):
         :param shader_index: Represent the number also indicated with 'texture_index'. revisit this?
         :type shader_index: int
         """
-        glActiveTexture( texture_index )
-        glBindTexture( GL_TEXTURE_2D, texture_id )
-        glUniform1i(glGetUniformLocation( self.renderer.shader.program, shader_uniform ), shader_index)
+        self.renderer.state.bind_texture( texture_index, GL_TEXTURE_2D, texture_id )
+        self.renderer.state.uniform_1i( self.renderer.shader.location( shader_uniform ), shader_index )
 
     def bind( self, image_index : int, texture_index, shader_uniform : str, shader_index : int ):
         """Bind texture using OpenGL with image index
@@ -406,6 +673,5 @@ class Images( Context ):
         """
         texture_id = self.get_gl_texture(image_index)
         
-        glActiveTexture( texture_index )
-        glBindTexture( GL_TEXTURE_2D, texture_id )
-        glUniform1i(glGetUniformLocation( self.renderer.shader.program, shader_uniform ), shader_index)
\ No newline at end of file
+        self.renderer.state.bind_texture( texture_index, GL_TEXTURE_2D, texture_id )
+        self.renderer.state.uniform_1i( self.renderer.shader.location( shader_uniform ), shader_index )
\ No newline at end of file
@@ -96,10 +96,27 @@ class Materials( Context ):
             else:
                 mat.phyiscal = self.images.loadOrFindPhysicalMap( r, m, o ) 
 
+        self._acquire_textures( mat )
         self._num_materials += 1
 
         return index
 
+    # Materials are owned by the models they were built for, Models caches those by path for the
+    # whole session and shares them across scenes. Clearing or reloading a scene drops no material,
+    # their textures stay referenced. Only textures that no material took end up collected.
+    def _texture_slots( self, mat : Material ) -> tuple:
+        return ( mat.albedo, mat.normal, mat.emissive, mat.opacity, mat.phyiscal )
+
+    def _acquire_textures( self, mat : Material ) -> None:
+        """Reference the images of a material in the image registry"""
+        for image_index in self._texture_slots( mat ):
+            self.images.acquire( image_index )
+
+    def _release_textures( self, mat : Material ) -> None:
+        """Drop the image references of a material, unreferenced images are collected by the image registry"""
+        for image_index in self._texture_slots( mat ):
+            self.images.release( image_index )
+
     def getMaterialByIndex( self, index : int ) -> Material:
         """Get material by index, return default material if out of scope
 
@@ -192,6 +209,9 @@ class Materials( Context ):
         # initialize empty material
         index = self.buildMaterial()
         mat = self.materials[index]
+
+        # references are taken again once the textures are resolved
+        self._release_textures( mat )
   
         r = False
         m = False
@@ -299,6 +319,8 @@ class Materials( Context ):
 
         mat.hasNormalMap = int( mat.normal is not self.images.defaultNormal )
 
+        self._acquire_textures( mat )
+
         self.context.renderer.ubo.ubo_materials._dirty = True
         return index
 
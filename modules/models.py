@@ -353,19 +353,25 @@ class Models( Context ):
 
             self.model_load_queue.task_done()
 
-    def model_loader_thread_flush( self ) -> None:
-        """Receives ready CPU prepared meshes from work thread and uploads them to the GPU."""
-        while not self.model_ready_queue.empty():
-            index, cpu_meshes = self.model_ready_queue.get()
+    def finish_load( self, index : int, cpu_meshes : list[CPUMeshData] ) -> None:
+        """Upload a CPU prepared model to the GPU and mark it ready for rendering
 
-            self.upload_to_GPU( index, cpu_meshes )
-            self.model_loading.pop( index )
+        :param index: Internal model index
+        :type index: int
+        :param cpu_meshes: List of CPU mesh data objects
+        :type cpu_meshes: list[CPUMeshData]
+        """
+        self.upload_to_GPU( index, cpu_meshes )
+        self.model_loading.pop( index )
+
+        # construct static mesh matrix buffer
+        self.create_matrices( index )
 
-            # construct static mesh matrix buffer
-            self.create_matrices( index )
+        if self.context.renderer.USE_INDIRECT:
+            self.context.renderer.ubo.comp_meshnode_matrices_ssbo._mark_dirty()
 
-            if self.context.renderer.USE_INDIRECT:
-                self.context.renderer.ubo.comp_meshnode_matrices_ssbo._mark_dirty()
+        # preloaded textures that ended up unused by any material can be freed
+        self.context.images.request_collect()
 
     def loadOrFind( self, path : Path, material : int = -1, lazy_load : bool = True ) -> int:
         """Load or find an model, implement find later
@@ -439,9 +445,6 @@ class Models( Context ):
     def __draw_collect( self, model_index, mesh_index, world_matrix, uuid = None ):
         self.renderer.addDrawItem( model_index, mesh_index, world_matrix, uuid )
 
-    def __draw_instantly( self, model_index, mesh_index, world_matrix ):
-        self.renderer.submitDrawItem( model_index, mesh_index, world_matrix )
-
     def __draw_node( self, node, model_index : int, model_matrix : Matrix44, dispatch : Callable ):
         """Recursivly process nodes (parent and child nodes)
 
@@ -451,7 +454,7 @@ class Models( Context ):
         :type model_index: int
         :param model_matrix: The transformation model matrix, used along with view and projection matrices
         :type model_matrix: matrix44
-        :param dispatch: Reference to what function to dispatch (collect or immidiate rendering)
+        :param dispatch: Reference to what function to dispatch, receives each mesh and its world matrix
         :type dispatch: Callable
         """
         # apply transformation matrices recursivly
@@ -466,6 +469,21 @@ class Models( Context ):
         for child in node.children:
             self.__draw_node( child, model_index, world_matrix, dispatch )
 
+    def visit_meshes( self, model : Model, model_matrix : Matrix44, dispatch : Callable ) -> None:
+        """Call dispatch( model_index, mesh_index, world_matrix ) for every mesh in the node hierarchy of a loaded model
+
+        :param model: The model object
+        :type model: Model
+        :param model_matrix: The transformation model matrix
+        :type model_matrix: matrix44
+        :param dispatch: Receives each mesh and its world matrix
+        :type dispatch: Callable
+        """
+        if model.handle == -1 or self.model[model.handle] is None or model.handle in self.model_loading:
+            return
+
+        self.__draw_node( self.model[model.handle].root_node, model.handle, model_matrix, dispatch )
+
     def __collect_node( self, node, model_index, uuid ):
         """Collect node data with uuid, then use compute shader for modelmatrices"""
         model = self.model[model_index]
@@ -477,25 +495,22 @@ class Models( Context ):
         for child in node.children:
             self.__collect_node( child, model_index, uuid )
 
-    def draw( self, model : Model, model_matrix : Matrix44, instant : bool = False, uuid = None ) -> None:
+    def draw( self, model : Model, model_matrix : Matrix44, uuid = None ) -> None:
         """Begin drawing a model
 
         :param model: The model object
         :type model: Model
         :param model_matrix: The transformation model matrix, used along with view and projection matrices
         :type model_matrix: matrix44
-        :param instant:  either collect the drawcalls and submit them in renderer.end_frame() or render now/nstantly
-        :type instant: bool
         """
         # this is still bad
         if model.handle == -1 or self.model[model.handle] is None or model.handle in self.model_loading:
             return
 
         # compute model matrices on CPU
-        if instant or not self.context.renderer.USE_INDIRECT:
-            # either collect the drawcalls and submit them in renderer.end_frame() or render instantly
-            dispatch = self.__draw_collect if not instant else self.__draw_instantly
-            self.__draw_node( self.model[model.handle].root_node, model.handle, model_matrix, dispatch )
+        if not self.context.renderer.USE_INDIRECT:
+            # collect the drawcalls and submit them in renderer.end_frame()
+            self.__draw_node( self.model[model.handle].root_node, model.handle, model_matrix, self.__draw_collect )
 
         # compute model matrices on GPU usinf compute shader
         else:
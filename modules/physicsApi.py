@@ -0,0 +1,45 @@
+#
+# pybullet API as used by the engine and scripts, import as: import modules.physicsApi as p
+#
+# in-process: attributes resolve to the pybullet module itself
+# physics server: functions are forwarded to the worker process (see modules/physicsServer.py),
+#                 constants, types and exceptions still resolve to the local pybullet module
+#
+from functools import partial
+
+import pybullet as _pybullet
+
+from typing import TYPE_CHECKING
+if TYPE_CHECKING:
+    from modules.physicsServer import PhysicsServer
+
+# functions whose return value is not used, posted to the worker without waiting for a reply
+ASYNC_FUNCTIONS : set[str] = {
+    "setGravity",
+    "setTimeStep",
+    "setPhysicsEngineParameter",
+    "setAdditionalSearchPath",
+    "changeDynamics",
+    "removeBody",
+    "resetBasePositionAndOrientation",
+    "resetBaseVelocity",
+    "resetJointState",
+    "setJointMotorControl2",
+    "setJointMotorControlArray",
+    "applyExternalForce",
+    "applyExternalTorque",
+}
+
+# set by Renderer._initPhysics when the physics server is enabled
+server : "PhysicsServer" = None
+
+def __getattr__( name : str ):
+    attr = getattr( _pybullet, name )
+
+    if server is None or isinstance( attr, type ) or not callable( attr ):
+        return attr
+
+    if name in ASYNC_FUNCTIONS:
+        return partial( server.post, name )
+
+    return partial( server.call, name )
@@ -0,0 +1,325 @@
+import time
+import queue
+import multiprocessing
+from multiprocessing import shared_memory
+
+import numpy as np
+
+import pybullet as p
+
+#
+# Optional physics server (Settings.physics_server, EE_PHYSICS_SERVER=1)
+#
+# pybullet runs DIRECT in a worker process that steps at a fixed rate in parallel with rendering.
+# Body states are published to a double-buffered shared-memory array, API calls (body creation,
+# resets, forces) are sent over a command queue, see modules/physicsApi.py.
+#
+# Keep this module light, the spawned worker imports it.
+#
+
+# seq, front buffer, publish time buffer 0, publish time buffer 1, body table generation
+HEADER_FLOATS   : int = 8
+# position xyz, orientation xyzw
+STATE_FLOATS    : int = 7
+# seconds a synchronous call waits for the worker
+CALL_TIMEOUT    : float = 30.0
+
+def nlerp( a : np.ndarray, b : np.ndarray, alpha ) -> np.ndarray:
+    """Normalized row-wise quaternion interpolation along the shortest arc
+
+    :param a: (n, 4) quaternions at alpha 0
+    :param b: (n, 4) quaternions at alpha 1
+    :param alpha: Interpolation factor, scalar or (n, 1)
+    :return: (n, 4) quaternions
+    """
+    b = np.where( np.sum( a * b, axis=1, keepdims=True ) < 0.0, -b, b )
+    q = a + ( b - a ) * alpha
+
+    return q / np.maximum( np.linalg.norm( q, axis=1, keepdims=True ), 1e-12 )
+
+def _publish( states : np.ndarray, bases : list, links : list ) -> None:
+    """Read the states of the body table into one buffer"""
+    for row, body in bases:
+        try:
+            position, orientation = p.getBasePositionAndOrientation( body )
+        except p.error:
+            continue
+
+        states[row, :3] = position
+        states[row, 3:] = orientation
+
+    for body, link_indices, rows in links:
+        try:
+            link_states = p.getLinkStates( body, link_indices, computeForwardKinematics=True )
+        except p.error:
+            continue
+
+        if not link_states:
+            continue
+
+        # worldLinkFramePosition, worldLinkFrameOrientation
+        states[rows, :3] = [ state[4] for state in link_states ]
+        states[rows, 3:] = [ state[5] for state in link_states ]
+
+def _worker_main( shm_name : str, capacity : int, commands, replies, time_step : float, max_steps : int ) -> None:
+    """Physics server process entry point"""
+    shm     = shared_memory.SharedMemory( name=shm_name )
+    header  = np.ndarray( ( HEADER_FLOATS, ), dtype=np.float64, buffer=shm.buf )
+    states  = np.ndarray( ( 2, capacity, STATE_FLOATS ), dtype=np.float64, buffer=shm.buf, offset=HEADER_FLOATS * 8 )
+
+    p.connect( p.DIRECT )
+
+    bases       : list = []
+    links       : list = []
+    generation  : int = 0
+    running     : bool = False
+    accumulator : float = 0.0
+    last        : float = time.perf_counter()
+
+    while True:
+        # commands, block while paused
+        block = not running
+
+        while True:
+            try:
+                name, args, kwargs, reply = commands.get( block, 0.1 ) if block else commands.get_nowait()
+            except queue.Empty:
+                break
+
+            block = False
+
+            if name == "_quit":
+                p.disconnect()
+                shm.close()
+                return
+
+            elif name == "_set_running":
+                running     = args[0]
+                accumulator = 0.0
+                last        = time.perf_counter()
+
+            elif name == "_set_bodies":
+                bases, links, generation = args
+
+            elif name == "_set_timing":
+                time_step, max_steps = args
+
+            else:
+                try:
+                    result = getattr( p, name )( *args, **kwargs )
+
+                    if reply:
+                        replies.put( ( reply, True, result ) )
+
+                except Exception as e:
+                    if reply:
+                        replies.put( ( reply, False, str(e) ) )
+                    else:
+                        print( f"[physics server] {name}: {e}" )
+
+        if not running:
+            continue
+
+        now = time.perf_counter()
+        accumulator += now - last
+        last = now
+        steps = 0
+
+        while accumulator >= time_step and steps < max_steps:
+            p.stepSimulation()
+            accumulator -= time_step
+            steps += 1
+
+        # over the step budget, drop whole steps instead of spiraling
+        if accumulator >= time_step:
+            accumulator %= time_step
+
+        if steps:
+            # write the back buffer, then flip
+            back = 1 - int( header[1] )
+            _publish( states[back], bases, links )
+
+            header[2 + back]    = time.perf_counter()
+            header[4]           = generation
+            header[1]           = back
+            header[0]          += 1
+
+        remaining = time_step - accumulator - ( time.perf_counter() - now )
+
+        if remaining > 0.0:
+            time.sleep( remaining )
+
+class PhysicsServer:
+    def __init__( self, time_step : float, max_steps : int = 8, capacity : int = 4096 ) -> None:
+        """Render side handle of the physics server process
+
+        :param time_step: The fixed simulation step in seconds
+        :type time_step: float
+        :param max_steps: Maximum number of steps per worker iteration
+        :type max_steps: int
+        :param capacity: Maximum number of published bodies and links
+        :type capacity: int
+        """
+        self.capacity   : int = capacity
+        self.running    : bool = False
+
+        ctx = multiprocessing.get_context( "spawn" )
+        self.commands   = ctx.Queue()
+        self.replies    = ctx.Queue()
+
+        self.shm = shared_memory.SharedMemory( create=True, size=( HEADER_FLOATS + 2 * capacity * STATE_FLOATS ) * 8 )
+        self.header = np.ndarray( ( HEADER_FLOATS, ), dtype=np.float64, buffer=self.shm.buf )
+        self.states = np.ndarray( ( 2, capacity, STATE_FLOATS ), dtype=np.float64, buffer=self.shm.buf, offset=HEADER_FLOATS * 8 )
+        self.header[:] = 0.0
+
+        self.generation : int = 0
+        self._call_id   : int = 0
+
+        # last two snapshots (publish time, states)
+        self._seq       : float = -1.0
+        self._previous  : tuple[float, np.ndarray] = None
+        self._current   : tuple[float, np.ndarray] = None
+
+        self.process = ctx.Process(
+            target  = _worker_main,
+            args    = ( self.shm.name, capacity, self.commands, self.replies, time_step, max_steps ),
+            daemon  = True
+        )
+        self.process.start()
+
+    #
+    # commands
+    #
+    def call( self, name : str, *args, **kwargs ):
+        """Call a pybullet function in the worker and wait for the result,
+        raises p.error when the worker stopped or did not reply in time"""
+        self._call_id += 1
+        call_id = self._call_id
+
+        self.commands.put( ( name, args, kwargs, call_id ) )
+        deadline = time.perf_counter() + CALL_TIMEOUT
+
+        while True:
+            try:
+                reply_id, ok, result = self.replies.get( timeout=0.25 )
+
+            except queue.Empty:
+                if not self.process.is_alive():
+                    raise p.error( f"physics server stopped during {name}" )
+
+                if time.perf_counter() > deadline:
+                    raise p.error( f"physics server did not reply to {name}" )
+
+                continue
+
+            # late reply of a call that timed out
+            if reply_id != call_id:
+                continue
+
+            if not ok:
+                raise p.error( result )
+
+            return result
+
+    def post( self, name : str, *args, **kwargs ) -> None:
+        """Call a pybullet function in the worker without waiting, processed in order"""
+        self.commands.put( ( name, args, kwargs, 0 ) )
+
+    def set_running( self, state : bool ) -> None:
+        """Start or pause stepping the simulation"""
+        if self.running == state:
+            return
+
+        self.running = state
+        self.post( "_set_running", state )
+
+        self._previous = self._current = None
+
+    def set_timing( self, time_step : float, max_steps : int ) -> None:
+        """Change the fixed step and the maximum number of steps per worker iteration"""
+        self.post( "_set_timing", time_step, max_steps )
+
+    def set_bodies( self, bases : list, links : list ) -> None:
+        """Publish table of the worker, rows index the shared state array
+
+        :param bases: (row, physics_id)
+        :type bases: list
+        :param links: (physics_id, link indices, rows)
+        :type links: list
+        """
+        self.generation += 1
+        self.post( "_set_bodies",
+            [ ( row, body ) for row, body in bases if row < self.capacity ],
+            [ ( body, list( indices ), rows ) for body, indices, rows in links if rows.max() < self.capacity ],
+            self.generation
+        )
+
+        self._previous = self._current = None
+
+    #
+    # states
+    #
+    def _read_latest( self, count : int ) -> None:
+        """Copy a newly published buffer, retry when the worker flipped during the copy.
+        After a flip the worker writes the buffer that was the front, so a copy is only
+        consistent when no flip happened while copying."""
+        header = self.header
+
+        for _ in range( 3 ):
+            seq = header[0]
+
+            if seq == self._seq or header[4] != self.generation:
+                return
+
+            front   = int( header[1] )
+            t       = header[2 + front]
+            data    = self.states[front, :count].copy()
+
+            if header[0] == seq and int( header[1] ) == front:
+                self._seq       = seq
+                self._previous  = self._current
+                self._current   = ( t, data )
+                return
+
+    def sample( self, count : int ) -> tuple[np.ndarray, np.ndarray]:
+        """Body states interpolated between the last two published states,
+        rendering one publish interval behind the simulation.
+
+        :param count: Number of rows
+        :type count: int
+        :return: (count, 3) positions and (count, 4) orientations, None before the first publish
+        :rtype: tuple[np.ndarray, np.ndarray]
+        """
+        self._read_latest( min( count, self.capacity ) )
+
+        if self._current is None:
+            return None
+
+        t_b, b = self._current
+
+        if self._previous is None or len(self._previous[1]) != len(b):
+            return b[:, :3], b[:, 3:]
+
+        t_a, a = self._previous
+        interval = t_b - t_a
+
+        if interval <= 0.0:
+            return b[:, :3], b[:, 3:]
+
+        alpha = min( max( ( time.perf_counter() - interval - t_a ) / interval, 0.0 ), 1.0 )
+
+        position    = a[:, :3] + ( b[:, :3] - a[:, :3] ) * alpha
+        orientation = nlerp( a[:, 3:], b[:, 3:], alpha )
+
+        return position, orientation
+
+    def shutdown( self ) -> None:
+        """Stop the worker and release the shared memory"""
+        self.post( "_quit" )
+        self.process.join( 1.0 )
+
+        if self.process.is_alive():
+            self.process.terminate()
+
+        self.shm.close()
+        self.shm.unlink()
@@ -0,0 +1,240 @@
+from typing import TYPE_CHECKING, Dict, List
+
+from pyrr import Matrix44
+import numpy as np
+
+from modules.context import Context
+from modules.transformSystem import TransformSystem
+from modules.physicsServer import nlerp
+
+if TYPE_CHECKING:
+    from main import EmberEngine
+    from gameObjects.attachables.transform import Transform
+    from gameObjects.attachables.physicBase import PhysicBase
+    from modules.physicsServer import PhysicsServer
+
+import uuid as uid
+
+import pybullet as p
+
+class PhysicsSync( Context ):
+    """Bulk readback of the pybullet simulation state.
+
+    After the simulation stepped, base poses and link states (one p.getLinkStates call per
+    multibody) are read into contiguous position and orientation arrays. Every frame the
+    rendered pose is interpolated between the previous and the current step (PhysicsTime.alpha),
+    or sampled from the physics server when enabled, and the world matrices of all bodies that
+    moved are composed in one vectorized pass. PhysicBase and PhysicLink _runPhysics only
+    assign the result to their transform.
+
+    pybullet has no query for the activation state, a body whose step motion is within the
+    scene's sleep threshold (bit-identical by default) is treated as sleeping and skipped.
+    """
+    def __init__( self, context ) -> None:
+        """Physics state readback
+
+        :param context: This is the main context of the application
+        :type context: EmberEngine
+        """
+        super().__init__( context )
+
+        self._key           : tuple = ()
+        self._rows          : Dict[uid.UUID, int] = {}
+        self._transforms    : List["Transform"] = []
+
+        # (row, physics_id)
+        self._bases         : List[tuple[int, int]] = []
+        # (physics_id, link indices, rows)
+        self._links         : List[tuple[int, list[int], np.ndarray]] = []
+
+        # previous and current step
+        self._previous_position     : np.ndarray = np.zeros( (0, 3), dtype=np.float64 )
+        self._previous_orientation  : np.ndarray = np.zeros( (0, 4), dtype=np.float64 )
+        self._step_position         : np.ndarray = np.zeros( (0, 3), dtype=np.float64 )
+        self._step_orientation      : np.ndarray = np.zeros( (0, 4), dtype=np.float64 )
+
+        # rendered (composed) pose
+        self.position       : np.ndarray = np.zeros( (0, 3), dtype=np.float64 )
+        self.orientation    : np.ndarray = np.zeros( (0, 4), dtype=np.float64 )
+        self.matrices       : np.ndarray = np.zeros( (0, 4, 4), dtype=np.float64 )
+        self.moved          : np.ndarray = np.zeros( 0, dtype=bool )
+
+    def _rebuild( self, bases : List["PhysicBase"] ) -> None:
+        """Assign an array row to every runtime base and link"""
+        self._rows.clear()
+        self._transforms.clear()
+        self._bases.clear()
+        self._links.clear()
+
+        def add_row( transform : "Transform" ) -> int:
+            row = len(self._transforms)
+            self._rows[transform.gameObject.uuid] = row
+            self._transforms.append( transform )
+            return row
+
+        for base in bases:
+            self._bases.append( ( add_row( base.gameObject.transform ), base.physics_id ) )
+
+            links = [ link for link in base.links.index_to_link if link.runtime_link_index is not None ]
+
+            if links:
+                self._links.append( (
+                    base.physics_id,
+                    [ link.runtime_link_index for link in links ],
+                    np.asarray( [ add_row( link.gameObject.transform ) for link in links ], dtype=np.int32 )
+                ) )
+
+        n = len(self._transforms)
+        self._previous_position     = np.full( (n, 3), np.nan )
+        self._previous_orientation  = np.full( (n, 4), np.nan )
+        self._step_position         = np.full( (n, 3), np.nan )
+        self._step_orientation      = np.full( (n, 4), np.nan )
+
+        self.position       = np.full( (n, 3), np.nan )
+        self.orientation    = np.full( (n, 4), np.nan )
+        self.matrices       = np.zeros( (n, 4, 4) )
+        self.moved          = np.zeros( n, dtype=bool )
+
+    def _refresh_table( self ) -> None:
+        """Rebuild the rows when runtime bodies were created or removed"""
+        bases = [ base for base in self.context.world.physics_bases.values() if base.physics_id is not None ]
+        key   = tuple( ( base.physics_id, len(base.links.index_to_link) ) for base in bases )
+
+        if key == self._key:
+            return
+
+        self._rebuild( bases )
+        self._key = key
+
+        server = self.renderer.physics_server
+
+        if server:
+            server.set_bodies( self._bases, self._links )
+
+    def reset( self ) -> None:
+        """Forget all rows and states, eg. when the game stops"""
+        self._key = None
+
+    def read( self ) -> None:
+        """Read the state of all runtime bodies after the (in-process) simulation stepped"""
+        self._refresh_table()
+
+        if not self._transforms:
+            return
+
+        previous_position       = self._step_position
+        previous_orientation    = self._step_orientation
+
+        position    = previous_position.copy()
+        orientation = previous_orientation.copy()
+
+        self._read_direct( position, orientation )
+
+        # first read of a row, nothing to interpolate from
+        new = np.isnan( previous_position[:, 0] )
+
+        # resting, step motion within the sleep threshold keeps the previous pose
+        threshold = self.renderer.physics_time.sleep_threshold
+
+        with np.errstate( invalid="ignore" ):
+            held = ~new \
+                & ( np.max( np.abs( position - previous_position ), axis=1 ) <= threshold ) \
+                & ( np.max( np.abs( orientation - previous_orientation ), axis=1 ) <= threshold )
+
+        position[held]      = previous_position[held]
+        orientation[held]   = previous_orientation[held]
+
+        previous_position[new]      = position[new]
+        previous_orientation[new]   = orientation[new]
+
+        self._previous_position     = previous_position
+        self._previous_orientation  = previous_orientation
+        self._step_position         = position
+        self._step_orientation      = orientation
+
+    def update( self, alpha : float = 1.0 ) -> None:
+        """Compose the rendered pose of this frame
+
+        :param alpha: Interpolation factor between the previous and the current step, unused with the physics server
+        :type alpha: float
+        """
+        server = self.renderer.physics_server
+
+        if server:
+            self._refresh_table()
+
+        if not self._transforms:
+            return
+
+        if server:
+            sample = server.sample( len(self._transforms) )
+
+            if sample is None:
+                self.clear()
+                return
+
+            count = len(sample[0])
+            position    = self.position.copy()
+            orientation = self.orientation.copy()
+            position[:count], orientation[:count] = sample
+
+        else:
+            a, b        = self._previous_position, self._step_position
+            position    = a + ( b - a ) * alpha
+            orientation = nlerp( self._previous_orientation, self._step_orientation, alpha )
+
+        self._compose( position, orientation )
+
+    def clear( self ) -> None:
+        """Nothing moved this frame"""
+        self.moved[:] = False
+
+    def _read_direct( self, position : np.ndarray, orientation : np.ndarray ) -> None:
+        """Read the states from the in-process pybullet client"""
+        for row, body in self._bases:
+            position[row], orientation[row] = p.getBasePositionAndOrientation( body )
+
+        for body, link_indices, rows in self._links:
+            states = p.getLinkStates( body, link_indices, computeForwardKinematics=True )
+
+            if not states:
+                continue
+
+            # worldLinkFramePosition, worldLinkFrameOrientation
+            position[rows]      = [ state[4] for state in states ]
+            orientation[rows]   = [ state[5] for state in states ]
+
+    def _compose( self, position : np.ndarray, orientation : np.ndarray ) -> None:
+        """Compose the world matrices of all rows whose rendered pose changed since the last frame"""
+        self.moved          = np.any( position != self.position, axis=1 ) | np.any( orientation != self.orientation, axis=1 )
+
+        # rows that were never read (eg. not published by the physics server yet)
+        self.moved         &= ~np.isnan( position[:, 0] )
+        self.position       = position
+        self.orientation    = orientation
+
+        moved = np.flatnonzero( self.moved )
+
+        if not len(moved):
+            return
+
+        # ~handedness, ignore scale for physics (keep local scale)
+        quat    = orientation[moved] * np.array( [ 1.0, 1.0, 1.0, -1.0 ] )
+        scale   = np.array( [ self._transforms[i]._local_scale for i in moved ], dtype=np.float64 )
+
+        self.matrices[moved] = TransformSystem.compose_matrices( position[moved], quat, scale )
+
+    def matrix( self, uuid : uid.UUID ) -> Matrix44:
+        """World matrix of a body from the last readback
+
+        :param uuid: The uuid of the physics gameObject
+        :type uuid: uuid.UUID
+        :return: The world matrix, None when the body did not move or was not read
+        :rtype: Matrix44 | None
+        """
+        row = self._rows.get( uuid )
+
+        if row is None or not self.moved[row]:
+            return None
+
+        return Matrix44( self.matrices[row].copy() )
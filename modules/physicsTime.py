@@ -0,0 +1,133 @@
+import time
+
+import modules.physicsApi as p
+
+from typing import TYPE_CHECKING, Iterable
+if TYPE_CHECKING:
+    from modules.settings import Settings
+    from modules.scene import SceneManager
+    from modules.physicsServer import PhysicsServer
+    from gameObjects.attachables.physicBase import PhysicBase
+
+class PhysicsTime:
+    """Fixed-timestep clock of the simulation, configured per scene.
+
+    Frame time is accumulated and consumed in fixed steps, at most max_substeps per frame.
+    When a frame falls further behind, the remaining whole steps are dropped (and counted)
+    instead of spiraling. The leftover fraction of a step is the interpolation factor
+    between the previous and the current step, see PhysicsSync.update().
+    """
+    def __init__( self, settings : "Settings" ) -> None:
+        self.settings           : "Settings" = settings
+
+        self.step_rate          : float = settings.default_physics_step_rate
+        self.time_step          : float = 1.0 / self.step_rate
+        self.max_substeps       : int   = settings.default_physics_max_substeps
+        self.solver_iterations  : int   = settings.default_physics_solver_iterations
+        self.sleeping           : bool  = settings.default_physics_sleeping
+        self.sleep_threshold    : float = settings.default_physics_sleep_threshold
+
+        self.accumulator        : float = 0.0
+        self.alpha              : float = 0.0
+
+        # last frame
+        self.steps              : int   = 0
+        self.step_time          : float = 0.0   # ms
+
+        # simulation time dropped since the game started, in seconds
+        self.dropped            : float = 0.0
+
+        self._config            : tuple = None
+
+    def configure( self, scene : "SceneManager.Scene", server : "PhysicsServer" = None, bodies : Iterable["PhysicBase"] = () ) -> None:
+        """Apply the physics settings of a scene, only when they changed
+
+        :param scene: The current scene
+        :type scene: SceneManager.Scene
+        :param server: The physics server, if enabled
+        :type server: PhysicsServer
+        :param bodies: The physic bases of the world, their activation state follows the sleeping setting
+        :type bodies: Iterable[PhysicBase]
+        """
+        config = (
+            scene["physics_step_rate"],
+            scene["physics_max_substeps"],
+            scene["physics_solver_iterations"],
+            scene["physics_sleeping"],
+            scene["physics_sleep_threshold"],
+        )
+
+        if config == self._config:
+            return
+
+        sleeping_changed = self._config is not None and bool( self._config[3] ) != bool( config[3] )
+        self._config = config
+
+        self.step_rate          = max( 1.0, float( config[0] ) )
+        self.time_step          = 1.0 / self.step_rate
+        self.max_substeps       = max( 1, int( config[1] ) )
+        self.solver_iterations  = max( 1, int( config[2] ) )
+        self.sleeping           = bool( config[3] )
+        self.sleep_threshold    = max( 0.0, float( config[4] ) )
+
+        p.setTimeStep( self.time_step )
+        p.setPhysicsEngineParameter( numSolverIterations=self.solver_iterations )
+
+        if server:
+            server.set_timing( self.time_step, self.max_substeps )
+
+        # bodies take the setting when created, live bodies are updated here
+        if sleeping_changed:
+            self._apply_sleeping( bodies )
+
+    def _apply_sleeping( self, bodies : Iterable["PhysicBase"] ) -> None:
+        """Set the activation state of live bodies, sleeping bodies are woken up when sleeping is disabled"""
+        if self.sleeping:
+            activation_state = p.ACTIVATION_STATE_ENABLE_SLEEPING
+        else:
+            activation_state = p.ACTIVATION_STATE_DISABLE_SLEEPING | p.ACTIVATION_STATE_WAKE_UP
+
+        for base in bodies:
+            if base.physics_id is None:
+                continue
+
+            p.changeDynamics( base.physics_id, -1, activationState=activation_state )
+
+    def reset( self ) -> None:
+        """Start from an empty accumulator, eg. when the game starts"""
+        self.accumulator    = 0.0
+        self.alpha          = 0.0
+        self.steps          = 0
+        self.step_time      = 0.0
+        self.dropped        = 0.0
+
+    def advance( self, delta_time : float ) -> int:
+        """Step the simulation for the elapsed frame time
+
+        :param delta_time: Elapsed frame time in seconds
+        :type delta_time: float
+        :return: Number of steps taken
+        :rtype: int
+        """
+        self.accumulator += delta_time
+        steps = 0
+
+        start = time.perf_counter()
+
+        while self.accumulator >= self.time_step and steps < self.max_substeps:
+            p.stepSimulation()
+            self.accumulator -= self.time_step
+            steps += 1
+
+        self.step_time = ( time.perf_counter() - start ) * 1000.0
+
+        # over the substep budget, drop whole steps, keep the fraction for interpolation
+        if self.accumulator >= self.time_step:
+            behind = self.accumulator - self.accumulator % self.time_step
+            self.accumulator -= behind
+            self.dropped += behind
+
+        self.steps = steps
+        self.alpha = self.accumulator / self.time_step
+
+        return steps
@@ -0,0 +1,203 @@
+import numpy as np
+
+#
+# CPU environment processing, no OpenGL calls so it runs headless and in worker threads.
+# Faces are (6, size, size, 3) float32 in OpenGL cubemap order (+X, -X, +Y, -Y, +Z, -Z),
+# row 0 is the first row of uploaded data (t = -1)
+#
+
+# spherical harmonics band constants
+SH_Y00  = 0.282095
+SH_Y1   = 0.488603
+SH_Y2   = 1.092548
+SH_Y20  = 0.315392
+SH_Y22  = 0.546274
+
+def face_coordinates( size : int ) -> tuple:
+    """Texel centers in [-1, 1], s along the columns and t along the rows"""
+    coords = ( np.arange( size, dtype=np.float32 ) + 0.5 ) / size * 2.0 - 1.0
+    t, s = np.meshgrid( coords, coords, indexing="ij" )
+
+    return s, t
+
+def cubemap_directions( size : int ) -> np.ndarray:
+    """Normalized direction of every texel
+
+    :param size: The face dimension
+    :type size: int
+    :return: (6, size, size, 3) float32
+    :rtype: np.ndarray
+    """
+    s, t = face_coordinates( size )
+    one = np.ones_like( s )
+
+    directions = np.stack( [
+        np.stack( [  one,   -t,   -s ], axis=-1 ),    # +X
+        np.stack( [ -one,   -t,    s ], axis=-1 ),    # -X
+        np.stack( [    s,  one,    t ], axis=-1 ),    # +Y
+        np.stack( [    s, -one,   -t ], axis=-1 ),    # -Y
+        np.stack( [    s,   -t,  one ], axis=-1 ),    # +Z
+        np.stack( [   -s,   -t, -one ], axis=-1 ),    # -Z
+    ] )
+
+    return directions / np.linalg.norm( directions, axis=-1, keepdims=True )
+
+def texel_solid_angles( size : int ) -> np.ndarray:
+    """Approximate solid angle of each texel of a face, (size, size)"""
+    s, t = face_coordinates( size )
+
+    return ( 2.0 / size ) ** 2 / ( 1.0 + s * s + t * t ) ** 1.5
+
+def downsample_faces( faces : np.ndarray ) -> np.ndarray:
+    """2x2 box filter of every face"""
+    return 0.25 * ( faces[:, 0::2, 0::2] + faces[:, 1::2, 0::2] + faces[:, 0::2, 1::2] + faces[:, 1::2, 1::2] )
+
+def resize_faces( faces : np.ndarray, size : int ) -> np.ndarray:
+    """Box filter faces down to (or nearest resample up to) a power-of-two size"""
+    while faces.shape[1] > size and faces.shape[1] % 2 == 0:
+        faces = downsample_faces( faces )
+
+    if faces.shape[1] != size:
+        index = ( np.arange( size ) * faces.shape[1] ) // size
+        faces = faces[:, index][:, :, index]
+
+    return np.ascontiguousarray( faces, dtype=np.float32 )
+
+def sample_cubemap( faces : np.ndarray, directions : np.ndarray ) -> np.ndarray:
+    """Bilinear (within a face) lookup of directions
+
+    :param faces: (6, size, size, 3)
+    :param directions: (..., 3), not required to be normalized
+    :return: (..., 3)
+    """
+    size = faces.shape[1]
+    x, y, z = directions[..., 0], directions[..., 1], directions[..., 2]
+    ax, ay, az = np.abs( x ), np.abs( y ), np.abs( z )
+
+    major_x = ( ax >= ay ) & ( ax >= az )
+    major_y = ~major_x & ( ay >= az )
+    major_z = ~major_x & ~major_y
+
+    face = np.where( major_x, np.where( x > 0, 0, 1 ), np.where( major_y, np.where( y > 0, 2, 3 ), np.where( z > 0, 4, 5 ) ) )
+    ma = np.where( major_x, ax, np.where( major_y, ay, az ) )
+
+    sc = np.select( [ face == 0, face == 1, face == 2, face == 3, face == 4 ], [ -z, z, x, x, x ], -x )
+    tc = np.select( [ face == 2, face == 3 ], [ z, -z ], -y )
+
+    # texel space
+    u = np.clip( ( sc / ma + 1.0 ) * 0.5 * size - 0.5, 0.0, size - 1 )
+    v = np.clip( ( tc / ma + 1.0 ) * 0.5 * size - 0.5, 0.0, size - 1 )
+
+    u0 = u.astype( np.int32 ); u1 = np.minimum( u0 + 1, size - 1 ); fu = ( u - u0 )[..., None]
+    v0 = v.astype( np.int32 ); v1 = np.minimum( v0 + 1, size - 1 ); fv = ( v - v0 )[..., None]
+
+    top     = faces[face, v0, u0] * ( 1.0 - fu ) + faces[face, v0, u1] * fu
+    bottom  = faces[face, v1, u0] * ( 1.0 - fu ) + faces[face, v1, u1] * fu
+
+    return top * ( 1.0 - fv ) + bottom * fv
+
+def hammersley( num_samples : int ) -> np.ndarray:
+    """Hammersley sequence, (num_samples, 2) float32 in [0, 1)"""
+    bits = np.arange( num_samples, dtype=np.uint32 )
+    bits = ( bits << 16 ) | ( bits >> 16 )
+    bits = ( ( bits & 0x55555555 ) << 1 ) | ( ( bits & 0xAAAAAAAA ) >> 1 )
+    bits = ( ( bits & 0x33333333 ) << 2 ) | ( ( bits & 0xCCCCCCCC ) >> 2 )
+    bits = ( ( bits & 0x0F0F0F0F ) << 4 ) | ( ( bits & 0xF0F0F0F0 ) >> 4 )
+    bits = ( ( bits & 0x00FF00FF ) << 8 ) | ( ( bits & 0xFF00FF00 ) >> 8 )
+
+    return np.stack( [
+        np.arange( num_samples, dtype=np.float32 ) / num_samples,
+        bits.astype( np.float64 ) * 2.3283064365386963e-10
+    ], axis=1 ).astype( np.float32 )
+
+def prefilter_level( source : np.ndarray, size : int, roughness : float, num_samples : int ) -> np.ndarray:
+    """GGX prefilter one mip level, assumes N = V = R (split-sum).
+    Vectorized over all output texels, loops over the samples.
+
+    :param source: (6, n, n, 3) source faces, ideally about twice the output size
+    :param size: The output face size
+    :param roughness: The perceptual roughness of this level
+    :param num_samples: Importance samples per texel
+    :return: (6, size, size, 3) float32
+    """
+    N = cubemap_directions( size )
+
+    if roughness <= 0.0:
+        return sample_cubemap( source, N ).astype( np.float32 )
+
+    # tangent frame per texel
+    up = np.where( ( np.abs( N[..., 2] ) < 0.999 )[..., None], np.array( [0.0, 0.0, 1.0], dtype=np.float32 ), np.array( [1.0, 0.0, 0.0], dtype=np.float32 ) )
+    T = np.cross( up, N )
+    T /= np.linalg.norm( T, axis=-1, keepdims=True )
+    B = np.cross( N, T )
+
+    a = roughness * roughness
+
+    color   = np.zeros( N.shape, dtype=np.float32 )
+    weight  = np.zeros( N.shape[:-1] + (1,), dtype=np.float32 )
+
+    for Xi_x, Xi_y in hammersley( num_samples ):
+        phi         = 2.0 * np.pi * Xi_x
+        cos_theta   = np.sqrt( ( 1.0 - Xi_y ) / ( 1.0 + ( a * a - 1.0 ) * Xi_y ) )
+        sin_theta   = np.sqrt( 1.0 - cos_theta * cos_theta )
+
+        # same tangent space half vector for every texel
+        H = T * ( np.cos( phi ) * sin_theta ) + B * ( np.sin( phi ) * sin_theta ) + N * cos_theta
+        L = 2.0 * cos_theta * H - N
+
+        NdotL = np.maximum( np.sum( N * L, axis=-1, keepdims=True ), 0.0 )
+
+        color   += sample_cubemap( source, L ) * NdotL
+        weight  += NdotL
+
+    return color / np.maximum( weight, 1e-6 )
+
+def prefilter_specular( faces : np.ndarray, size : int, num_levels : int, num_samples : int ) -> list:
+    """Build the GGX prefiltered mip chain, roughness increases linearly with the mip level
+
+    :param faces: (6, n, n, 3) source faces
+    :param size: The face size of mip 0
+    :param num_levels: Number of mip levels, roughness = level / (num_levels - 1)
+    :param num_samples: Importance samples per texel
+    :return: List of (6, size >> level, size >> level, 3) float32
+    """
+    levels = []
+
+    for level in range( num_levels ):
+        level_size  = max( 1, size >> level )
+        source      = resize_faces( faces, min( faces.shape[1], level_size * 2 ) )
+        roughness   = level / max( 1, num_levels - 1 )
+
+        levels.append( prefilter_level( source, level_size, roughness, num_samples ) )
+
+    return levels
+
+def project_sh9( faces : np.ndarray ) -> np.ndarray:
+    """Project radiance into 9 spherical harmonics coefficients (bands 0-2)
+
+    Order: L00, L1-1, L10, L11, L2-2, L2-1, L20, L21, L22,
+    evaluate irradiance with the Ramamoorthi & Hanrahan polynomial.
+
+    :param faces: (6, size, size, 3)
+    :return: (9, 3) float32
+    """
+    size = faces.shape[1]
+    d = cubemap_directions( size )
+    x, y, z = d[..., 0], d[..., 1], d[..., 2]
+
+    weights = np.broadcast_to( texel_solid_angles( size ), ( 6, size, size ) )
+    weights = weights * ( 4.0 * np.pi / weights.sum() )
+
+    basis = np.stack( [
+        np.full_like( x, SH_Y00 ),
+        SH_Y1 * y,
+        SH_Y1 * z,
+        SH_Y1 * x,
+        SH_Y2 * x * y,
+        SH_Y2 * y * z,
+        SH_Y20 * ( 3.0 * z * z - 1.0 ),
+        SH_Y2 * x * z,
+        SH_Y22 * ( x * x - y * y ),
+    ] )
+
+    return np.einsum( "kfij,fijc->kc", basis * weights, faces[..., :3] ).astype( np.float32 )
@@ -0,0 +1,120 @@
+import os
+import sys
+import ctypes
+
+import OpenGL
+
+#
+# PyOpenGL hot-path configuration, import this module before the first OpenGL.GL import (see main.py).
+# The flags are read when PyOpenGL builds its function objects, changing them later has no effect.
+#
+# fast: no glGetError after every call, no logging or context checks, hot entry points are called
+#       through their resolved ctypes function and buffers are passed as raw pointers.
+# debug: full PyOpenGL checking, set EE_GL_DEBUG=1 or run python with -X dev
+#
+DEBUG_GL    : bool = os.getenv( "EE_GL_DEBUG" ) == "1" or sys.flags.dev_mode
+FAST_GL     : bool = not DEBUG_GL
+
+OpenGL.ERROR_CHECKING       = DEBUG_GL
+OpenGL.ERROR_LOGGING        = DEBUG_GL
+OpenGL.CONTEXT_CHECKING     = DEBUG_GL
+OpenGL.ARRAY_SIZE_CHECKING  = DEBUG_GL
+
+from OpenGL import GL as _GL
+from OpenGL.raw.GL.VERSION import GL_1_1, GL_1_3, GL_1_5, GL_2_0, GL_3_0, GL_3_1, GL_3_2, GL_4_3
+
+# entry points called per draw item, per bind or per uniform
+HOT_FUNCTIONS : dict = {
+    "glUseProgram"                  : GL_2_0,
+    "glBindVertexArray"             : GL_3_0,
+    "glBindBufferBase"              : GL_3_0,
+    "glActiveTexture"               : GL_1_3,
+    "glBindTexture"                 : GL_1_1,
+    "glEnable"                      : GL_1_1,
+    "glDisable"                     : GL_1_1,
+    "glPolygonMode"                 : GL_1_1,
+    "glUniform1i"                   : GL_2_0,
+    "glUniform1ui"                  : GL_3_0,
+    "glUniform1f"                   : GL_2_0,
+    "glUniform3f"                   : GL_2_0,
+    "glUniform4f"                   : GL_2_0,
+    "glUniform3fv"                  : GL_2_0,
+    "glUniformMatrix4fv"            : GL_2_0,
+    "glBufferSubData"               : GL_1_5,
+    "glDrawArrays"                  : GL_1_1,
+    "glDrawElements"                : GL_1_1,
+    "glDrawElementsBaseVertex"      : GL_3_2,
+    "glDrawElementsInstanced"       : GL_3_1,
+    "glDrawElementsInstancedBaseVertex" : GL_3_2,
+    "glVertexAttribPointer"         : GL_2_0,
+    "glMultiDrawElementsIndirect"   : GL_4_3,
+    "glDispatchCompute"             : GL_4_3,
+}
+
+# module level entry points, call them qualified (fastGL.glUseProgram) so resolve() takes effect
+glUseProgram                = _GL.glUseProgram
+glBindVertexArray           = _GL.glBindVertexArray
+glBindBufferBase            = _GL.glBindBufferBase
+glActiveTexture             = _GL.glActiveTexture
+glBindTexture               = _GL.glBindTexture
+glEnable                    = _GL.glEnable
+glDisable                   = _GL.glDisable
+glPolygonMode               = _GL.glPolygonMode
+glUniform1i                 = _GL.glUniform1i
+glUniform1ui                = _GL.glUniform1ui
+glUniform1f                 = _GL.glUniform1f
+glUniform3f                 = _GL.glUniform3f
+glUniform4f                 = _GL.glUniform4f
+glUniform3fv                = _GL.glUniform3fv
+glUniformMatrix4fv          = _GL.glUniformMatrix4fv
+glBufferSubData             = _GL.glBufferSubData
+glDrawArrays                = _GL.glDrawArrays
+glDrawElements              = _GL.glDrawElements
+glDrawElementsBaseVertex    = _GL.glDrawElementsBaseVertex
+glDrawElementsInstanced     = _GL.glDrawElementsInstanced
+glDrawElementsInstancedBaseVertex = _GL.glDrawElementsInstancedBaseVertex
+glVertexAttribPointer       = _GL.glVertexAttribPointer
+glMultiDrawElementsIndirect = _GL.glMultiDrawElementsIndirect
+glDispatchCompute           = _GL.glDispatchCompute
+
+def resolve() -> int:
+    """Replace the hot entry points with their resolved ctypes functions,
+    skipping PyOpenGL's wrapper and lazy-load indirection.
+    Requires a current context, unsupported functions keep their wrapper.
+
+    :return: Number of resolved entry points, 0 in debug mode
+    :rtype: int
+    """
+    if not FAST_GL:
+        return 0
+
+    resolved = 0
+
+    for name, module in HOT_FUNCTIONS.items():
+        func = getattr( module, name )
+
+        # not loaded yet, eg. core > 1.1 on Windows before a context existed
+        if hasattr( func, "load" ):
+            func = func.load()
+
+        if func is None:
+            continue
+
+        globals()[name] = func
+        resolved += 1
+
+    return resolved
+
+def pointer( array ):
+    """Pass a contiguous NumPy array without PyOpenGL's array-type conversion,
+    the caller keeps the array alive for the duration of the call.
+
+    :param array: C-contiguous numpy array
+    :type array: np.ndarray
+    :return: A void pointer in fast mode, the array itself in debug mode (size and type checked)
+    :rtype: ctypes.c_void_p | np.ndarray
+    """
+    if FAST_GL:
+        return ctypes.c_void_p( array.ctypes.data )
+
+    return array
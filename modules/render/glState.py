@@ -0,0 +1,203 @@
+from OpenGL.GL import GL_FRONT_AND_BACK, GL_FALSE
+
+from modules.render import fastGL
+
+import numpy as np
+
+class GLState:
+    """Shadow copy of the GL state the renderer changes every frame, calls that would
+    change nothing are skipped. PyOpenGL calls are expensive, a dict lookup is not.
+
+    Binding state (program, VAO, indexed buffers, textures, enable flags, polygon mode) is
+    only valid while all changes go through this class, call invalidate() after code that
+    uses raw GL calls, eg. ImGui, texture uploads or cubemap extraction.
+
+    Uniform values are cached per program and survive invalidate(), they are only
+    changed by glUniform* calls on that program. Call forget_program() when a program is deleted.
+    """
+    def __init__( self ) -> None:
+        self.uniforms       : dict[int, dict[int, object]] = {}
+
+        # current frame
+        self.issued         : int = 0
+        self.skipped        : int = 0
+
+        # last completed frame, see end_frame()
+        self.frame_issued   : int = 0
+        self.frame_skipped  : int = 0
+
+        self.invalidate()
+
+    def invalidate( self ) -> None:
+        """Forget binding state, the next change of each is always issued"""
+        self.program        : int = None
+        self.vao            : int = None
+        self.active_unit    : int = None
+        self.polygon_mode   : int = None
+        self.buffer_bases   : dict[tuple[int, int], int] = {}   # (target, index) -> buffer
+        self.textures       : dict[tuple[int, int], int] = {}   # (unit, target) -> texture
+        self.caps           : dict[int, bool] = {}
+
+    def forget_program( self, program : int ) -> None:
+        """Drop cached uniform values, GL may reuse the name of a deleted program"""
+        self.uniforms.pop( program, None )
+
+        if self.program == program:
+            self.program = None
+
+    def end_frame( self ) -> None:
+        """Store and reset the issued and skipped call counters"""
+        self.frame_issued   = self.issued
+        self.frame_skipped  = self.skipped
+        self.issued = self.skipped = 0
+
+    #
+    # bindings
+    #
+    def use_program( self, program : int ) -> None:
+        if self.program == program:
+            self.skipped += 1
+            return
+
+        self.program = program
+        self.issued += 1
+        fastGL.glUseProgram( program )
+
+    def bind_vao( self, vao : int ) -> None:
+        if self.vao == vao:
+            self.skipped += 1
+            return
+
+        self.vao = vao
+        self.issued += 1
+        fastGL.glBindVertexArray( vao )
+
+    def bind_buffer_base( self, target : int, index : int, buffer : int ) -> None:
+        """glBindBufferBase, eg. SSBO and UBO binding points"""
+        key = ( int(target), index )
+
+        if self.buffer_bases.get( key ) == buffer:
+            self.skipped += 1
+            return
+
+        self.buffer_bases[key] = buffer
+        self.issued += 1
+        fastGL.glBindBufferBase( target, index, buffer )
+
+    def bind_texture( self, unit : int, target : int, texture : int ) -> None:
+        """Bind a texture to a texture unit
+
+        :param unit: The texture unit (eg. GL_TEXTURE0-GL_TEXTURE31)
+        :type unit: uint32/uintc
+        :param target: eg. GL_TEXTURE_2D or GL_TEXTURE_CUBE_MAP
+        :type target: uint32/uintc
+        :param texture: the texture uid in GPU memory
+        :type texture: uint32/uintc
+        """
+        key = ( int(unit), int(target) )
+
+        if self.textures.get( key ) == texture:
+            self.skipped += 1
+            return
+
+        if self.active_unit != key[0]:
+            self.active_unit = key[0]
+            self.issued += 1
+            fastGL.glActiveTexture( unit )
+
+        self.textures[key] = texture
+        self.issued += 1
+        fastGL.glBindTexture( target, texture )
+
+    def enable( self, cap : int ) -> None:
+        self.set_enabled( cap, True )
+
+    def disable( self, cap : int ) -> None:
+        self.set_enabled( cap, False )
+
+    def set_enabled( self, cap : int, state : bool ) -> None:
+        key = int(cap)
+
+        if self.caps.get( key ) == state:
+            self.skipped += 1
+            return
+
+        self.caps[key] = state
+        self.issued += 1
+
+        if state:
+            fastGL.glEnable( cap )
+        else:
+            fastGL.glDisable( cap )
+
+    def set_polygon_mode( self, mode : int ) -> None:
+        """glPolygonMode for GL_FRONT_AND_BACK"""
+        if self.polygon_mode == mode:
+            self.skipped += 1
+            return
+
+        self.polygon_mode = mode
+        self.issued += 1
+        fastGL.glPolygonMode( GL_FRONT_AND_BACK, mode )
+
+    #
+    # uniforms, set on the current program
+    #
+    def _uniform_changed( self, location : int, value ) -> bool:
+        """Record a uniform value, False when the current program already holds it"""
+        if self.program is None:
+            self.issued += 1
+            return True
+
+        values = self.uniforms.setdefault( self.program, {} )
+
+        if values.get( location ) == value:
+            self.skipped += 1
+            return False
+
+        values[location] = value
+        self.issued += 1
+        return True
+
+    def uniform_1i( self, location : int, value : int ) -> None:
+        value = int(value)
+
+        if self._uniform_changed( location, value ):
+            fastGL.glUniform1i( location, value )
+
+    def uniform_1ui( self, location : int, value : int ) -> None:
+        value = int(value)
+
+        if self._uniform_changed( location, value ):
+            fastGL.glUniform1ui( location, value )
+
+    def uniform_1f( self, location : int, value : float ) -> None:
+        value = float(value)
+
+        if self._uniform_changed( location, value ):
+            fastGL.glUniform1f( location, value )
+
+    def uniform_3f( self, location : int, x : float, y : float, z : float ) -> None:
+        value = ( float(x), float(y), float(z) )
+
+        if self._uniform_changed( location, value ):
+            fastGL.glUniform3f( location, *value )
+
+    def uniform_4f( self, location : int, x : float, y : float, z : float, w : float ) -> None:
+        value = ( float(x), float(y), float(z), float(w) )
+
+        if self._uniform_changed( location, value ):
+            fastGL.glUniform4f( location, *value )
+
+    def uniform_3fv( self, location : int, count : int, values ) -> None:
+        values = np.ascontiguousarray( values, dtype=np.float32 )
+
+        if self._uniform_changed( location, values.tobytes() ):
+            fastGL.glUniform3fv( location, count, fastGL.pointer( values ) )
+
+    def uniform_matrix4( self, location : int, matrix ) -> None:
+        """glUniformMatrix4fv, single column-major matrix (pyrr layout)"""
+        matrix = np.ascontiguousarray( matrix, dtype=np.float32 )
+
+        if self._uniform_changed( location, matrix.tobytes() ):
+            fastGL.glUniformMatrix4fv( location, 1, GL_FALSE, fastGL.pointer( matrix ) )
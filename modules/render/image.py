@@ -2,7 +2,12 @@ from pathlib import Path
 
 from OpenGL.GL import glGetError, GL_NO_ERROR, glGenerateMipmap, glBindTexture, glTexParameteri, GL_TEXTURE_2D, GL_TEXTURE_WRAP_S, \
     GL_TEXTURE_WRAP_T, GL_TEXTURE_WRAP_R, GL_REPEAT, GL_CLAMP_TO_EDGE, GL_LINEAR, GL_TEXTURE_MIN_FILTER, GL_LINEAR_MIPMAP_LINEAR, GL_TEXTURE_MAG_FILTER, GL_LINEAR,\
-    glTexImage2D, GL_RGBA, GL_RGBA16F, GL_RGBA32F, GL_FLOAT, GL_UNSIGNED_BYTE, GL_TEXTURE_CUBE_MAP, GL_TEXTURE_CUBE_MAP_POSITIVE_X 
+    glTexImage2D, GL_RGBA, GL_RGBA16F, GL_RGBA32F, GL_FLOAT, GL_UNSIGNED_BYTE, GL_TEXTURE_CUBE_MAP, GL_TEXTURE_CUBE_MAP_POSITIVE_X, \
+    GL_TEXTURE_MAX_LEVEL, glPixelStorei, GL_UNPACK_ALIGNMENT, glGenBuffers, glBindBuffer, glBufferData, glBufferSubData, \
+    GL_PIXEL_UNPACK_BUFFER, GL_STREAM_DRAW, glFenceSync, GL_SYNC_GPU_COMMANDS_COMPLETE, glCompressedTexImage2D
+
+import ctypes
+import numpy as np
 
 from OpenGL.GLU import gluErrorString
 
@@ -17,6 +22,11 @@ class ImageUpload:
     buffer          : str = field( default=None)
     _format         : int = field( default=GL_UNSIGNED_BYTE)
     _internal_format: int = field( default=GL_RGBA)
+    mips            : list = field( default=None)   # precomputed mip levels 1..n, (width, height, buffer)
+    compressed      : bool = field( default=False)  # buffers hold block-compressed data in _internal_format
+    cache_path      : Path = field( default=None)   # write the uploaded (driver compressed) texture to the texture cache
+    _pixel_format   : int = field( default=GL_RGBA)
+    wrap            : int = field( default=GL_REPEAT)
 
 def create_image_pygame( size, data, texture ):
     import numpy as np
@@ -39,28 +49,242 @@ def create_image_pygame( size, data, texture ):
     glTexImage2D(GL_TEXTURE_2D, 0, GL_RGBA, image_width, image_height, 0, GL_RGBA, GL_UNSIGNED_BYTE, img_data)
     return texture
 
-def upload_image( texture_id, image : ImageUpload ):
-    glBindTexture(GL_TEXTURE_2D, texture_id)
+def build_mip_chain( pixels : np.ndarray ) -> list:
+    """Build a box-filtered mip chain on the CPU
+
+    :param pixels: The base level, shape (height, width, channels) uint8
+    :type pixels: np.ndarray
+    :return: mip levels 1..n as (width, height, buffer)
+    :rtype: list
+    """
+    levels = []
+    level = pixels
+
+    while level.shape[0] > 1 or level.shape[1] > 1:
+        height, width = level.shape[:2]
+        _h, _w = max( 1, height // 2 ), max( 1, width // 2 )
+
+        src = level[:_h * 2 if height > 1 else 1, :_w * 2 if width > 1 else 1].astype( np.float32 )
+
+        if height > 1:
+            src = ( src[0::2] + src[1::2] ) * 0.5
+
+        if width > 1:
+            src = ( src[:, 0::2] + src[:, 1::2] ) * 0.5
+
+        level = ( src + 0.5 ).astype( np.uint8 )
+        levels.append( ( _w, _h, level.tobytes() ) )
+
+    return levels
+
+def decode_image( path : Path, flip_x : bool = False, flip_y : bool = True, mipmap : bool = True ) -> ImageUpload:
+    """Decode an image file to RGBA8 pixels, flip it and build the mip chain.
+    Does not touch OpenGL, so it is safe to call from worker threads.
+
+    :param path: The path to the image
+    :type path: Path
+    :return: The decoded image ready for upload
+    :rtype: ImageUpload
+    """
+    import pygame
+
+    surface = pygame.image.load( str(path) )
+    width, height = surface.get_size()
+
+    pixels = np.frombuffer( pygame.image.tostring( surface, "RGBA" ), dtype=np.uint8 ).reshape( height, width, 4 )
+
+    if flip_y:
+        pixels = pixels[::-1]
+
+    if flip_x:
+        pixels = pixels[:, ::-1]
+
+    pixels = np.ascontiguousarray( pixels )
+
+    return ImageUpload(
+        path    = path,
+        width   = width,
+        height  = height,
+        buffer  = pixels.tobytes(),
+        mipmap  = mipmap,
+        mips    = build_mip_chain( pixels ) if mipmap else None
+    )
+
+def resample_channel( channel : np.ndarray, height : int, width : int ) -> np.ndarray:
+    """Bilinear resample of a single uint8 channel, returns the input when the size already matches"""
+    h, w = channel.shape
+
+    if ( h, w ) == ( height, width ):
+        return channel
+
+    y = np.clip( ( np.arange( height, dtype=np.float32 ) + 0.5 ) * h / height - 0.5, 0, h - 1 )
+    x = np.clip( ( np.arange( width,  dtype=np.float32 ) + 0.5 ) * w / width  - 0.5, 0, w - 1 )
+
+    y0 = y.astype( np.int32 ); y1 = np.minimum( y0 + 1, h - 1 ); fy = ( y - y0 )[:, None]
+    x0 = x.astype( np.int32 ); x1 = np.minimum( x0 + 1, w - 1 ); fx = ( x - x0 )[None, :]
+
+    c = channel.astype( np.float32 )
+    rows = c[y0] * ( 1.0 - fy ) + c[y1] * fy
+
+    return ( rows[:, x0] * ( 1.0 - fx ) + rows[:, x1] * fx + 0.5 ).astype( np.uint8 )
+
+def pack_orm_channels( occlusion, roughness, metallic, size : tuple ) -> ImageUpload:
+    """Pack single channels or constants into an uint8 ORM (occlusion, roughness, metallic) texture with mip chain
+
+    :param occlusion: uint8 channel (height, width) or constant
+    :param roughness: uint8 channel (height, width) or constant
+    :param metallic: uint8 channel (height, width) or constant
+    :param size: The (width, height) of the packed texture
+    :type size: tuple
+    :return: The packed image ready for upload, top row last (flipped for OpenGL)
+    :rtype: ImageUpload
+    """
+    width, height = size
+
+    packed = np.empty( ( height, width, 4 ), dtype=np.uint8 )
+    packed[..., 0] = occlusion
+    packed[..., 1] = roughness
+    packed[..., 2] = metallic
+    packed[..., 3] = 255
+
+    packed = np.ascontiguousarray( packed[::-1] )
+
+    return ImageUpload(
+        width               = width,
+        height              = height,
+        buffer              = packed.tobytes(),
+        mipmap              = True,
+        mips                = build_mip_chain( packed ),
+        _format             = GL_UNSIGNED_BYTE,
+        _internal_format    = GL_RGBA
+    )
+
+def pack_orm( roughness_path : Path, metallic_path : Path, ao_path : Path ) -> ImageUpload:
+    """Load and pack separate roughness, metallic and ambient occlusion maps into an uint8 ORM texture.
+    Channels are read as zero-copy views (AO from B, roughness from R, metallic from G), 
+    inputs are resampled to the largest input. Missing maps use grey roughness, black metallic and white AO.
+    Does not touch OpenGL, so it is safe to call from worker threads.
+
+    :return: The packed image ready for upload
+    :rtype: ImageUpload
+    """
+    import pygame
+
+    def channel( path : Path, index : int ) -> np.ndarray:
+        surface = pygame.image.load( str(path) )
+        width, height = surface.get_size()
 
+        pixels = np.frombuffer( pygame.image.tostring( surface, "RGBA" ), dtype=np.uint8 ).reshape( height, width, 4 )
+        return pixels[..., index]
+
+    channels = {
+        "roughness" : channel( roughness_path, 0 ) if roughness_path else 127,
+        "metallic"  : channel( metallic_path,  1 ) if metallic_path  else 0,
+        "occlusion" : channel( ao_path,        2 ) if ao_path        else 255,
+    }
+
+    shapes = [ c.shape for c in channels.values() if isinstance( c, np.ndarray ) ]
+    if not shapes:
+        raise ValueError("No map found!")
+
+    height, width = max( shapes, key=lambda shape: shape[0] * shape[1] )
+
+    for name, c in channels.items():
+        if isinstance( c, np.ndarray ):
+            channels[name] = resample_channel( c, height, width )
+
+    return pack_orm_channels( channels["occlusion"], channels["roughness"], channels["metallic"], ( width, height ) )
+
+def _image_levels( image : ImageUpload ) -> list:
+    levels = [ ( image.width, image.height, image.buffer ) ]
+
+    if image.mips:
+        levels += image.mips
+
+    return levels
+
+def _set_texture_parameters( image : ImageUpload, num_levels : int ) -> None:
     # set the texture wrapping parameters
-    glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_WRAP_S, GL_REPEAT)
-    glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_WRAP_T, GL_REPEAT)
+    glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_WRAP_S, image.wrap)
+    glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_WRAP_T, image.wrap)
 
     # set texture filtering parameters
     glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MIN_FILTER, GL_LINEAR)
     glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MAG_FILTER, GL_LINEAR)
 
-    glTexImage2D( GL_TEXTURE_2D, 0, GL_RGBA, image.width, image.height, 0, GL_RGBA, image._format, image.buffer )
-
     # mipmap
     if image.mipmap:
-        glGenerateMipmap(GL_TEXTURE_2D)
+        if image.mips:
+            glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MAX_LEVEL, num_levels - 1)
+        else:
+            glGenerateMipmap(GL_TEXTURE_2D)
+
         glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MIN_FILTER, GL_LINEAR_MIPMAP_LINEAR)
 
+def upload_image( texture_id, image : ImageUpload ):
+    glBindTexture(GL_TEXTURE_2D, texture_id)
+    glPixelStorei(GL_UNPACK_ALIGNMENT, 1)
+
+    levels = _image_levels( image )
+
+    for level, ( width, height, buffer ) in enumerate( levels ):
+        if image.compressed:
+            glCompressedTexImage2D( GL_TEXTURE_2D, level, image._internal_format, width, height, 0, len(buffer), buffer )
+        else:
+            glTexImage2D( GL_TEXTURE_2D, level, image._internal_format, width, height, 0, image._pixel_format, image._format, buffer )
+
+    _set_texture_parameters( image, len(levels) )
+
     err = glGetError()
     if (err != GL_NO_ERROR):
         print('GLERROR: ', gluErrorString(err)) # pylint: disable=E1101
 
+def upload_image_pbo( texture_id, image : ImageUpload ) -> tuple:
+    """Stream an image and its mip chain through a pixel buffer object, 
+    glTexImage2D then sources from the PBO and returns without waiting for the transfer.
+
+    :param texture_id: the texture uid in GPU memory
+    :type texture_id: uint32/uintc
+    :param image: The decoded image
+    :type image: ImageUpload
+    :return: The PBO and a fence that signals once the GPU consumed the upload
+    :rtype: tuple
+    """
+    levels = _image_levels( image )
+    total = sum( len(buffer) for _, _, buffer in levels )
+
+    pbo = glGenBuffers( 1 )
+    glBindBuffer( GL_PIXEL_UNPACK_BUFFER, pbo )
+    glBufferData( GL_PIXEL_UNPACK_BUFFER, total, None, GL_STREAM_DRAW )
+
+    offset = 0
+    for _, _, buffer in levels:
+        glBufferSubData( GL_PIXEL_UNPACK_BUFFER, offset, len(buffer), buffer )
+        offset += len(buffer)
+
+    glBindTexture(GL_TEXTURE_2D, texture_id)
+    glPixelStorei(GL_UNPACK_ALIGNMENT, 1)
+
+    offset = 0
+    for level, ( width, height, buffer ) in enumerate( levels ):
+        if image.compressed:
+            glCompressedTexImage2D( GL_TEXTURE_2D, level, image._internal_format, width, height, 0, len(buffer), ctypes.c_void_p( offset ) )
+        else:
+            glTexImage2D( GL_TEXTURE_2D, level, image._internal_format, width, height, 0, image._pixel_format, image._format, ctypes.c_void_p( offset ) )
+        offset += len(buffer)
+
+    glBindBuffer( GL_PIXEL_UNPACK_BUFFER, 0 )
+
+    _set_texture_parameters( image, len(levels) )
+
+    fence = glFenceSync( GL_SYNC_GPU_COMMANDS_COMPLETE, 0 )
+
+    err = glGetError()
+    if (err != GL_NO_ERROR):
+        print('GLERROR: ', gluErrorString(err)) # pylint: disable=E1101
+
+    return pbo, fence
+
 def load_cubemap_pygame( path : Path, extension, texture ):
     import pygame
     glBindTexture(GL_TEXTURE_CUBE_MAP, texture)
@@ -7,17 +7,44 @@ from pygame.locals import *
 
 from OpenGL.GL import *
 from OpenGL.GLU import *
+from OpenGL.GL.KHR.parallel_shader_compile import GL_COMPLETION_STATUS_KHR
 
 from modules.settings import Settings
 from modules.files import FileHandler
 
+import sys
+import traceback
 import textwrap
+import hashlib
+import time
+from pathlib import Path
+from dataclasses import dataclass, field
+
+import numpy as np
 
 if TYPE_CHECKING:
     from main import EmberEngine
 
 class Shader:
-    def __init__( self, context, uid : str, templated : bool = False, compute : bool = False ):
+    @dataclass(slots=True)
+    class Pending:
+        """A submitted program, compiling and linking in the driver
+
+        :param program: The program being linked
+        :param shaders: The attached shader objects, deleted once linked
+        :param uniforms: Uniform names parsed from the new sources
+        :param cache_path: Program binary cache file, None when the cache is disabled
+        :param from_cache: The program was created from a cached binary
+        :param start: Submission time (perf_counter)
+        """
+        program     : int
+        shaders     : list = field( default_factory=list )
+        uniforms    : dict = field( default_factory=dict )
+        cache_path  : Path = None
+        from_cache  : bool = False
+        start       : float = 0.0
+
+    def __init__( self, context, uid : str, templated : bool = False, compute : bool = False, deferred : bool = False ):
         """Load and parse GLSL shaders from .vert and .frag files
         
         :param context: This is the main context of the application
@@ -26,6 +53,8 @@ class Shader:
         :type uid: str
         :param templated: The version and defines will be set programmatically
         :type templated: bool
+        :param deferred: Only submit compile and link, the program is usable after poll() or wait()
+        :type deferred: bool
         """
         self.context    : 'EmberEngine' = context
         self.settings   : Settings = context.settings
@@ -33,26 +62,158 @@ class Shader:
         # fix path to use root..
         self.basepath = self.settings.shader_path
 
+        self.uid = uid
         self.templated = templated
         self.compute = compute
         self.uniforms = {}
+        self.program = 0
 
-        if compute:
-            comp_shader = textwrap.dedent(FileHandler(f"{self.basepath}{uid}.comp").getContent())
-            self.program = self.load_compute( comp_shader )
+        # startup cost, program binaries loaded from cache skip compile and link
+        # ready time is wall time from submit() until finish() swapped the program in, with parallel
+        # compilation it includes the driver work on other programs and the poll delay, not only the link
+        self.compile_time_ms    : float = 0.0
+        self.ready_time_ms      : float = 0.0
+        self.from_cache         : bool = False
 
-            self.parse_uniforms( comp_shader )
+        # hot reload
+        self.pending            : Shader.Pending = None
+        self.dependencies       : set[str] = set()  # source files, including #include's
+        self.block_bindings     : dict[str, int] = {}
+        self.error              : str = ""
 
-        else:
-            vert_shader = textwrap.dedent(FileHandler(f"{self.basepath}{uid}.vert").getContent())
-            frag_shader = textwrap.dedent(FileHandler(f"{self.basepath}{uid}.frag").getContent())
-            self.program = self.load_program( vert_shader, frag_shader )
-        
-            self.parse_uniforms( vert_shader )
-            self.parse_uniforms( frag_shader )
+        self.submit()
+
+        if not deferred:
+            self.wait()
+
+    @property
+    def stage_files( self ) -> list:
+        """Source file per stage, as (shader type, path)"""
+        if self.compute:
+            return [ ( GL_COMPUTE_SHADER, f"{self.basepath}{self.uid}.comp" ) ]
+
+        return [ 
+            ( GL_VERTEX_SHADER,     f"{self.basepath}{self.uid}.vert" ), 
+            ( GL_FRAGMENT_SHADER,   f"{self.basepath}{self.uid}.frag" ) 
+        ]
+
+    @property
+    def ready( self ) -> bool:
+        """A linked program is available, a reload may still be pending"""
+        return bool( self.program )
+
+    def submit( self ) -> None:
+        """Read, preprocess and submit the sources for compile and link without waiting on the result.
+        The current program remains in use until the new one is finished, see poll()"""
+        if self.pending is not None:
+            self._discard( self.pending )
+
+        self.dependencies = set()
+
+        uniforms = {}
+        stages = []
+
+        for shader_type, path in self.stage_files:
+            self.dependencies.add( path )
+            source = textwrap.dedent( FileHandler( path ).getContent() )
+
+            self.parse_uniforms( source, uniforms )
+            stages.append( ( shader_type, self.preprocess( source ) ) )
+
+        self.pending = self.submit_program( stages )
+        self.pending.uniforms = uniforms
+
+    def is_complete( self ) -> bool:
+        """Compile and link of the pending program finished, never blocks when
+        KHR_parallel_shader_compile is supported"""
+        if self.pending is None:
+            return True
+
+        if self.pending.from_cache or not self.context.renderer.PARALLEL_SHADER_COMPILE:
+            return True
+
+        return glGetProgramiv( self.pending.program, GL_COMPLETION_STATUS_KHR ) == GL_TRUE
+
+    def poll( self ) -> bool:
+        """Finish the pending program when the driver completed it
+
+        :return: True if a program was finished (linked or failed) this call
+        :rtype: bool
+        """
+        if self.pending is None or not self.is_complete():
+            return False
+
+        self.finish()
+        return True
+
+    def wait( self ) -> None:
+        """Block until the pending program is finished"""
+        if self.pending is not None:
+            self.finish()
+
+    def finish( self ) -> None:
+        """Check the pending program and swap it in when linked.
+        The initial build raises on errors, a failed reload keeps the previous program"""
+        pending, self.pending = self.pending, None
+
+        error = self._check_program( pending )
+        if error:
+            self._discard( pending )
+
+            if not self.program:
+                raise Exception( error )
+
+            self.error = error
+            self.context.console.error( f"Shader [{self.uid}] reload failed, keeping previous program\n{error}" )
+            return
+
+        self.error = ""
+        self.from_cache = pending.from_cache
+        self.ready_time_ms = ( time.perf_counter() - pending.start ) * 1000.0
+
+        for shader in pending.shaders:
+            glDetachShader( pending.program, shader )
+            glDeleteShader( shader )
+
+        if pending.cache_path is not None and not pending.from_cache:
+            try:
+                self._store_program_binary( pending.program, pending.cache_path )
+            except Exception as e:
+                exc_type, exc_value, exc_tb = sys.exc_info()
+                self.context.console.error( f"Shader [{self.uid}] binary cache: {e}", traceback.format_tb( exc_tb ) )
+
+        # swap, deleting a bound program is deferred by the driver
+        previous = self.program
+        self.program = pending.program
+        self.uniforms = pending.uniforms
 
         self.bind_uniforms()
-        return
+        self.bind_uniform_blocks()
+
+        if previous:
+            self.context.renderer.state.forget_program( previous )
+            glDeleteProgram( previous )
+
+    def _check_program( self, pending : "Shader.Pending" ) -> str:
+        """Compile and link status of a pending program, empty when linked"""
+        if pending.program == 0:
+            return "glCreateProgram failed"
+
+        for shader in pending.shaders:
+            if glGetShaderiv( shader, GL_COMPILE_STATUS ) == GL_FALSE:
+                return _decode_log( glGetShaderInfoLog( shader ) )
+
+        if glGetProgramiv( pending.program, GL_LINK_STATUS ) != GL_TRUE:
+            return _decode_log( glGetProgramInfoLog( pending.program ) )
+
+        return ""
+
+    def _discard( self, pending : "Shader.Pending" ) -> None:
+        for shader in pending.shaders:
+            glDeleteShader( shader )
+
+        if pending.program:
+            glDeleteProgram( pending.program )
 
     def printOpenGLError( self ):
         """Print any raised errors during GLSL parsing"""
@@ -65,22 +226,68 @@ class Shader:
         for uniform in self.uniforms:
             self.uniforms[uniform] = glGetUniformLocation( self.program, uniform )
 
-    def parse_uniforms( self, shader : str ) -> None:
+    def location( self, name : str ) -> int:
+        """Uniform location by name, names not found by parse_uniforms() are looked up once
+
+        :param name: The name of the uniform
+        :type name: str
+        :return: The location, -1 if the uniform is not active
+        :rtype: int
+        """
+        location = self.uniforms.get( name )
+
+        if location is None or location is False:
+            location = self.uniforms[name] = glGetUniformLocation( self.program, name )
+
+        return location
+
+    def bind_uniform_block( self, block_name : str, binding : int ) -> int:
+        """Bind a uniform block to a binding point, restored when the program is reloaded
+
+        :param block_name: The name of the uniform block
+        :type block_name: str
+        :param binding: The binding point
+        :type binding: int
+        :return: The block index, GL_INVALID_INDEX when not found
+        :rtype: int
+        """
+        self.block_bindings[block_name] = binding
+        block_index = glGetUniformBlockIndex( self.program, block_name )
+
+        if block_index != GL_INVALID_INDEX:
+            glUniformBlockBinding( self.program, block_index, binding )
+
+        return block_index
+
+    def bind_uniform_blocks( self ) -> None:
+        """Restore uniform block bindings"""
+        for block_name, binding in self.block_bindings.items():
+            block_index = glGetUniformBlockIndex( self.program, block_name )
+
+            if block_index != GL_INVALID_INDEX:
+                glUniformBlockBinding( self.program, block_index, binding )
+
+    def parse_uniforms( self, shader : str, uniforms : dict = None ) -> None:
         """Dynamicly find and parse uniforms required by the shader
         
         :param shader: The content if a GLSL shader as string
         :type shader: str
+        :param uniforms: The dict to add found uniforms to, defaults to self.uniforms
+        :type uniforms: dict
         """
+        if uniforms is None:
+            uniforms = self.uniforms
+
         for line in shader.split('\n'):
             if not line.startswith('uniform'):
                 continue
 
             uniform = line.removeprefix('uniform').strip().split(' ')
             _data_type = uniform[0]
-            _keyword = uniform[-1].replace(';', '')
+            _keyword = uniform[-1].replace(';', '').split('[')[0]   # arrays are located by name
 
-            if _keyword not in self.uniforms:
-                self.uniforms[_keyword] = False
+            if _keyword not in uniforms:
+                uniforms[_keyword] = False
 
     def inject_version_and_defines( self, src : str ):
         version_330 = "#version 330 core"
@@ -107,6 +314,7 @@ class Shader:
         for line in src.splitlines():
             if line.strip().startswith("#include"):
                 filename = line.split('"')[1]
+                self.dependencies.add( f"{self.basepath}{filename}" )
 
                 included = FileHandler(f"{self.basepath}{filename}").getContent()
                 buffer.append( self.inject_includes( included ) )
@@ -116,86 +324,119 @@ class Shader:
 
         return "\n".join(buffer)
 
-    def load_compute( self, in_comp : str ):
+    def preprocess( self, src : str ) -> str:
+        """Inject version, defines (templated shaders) and includes"""
         if self.templated:
-            in_comp = self.inject_version_and_defines( in_comp )
+            src = self.inject_version_and_defines( src )
 
-        in_comp = self.inject_includes( in_comp )
+        return self.inject_includes( src )
 
-        comp = self.load_shader( GL_COMPUTE_SHADER, in_comp )
-        if comp == 0:
+    #
+    # program binary cache
+    #
+    def _binary_cache_enabled( self ) -> bool:
+        return self.settings.shader_cache_enabled and self.context.renderer.has_extension( "GL_ARB_get_program_binary" )
+
+    def _binary_cache_path( self, stages : list ) -> Path:
+        """Cache file keyed by the fully preprocessed sources and the driver"""
+        digest = hashlib.sha1()
+
+        for name in ( GL_VENDOR, GL_RENDERER, GL_VERSION ):
+            digest.update( glGetString( name ) or b"" )
+
+        for shader_type, source in stages:
+            digest.update( f"|{int(shader_type)}|".encode() )
+            digest.update( source.encode() )
+
+        return Path( self.settings.shader_cache_path ) / f"{self.uid}_{digest.hexdigest()}.bin"
+
+    def _load_program_binary( self, path : Path ) -> int:
+        """Create a program from a cached binary, 0 when missing or rejected by the driver"""
+        if not path.is_file():
             return 0
 
+        data = path.read_bytes()
+        if len(data) <= 4:
+            return 0
+
+        binary_format = int.from_bytes( data[:4], "little" )
+        binary = np.frombuffer( data, dtype=np.uint8, offset=4 )
+
         program = glCreateProgram()
 
-        if program == 0:
-            return 0
+        try:
+            glProgramBinary( program, binary_format, binary, binary.size )
 
-        glAttachShader( program, comp )
-        self.printOpenGLError()
+            if glGetProgramiv( program, GL_LINK_STATUS ) == GL_TRUE:
+                return program
 
-        glLinkProgram( program )
+        except Exception:
+            pass
 
-        if(GL_TRUE!=glGetProgramiv(program, GL_LINK_STATUS)):
-            err =  glGetShaderInfoLog(comp) 
-            raise Exception(err)          
-        self.printOpenGLError()
-        if glGetProgramiv( program, GL_LINK_STATUS, None ) == GL_FALSE:
-            glDeleteProgram( program )
-            return 0
+        # driver update or corrupt cache, recompile
+        glDeleteProgram( program )
+        path.unlink( missing_ok=True )
+        return 0
 
-        return program
+    def _store_program_binary( self, program : int, path : Path ) -> None:
+        length = glGetProgramiv( program, GL_PROGRAM_BINARY_LENGTH )
+        if not length:
+            return
 
-    def load_program( self, in_vert : str, in_frag : str ) -> int:
-        """Build and create the shader program from .vert and .frag shader
-        
-        :param in_vert: The content of a vertex shader
-        :type in_vert: str
-        :param in_vert: The content of a fragment shader
-        :type in_vert: str
-        :return: The index to a valid shader program in GPU memory
-        :rtype: int
-        """
+        binary_length = np.zeros( 1, dtype=np.int32 )
+        binary_format = np.zeros( 1, dtype=np.uint32 )
+        binary = np.empty( length, dtype=np.uint8 )
 
-        if self.templated:
-            in_vert = self.inject_version_and_defines( in_vert )
-            in_frag = self.inject_version_and_defines( in_frag )
+        glGetProgramBinary( program, length, binary_length, binary_format, binary )
 
+        path.parent.mkdir( parents=True, exist_ok=True )
+        path.write_bytes( int( binary_format[0] ).to_bytes( 4, "little" ) + binary[:binary_length[0]].tobytes() )
 
-        in_vert = self.inject_includes( in_vert )
-        in_frag = self.inject_includes( in_frag )
+    def submit_program( self, stages : list ) -> "Shader.Pending":
+        """Create a program from preprocessed stages, loaded from the program binary cache when possible.
+        Compile and link are only issued, status is checked in finish() so drivers supporting
+        KHR_parallel_shader_compile can build all programs concurrently
 
-        vert = self.load_shader( GL_VERTEX_SHADER, in_vert )
-        if vert == 0:
-            return 0
+        :param stages: list of (shader type, preprocessed source)
+        :type stages: list
+        :return: The submitted program
+        :rtype: Shader.Pending
+        """
+        use_cache = self._binary_cache_enabled()
+        cache_path = self._binary_cache_path( stages ) if use_cache else None
 
-        frag = self.load_shader( GL_FRAGMENT_SHADER, in_frag )
-        if frag == 0:
-            return 0
+        start = time.perf_counter()
+
+        if use_cache:
+            program = self._load_program_binary( cache_path )
+
+            if program:
+                self.compile_time_ms = 0.0
+                return Shader.Pending( program, cache_path=cache_path, from_cache=True, start=start )
+
+        # compile
+        shaders = [ self.load_shader( shader_type, source ) for shader_type, source in stages ]
+        self.compile_time_ms = ( time.perf_counter() - start ) * 1000.0
 
         program = glCreateProgram()
 
         if program == 0:
-            return 0
+            return Shader.Pending( 0, shaders, start=start )
 
-        glAttachShader( program, vert )
-        glAttachShader( program, frag )
+        for shader in shaders:
+            glAttachShader( program, shader )
         self.printOpenGLError()
 
-        glLinkProgram( program )
+        if use_cache:
+            glProgramParameteri( program, GL_PROGRAM_BINARY_RETRIEVABLE_HINT, GL_TRUE )
 
-        if(GL_TRUE!=glGetProgramiv(program, GL_LINK_STATUS)):
-            err =  glGetShaderInfoLog(frag) 
-            raise Exception(err)          
-        self.printOpenGLError()
-        if glGetProgramiv( program, GL_LINK_STATUS, None ) == GL_FALSE:
-            glDeleteProgram( program )
-            return 0
+        # link
+        glLinkProgram( program )
 
-        return program
+        return Shader.Pending( program, shaders, cache_path=cache_path, start=start )
 
     def load_shader( self, shader_type : IntConstant, source : str ):
-        """Compile shader from string
+        """Submit shader compilation from string, the status is checked when the program is finished
         
         :param shader_type: The type of the shader: GL_VERTEX_SHADER or GL_FRAGMENT_SHADER
         :type shader_type:  OpenGL.constant.IntConstant
@@ -210,10 +451,7 @@ class Shader:
         glShaderSource(shader, source)
         glCompileShader(shader)
 
-        if glGetShaderiv( shader, GL_COMPILE_STATUS, None) == GL_FALSE:
-            info_log = glGetShaderInfoLog( shader )
-            print( info_log )
-            glDeleteProgram( shader )
-            return 0
+        return shader
 
-        return shader
\ No newline at end of file
+def _decode_log( log ) -> str:
+    return log.decode( errors="replace" ) if isinstance( log, bytes ) else str( log )
@@ -0,0 +1,178 @@
+import os
+import mmap
+import struct
+import hashlib
+from pathlib import Path
+
+from OpenGL.GL import glBindTexture, glGetTexLevelParameteriv, glGetCompressedTexImage, GL_TEXTURE_2D, \
+    GL_TEXTURE_COMPRESSED, GL_TEXTURE_COMPRESSED_IMAGE_SIZE, GL_TEXTURE_INTERNAL_FORMAT, GL_UNSIGNED_BYTE
+
+import numpy as np
+
+from modules.render.image import ImageUpload
+
+class TextureCache:
+    """On-disk cache of decoded textures, including the full mip chain.
+
+    Container layout (little endian):
+        header  : magic 'ETEX', version, internal format, pixel type, compressed, num levels
+        levels  : width, height, offset, size (per level)
+        data    : level buffers, read back through a memory map
+    """
+    MAGIC       = b"ETEX"
+    VERSION     = 1
+    EXTENSION   = ".etex"
+
+    HEADER      = struct.Struct( "<4sIIIII" )
+    LEVEL       = struct.Struct( "<IIQQ" )
+
+    def __init__( self, path : Path ) -> None:
+        self.path : Path = Path( path )
+        self.path.mkdir( parents=True, exist_ok=True )
+
+    def key( self, sources : list, options : str = "" ) -> Path:
+        """Cache file for a set of source files and import options,
+        changes in path, modification time or size of any source create a new key.
+
+        :param sources: The source image paths, eg. one for a texture, three for a packed ORM map
+        :type sources: list[Path]
+        :param options: Import options, eg. flip and channel packing
+        :type options: str
+        :return: The cache file path
+        :rtype: Path
+        """
+        digest = hashlib.sha1()
+
+        for source in sources:
+            if not source:
+                digest.update( b"|none" )
+                continue
+
+            stat = os.stat( source )
+            digest.update( f"|{Path(source).resolve()}|{stat.st_mtime_ns}|{stat.st_size}".encode() )
+
+        digest.update( f"|{options}|{TextureCache.VERSION}".encode() )
+
+        return self.path / f"{digest.hexdigest()}{TextureCache.EXTENSION}"
+
+    def load( self, cache_path : Path, source : Path = None ) -> ImageUpload:
+        """Memory-map a cached texture, level buffers are zero-copy views into the map
+
+        :param cache_path: The cache file, see key()
+        :type cache_path: Path
+        :param source: The source path, stored as path on the upload
+        :type source: Path
+        :return: The upload data, None on a cache miss
+        :rtype: ImageUpload | None
+        """
+        if not cache_path.is_file():
+            return None
+
+        buffer = None
+        levels = []
+
+        # empty, truncated or foreign files are a miss, removed so the source is decoded and cached again
+        try:
+            with open( cache_path, "rb" ) as f:
+                buffer = mmap.mmap( f.fileno(), 0, access=mmap.ACCESS_READ )
+
+            magic, version, internal_format, pixel_type, compressed, num_levels = TextureCache.HEADER.unpack_from( buffer, 0 )
+            if magic != TextureCache.MAGIC or version != TextureCache.VERSION or not num_levels:
+                raise ValueError( f"invalid texture cache header: {cache_path.name}" )
+
+            for i in range( num_levels ):
+                width, height, offset, size = TextureCache.LEVEL.unpack_from( buffer, TextureCache.HEADER.size + i * TextureCache.LEVEL.size )
+                levels.append( ( width, height, np.frombuffer( buffer, dtype=np.uint8, count=size, offset=offset ) ) )
+
+        except ( OSError, ValueError, struct.error ):
+            # views must be released before the map can close
+            levels.clear()
+
+            if buffer is not None:
+                buffer.close()
+
+            try:
+                cache_path.unlink()
+            except OSError:
+                pass
+
+            return None
+
+        width, height, base = levels[0]
+
+        return ImageUpload(
+            path                = source if source is not None else cache_path,
+            width               = width,
+            height              = height,
+            buffer              = base,
+            mipmap              = num_levels > 1,
+            mips                = levels[1:],
+            _format             = pixel_type,
+            _internal_format    = internal_format,
+            compressed          = bool( compressed )
+        )
+
+    def store( self, cache_path : Path, image : ImageUpload, levels : list = None, internal_format : int = None, compressed : bool = None ) -> None:
+        """Write a texture and its mip chain to the cache, the file is replaced atomically
+
+        :param cache_path: The cache file, see key()
+        :type cache_path: Path
+        :param image: The upload data
+        :type image: ImageUpload
+        :param levels: Override the level buffers as (width, height, buffer), eg. compressed data read back from the GPU
+        :type levels: list
+        """
+        if levels is None:
+            levels = [ ( image.width, image.height, image.buffer ) ] + list( image.mips or [] )
+
+        internal_format = image._internal_format if internal_format is None else internal_format
+        compressed      = image.compressed if compressed is None else compressed
+
+        offset = TextureCache.HEADER.size + TextureCache.LEVEL.size * len(levels)
+        table = []
+
+        for width, height, buffer in levels:
+            size = len( memoryview( buffer ).cast( "B" ) )
+            table.append( TextureCache.LEVEL.pack( width, height, offset, size ) )
+            offset += size
+
+        tmp_path = cache_path.with_suffix( f".{os.getpid()}.tmp" )
+
+        with open( tmp_path, "wb" ) as f:
+            f.write( TextureCache.HEADER.pack( TextureCache.MAGIC, TextureCache.VERSION, internal_format, image._format, int(compressed), len(levels) ) )
+            f.writelines( table )
+
+            for _, _, buffer in levels:
+                f.write( memoryview( buffer ).cast( "B" ) )
+
+        os.replace( tmp_path, cache_path )
+
+    def store_texture( self, cache_path : Path, texture_id : int, image : ImageUpload ) -> bool:
+        """Read back a driver compressed texture and write it to the cache
+
+        :param cache_path: The cache file, see key()
+        :type cache_path: Path
+        :param texture_id: the texture uid in GPU memory
+        :type texture_id: uint32/uintc
+        :param image: The upload data the texture was created from
+        :type image: ImageUpload
+        :return: True if the texture was compressed and stored
+        :rtype: bool
+        """
+        glBindTexture( GL_TEXTURE_2D, texture_id )
+
+        if not int( glGetTexLevelParameteriv( GL_TEXTURE_2D, 0, GL_TEXTURE_COMPRESSED ) ):
+            return False
+
+        internal_format = int( glGetTexLevelParameteriv( GL_TEXTURE_2D, 0, GL_TEXTURE_INTERNAL_FORMAT ) )
+
+        levels = []
+        for level, ( width, height, _ ) in enumerate( [ ( image.width, image.height, None ) ] + list( image.mips or [] ) ):
+            size = int( glGetTexLevelParameteriv( GL_TEXTURE_2D, level, GL_TEXTURE_COMPRESSED_IMAGE_SIZE ) )
+            data = np.empty( size, dtype=np.uint8 )
+            glGetCompressedTexImage( GL_TEXTURE_2D, level, data )
+
+            levels.append( ( width, height, data ) )
+
+        self.store( cache_path, image, levels=levels, internal_format=internal_format, compressed=True )
+        return True
@@ -47,4 +47,15 @@ class TextureKind_(enum.IntEnum):
 class ImageMeta:
     path        : Path  = field( default=None       )
     dimension   : tuple = field( default=( 0, 0 )   )
-    size        : int   = field( default=0          )
\ No newline at end of file
+    size        : int   = field( default=0          )
+    key         : str   = field( default=None       )   # path or content key in the registry index
+    generation  : int   = field( default=0          )   # bumped each time the slot is freed
+    refcount    : int   = field( default=0          )   # references held by materials (and pinned engine images)
+    pending     : bool  = field( default=False      )   # queued for GPU upload
+    failed      : bool  = field( default=False      )   # decode failed, slot is freed once unreferenced
+
+@dataclass(slots=True, frozen=True)
+class ImageHandle:
+    """Generation-checked reference to an image slot, stays detectable as stale after the slot is freed and reused"""
+    index       : int   = field( default=-1 )
+    generation  : int   = field( default=0  )
\ No newline at end of file
@@ -9,13 +9,16 @@ from OpenGL.GL.ARB.bindless_texture import *
 
 import numpy as np
 import enum
+from pyrr import Matrix44
 
 from modules.render.shader import Shader
+from modules.render import fastGL
 from modules.render.types import DrawItem, MatrixItem, Material
 
 if TYPE_CHECKING:
     from main import EmberEngine
     from modules.renderer import Renderer
+    from modules.render.glState import GLState
     from modules.models import Models
     from gameObjects.gameObject import GameObject
     from gameObjects.gameObject import Camera
@@ -146,13 +149,16 @@ class UBO:
             else:
                 size_bytes = num_elements * self.element_size * 4  # float32 = 4 bytes
 
-            glBufferSubData(self.target, 0, size_bytes, self.buffer)
+            fastGL.glBufferSubData( self.target, 0, size_bytes, self.buffer )   # ctypes array, no conversion
             
         def bind_buffer( self, binding : int = 0 ):
             glBindBuffer( self.target, self.ssbo )
 
-        def bind_base( self, binding : int = 0 ):
-            glBindBufferBase( self.target, binding, self.ssbo )
+        def bind_base( self, binding : int = 0, state : "GLState" = None ):
+            if state is not None:
+                state.bind_buffer_base( self.target, binding, self.ssbo )
+            else:
+                glBindBufferBase( self.target, binding, self.ssbo )
 
         def clear( self, value=0 ):
             glBindBuffer(self.target, self.ssbo)
@@ -170,6 +176,7 @@ class UBO:
         #
         # general
         #
+        self.ubo_frame              : UBO.FrameUBO     = UBO.FrameUBO()
         self.ubo_lights             : UBO.LightUBO     = UBO.LightUBO( self.renderer.general, "Lights" )
         if self.renderer.USE_BINDLESS_TEXTURES:
             self.ubo_materials      : UBO.MaterialUBOBindless  = UBO.MaterialSSBOBindless( self.context )
@@ -332,8 +339,11 @@ class UBO:
             glBindBuffer( GL_SHADER_STORAGE_BUFFER, self.ubo )
             glBufferSubData( GL_SHADER_STORAGE_BUFFER, 0, len(self.data), self.data )
 
-        def bind( self, binding : int = 0 ):
-            glBindBufferBase( GL_SHADER_STORAGE_BUFFER, binding, self.ubo )
+        def bind( self, binding : int = 0, state : "GLState" = None ):
+            if state is not None:
+                state.bind_buffer_base( GL_SHADER_STORAGE_BUFFER, binding, self.ubo )
+            else:
+                glBindBufferBase( GL_SHADER_STORAGE_BUFFER, binding, self.ubo )
 
     class MaterialUBO:
         MAX_MATERIALS = 2096
@@ -353,10 +363,9 @@ class UBO:
 
             # support older openGL versions (sub 4.2):
             self.binding = 1
-            self.block_index = glGetUniformBlockIndex( shader.program, block_name )
+            self.block_index = shader.bind_uniform_block( block_name, self.binding )
             if self.block_index == GL_INVALID_INDEX:
                 raise RuntimeError( f"Uniform block [{block_name}] not found in shader." )
-            glUniformBlockBinding( shader.program, self.block_index, self.binding )
 
             # create UBO
             self.ubo = glGenBuffers(1)
@@ -392,8 +401,72 @@ class UBO:
 
             self._dirty = False
 
-        def bind( self, binding : int = 0 ):
-            glBindBufferBase( GL_UNIFORM_BUFFER, binding, self.ubo )
+        def bind( self, binding : int = 0, state : "GLState" = None ):
+            if state is not None:
+                state.bind_buffer_base( GL_UNIFORM_BUFFER, binding, self.ubo )
+            else:
+                glBindBufferBase( GL_UNIFORM_BUFFER, binding, self.ubo )
+
+    class FrameUBO:
+        """Per-frame camera and scene state, shared by every program including common_structs.glsl"""
+        BLOCK_NAME  = "FrameUniforms"
+        BINDING     = 2     # FRAME_UNIFORMS_BINDING in common_structs.glsl
+
+        # std140 layout:
+        # mat4 view, projection, light view, light projection (4 * 64 bytes)
+        # + vec4 view origin, light direction, light color, ambient color (4 * 16 bytes) = 320 bytes
+        NUM_FLOATS  = 4 * 16 + 4 * 4
+
+        def __init__( self ):
+            self.data = np.zeros( self.NUM_FLOATS, dtype=np.float32 )
+            self._uploaded : bytes = b""
+
+            self.ubo = glGenBuffers(1)
+            glBindBuffer( GL_UNIFORM_BUFFER, self.ubo )
+            glBufferData( GL_UNIFORM_BUFFER, self.data.nbytes, None, GL_DYNAMIC_DRAW )
+            glBindBuffer( GL_UNIFORM_BUFFER, 0 )
+
+        def update( self, 
+                    view            : Matrix44, 
+                    projection      : Matrix44, 
+                    light_view      : Matrix44, 
+                    light_projection: Matrix44,
+                    view_origin, light_dir, light_color, ambient_color 
+            ) -> bool:
+            """Pack and upload the frame state, skipped when nothing changed
+
+            :return: True if the buffer was uploaded
+            :rtype: bool
+            """
+            data = self.data
+
+            # matrices are column-major in pyrr memory layout, same as glUniformMatrix4fv( .., GL_FALSE, .. )
+            data[0:16]  = np.asarray( view, dtype=np.float32 ).reshape( 16 )
+            data[16:32] = np.asarray( projection, dtype=np.float32 ).reshape( 16 )
+            data[32:48] = np.asarray( light_view, dtype=np.float32 ).reshape( 16 )
+            data[48:64] = np.asarray( light_projection, dtype=np.float32 ).reshape( 16 )
+
+            data[64:67] = view_origin[:3];      data[67] = 0.0
+            data[68:71] = light_dir[:3];        data[71] = 0.0
+            data[72:75] = light_color[:3];      data[75] = 1.0
+            data[76:79] = ambient_color[:3];    data[79] = 1.0
+
+            packed = data.tobytes()
+            if packed == self._uploaded:
+                return False
+
+            glBindBuffer( GL_UNIFORM_BUFFER, self.ubo )
+            fastGL.glBufferSubData( GL_UNIFORM_BUFFER, 0, data.nbytes, fastGL.pointer( data ) )
+            glBindBuffer( GL_UNIFORM_BUFFER, 0 )
+
+            self._uploaded = packed
+            return True
+
+        def bind( self, binding : int = BINDING, state : "GLState" = None ):
+            if state is not None:
+                state.bind_buffer_base( GL_UNIFORM_BUFFER, binding, self.ubo )
+            else:
+                glBindBufferBase( GL_UNIFORM_BUFFER, binding, self.ubo )
 
     class LightUBO:
         MAX_LIGHTS = 64
@@ -419,10 +492,9 @@ class UBO:
 
             # support older openGL versions (sub 4.2):
             self.binding = 0
-            self.block_index = glGetUniformBlockIndex( shader.program, block_name )
+            self.block_index = shader.bind_uniform_block( block_name, self.binding )
             if self.block_index == GL_INVALID_INDEX:
                 raise RuntimeError( f"Uniform block [{block_name}] not found in shader." )
-            glUniformBlockBinding( shader.program, self.block_index, self.binding )
 
             # create UBO
             self.ubo = glGenBuffers(1)
@@ -466,8 +538,11 @@ class UBO:
             glBindBuffer(GL_UNIFORM_BUFFER, self.ubo)
             glBufferSubData(GL_UNIFORM_BUFFER, 0, len(self.data), self.data)
 
-        def bind( self, binding : int = 0 ):
-            glBindBufferBase( GL_UNIFORM_BUFFER, binding, self.ubo )
+        def bind( self, binding : int = 0, state : "GLState" = None ):
+            if state is not None:
+                state.bind_buffer_base( GL_UNIFORM_BUFFER, binding, self.ubo )
+            else:
+                glBindBufferBase( GL_UNIFORM_BUFFER, binding, self.ubo )
    
   
     def _upload_material_ubo( self ) -> None:
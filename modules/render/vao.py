@@ -5,10 +5,16 @@ from OpenGL.GLU import *
 
 import numpy as np
 
+from modules.render import fastGL
+
 if TYPE_CHECKING:
     from main import EmberEngine
 
 class VAO:
+    # per-instance model matrix, one vec4 column per location (simple render path)
+    INSTANCE_MATRIX_LOCATION    = 5
+    INSTANCE_MATRIX_STRIDE      = 16 * 4
+
     @staticmethod
     def vertex_stride():
         """
@@ -51,6 +57,10 @@ class VAO:
         self.vertex_count = 0
         self.index_count  = 0
 
+        # instance attribute source, see set_instance_matrices()
+        self.instance_buffer = None
+        self.instance_offset = None
+
         self.vao = glGenVertexArrays( 1 )
         glBindVertexArray( self.vao )
 
@@ -89,6 +99,32 @@ class VAO:
 
         glBindVertexArray( 0 )
 
+    def set_instance_matrices( self, buffer : int, offset : int ) -> None:
+        """Source the per-instance model matrix (locations 5-8) from buffer, 
+        starting at a byte offset. This VAO must be bound.
+
+        :param buffer: The GL_ARRAY_BUFFER holding tightly packed column-major mat4's
+        :type buffer: uint32/uintc
+        :param offset: Byte offset of the first instance
+        :type offset: int
+        """
+        if self.instance_buffer == buffer and self.instance_offset == offset:
+            return
+
+        glBindBuffer( GL_ARRAY_BUFFER, buffer )
+
+        for column in range( 4 ):
+            location = VAO.INSTANCE_MATRIX_LOCATION + column
+
+            if self.instance_buffer is None:
+                glEnableVertexAttribArray( location )
+                glVertexAttribDivisor( location, 1 )
+
+            fastGL.glVertexAttribPointer( location, 4, GL_FLOAT, GL_FALSE, VAO.INSTANCE_MATRIX_STRIDE, ctypes.c_void_p( offset + column * 16 ) )
+
+        self.instance_buffer = buffer
+        self.instance_offset = offset
+
     def append_mesh( self, cpu_mesh ):
         """
         Appends a CPUMeshData to the arena.
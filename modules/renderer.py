@@ -2,6 +2,7 @@ from typing import TYPE_CHECKING, TypedDict
 
 import os
 import math
+import time
 from OpenGL.arrays import returnPointer
 from pygame.math import Vector2
 from pyrr import matrix44, Matrix44, Vector3
@@ -14,6 +15,7 @@ from imgui_bundle import icons_fontawesome_6 as fa
 from OpenGL.GL import *  # pylint: disable=W0614
 from OpenGL.GLU import *
 from OpenGL.GL.ARB.bindless_texture import *
+from OpenGL.GL.KHR.parallel_shader_compile import glMaxShaderCompilerThreadsKHR
 
 import struct
 
@@ -23,10 +25,15 @@ import enum
 from modules.settings import Settings
 from modules.project import ProjectManager
 from modules.render.shader import Shader
+from modules.render.glState import GLState
+from modules.render.vao import VAO
+from modules.render import fastGL
 from modules.camera import Camera
 from modules.scene import SceneManager
 
-import pybullet as p
+import modules.physicsApi as p
+from modules.physicsServer import PhysicsServer
+from modules.physicsTime import PhysicsTime
 
 if TYPE_CHECKING:
     from main import EmberEngine
@@ -117,9 +124,8 @@ class Renderer:
         # shaders
         self.shader : Shader = None
 
-        # editor
-        self.editor_grid_vao = None
-        self.editor_axis_vao = None
+        # redundant GL call elimination
+        self.state : GLState = GLState()
 
         self.renderMode = 0
         self.renderModes : str = [
@@ -156,6 +162,11 @@ class Renderer:
         # UBO / SSBO
         self.ubo : UBO = UBO( context )
 
+        # per-instance model matrices for the simple render path, see submitMainRenderpassSimple()
+        self.instance_vbo       : int = glGenBuffers( 1 )
+        self.simple_draw_calls  : int = 0
+        self.simple_draw_items  : int = 0
+
         # FBO
         self.current_fbo = None;
         self.create_screen_vao()
@@ -319,6 +330,10 @@ class Renderer:
         gl_version, renderer, vendor, glsl_version = Renderer.print_opengl_version()
         major, minor = map(int, gl_version.split('.')[0:2])
 
+        # bypass PyOpenGL wrappers for the per-frame entry points (see fastGL.py)
+        _resolved = fastGL.resolve()
+        print( f"Fast GL: {_resolved} raw entry points" if fastGL.FAST_GL else "Debug GL: full PyOpenGL error checking" )
+
         # Retrieve supported OpenGL extensions 
         # https://opengl.gpuinfo.org/listextensions.php
         self.RENDERDOC = False
@@ -337,6 +352,11 @@ class Renderer:
         self.USE_INDIRECT_COMPUTE : bool = True and self.USE_GPU_DRIVEN_RENDERING
         self.USE_FULL_GPU_DRIVEN : bool = True and self.USE_INDIRECT_COMPUTE
 
+        # compile and link shader programs on driver threads, completion is polled
+        self.PARALLEL_SHADER_COMPILE : bool = self.has_extension("GL_KHR_parallel_shader_compile")
+        if self.PARALLEL_SHADER_COMPILE:
+            glMaxShaderCompilerThreadsKHR( 0xFFFFFFFF ) # implementation-defined maximum
+
         # RenderDoc debug overrrides
         if self.RENDERDOC:
             # bindless not supported, 
@@ -358,6 +378,9 @@ class Renderer:
      
     def shutdown( self ) -> None:
         """Quit the application"""
+        if self.physics_server:
+            self.physics_server.shutdown()
+
         self.render_backend.shutdown()
         pygame.quit()
 
@@ -596,7 +619,7 @@ class Renderer:
         glBindFramebuffer( GL_FRAMEBUFFER, self.current_fbo["fbo"] )
         glViewport( 0, 0, int(self.current_fbo["size"].x), int(self.current_fbo["size"].y) )
         glClear( clear_bits )
-        glEnable(GL_DEPTH_TEST);
+        self.state.enable( GL_DEPTH_TEST )
 
     def unbind_fbo( self ) -> None:
         """Stop rending to current fbo, and unbind framebuffer (FBO)"""
@@ -613,18 +636,16 @@ class Renderer:
         """
         self.use_shader( self.gamma )
 
-        glBindVertexArray( self.screenVAO )
-        glDisable(GL_DEPTH_TEST);
-
-        glActiveTexture( GL_TEXTURE0 )
+        self.state.bind_vao( self.screenVAO )
+        self.state.disable( GL_DEPTH_TEST )
 
         _texture_type = GL_TEXTURE_2D_MULTISAMPLE if self.settings.msaaEnabled else GL_TEXTURE_2D
-        glBindTexture( _texture_type, fbo )
+        self.state.bind_texture( GL_TEXTURE0, _texture_type, fbo )
 
-        glUniform1i(glGetUniformLocation( self.shader.program, "screenTexture" ), 0)
+        self.state.uniform_1i( self.shader.location( "screenTexture" ), 0 )
         glDrawArrays(GL_TRIANGLES, 0, 6)
 
-        glBindVertexArray(0)
+        self.state.bind_vao( 0 )
 
     #
     # shader
@@ -636,246 +657,108 @@ class Renderer:
         :type shader: Shader
         """
         self.shader : Shader = shader
-        glUseProgram( self.shader.program )
+        self.state.use_program( self.shader.program )
 
     def create_shaders( self ) -> None:
-        """Create the GLSL shaders used for the editor and general pipeline"""
-        self.general            = Shader( self.context, "general", templated = True )
-        self.skybox             = Shader( self.context, "skybox" )
-        self.skybox_proc        = Shader( self.context, "skybox_proc" )
-        self.gamma              = Shader( self.context, "gamma" )
-        self.color              = Shader( self.context, "color" )
-        self.resolve            = Shader( self.context, "resolve" ) # deprecated
-        self.shadowmap          = Shader( self.context, "shadowmap", templated = True )
-        self.fog                = Shader( self.context, "fog", templated = True )
-
-        self.object_modelmatrix = Shader( self.context, "object_modelmatrix", compute=True )
-        self.indirect           = Shader( self.context, "indirect", compute=True )
+        """Submit the GLSL shaders used for the editor and general pipeline.
+        Programs compile and link concurrently when supported, call finish_shaders() before use"""
+        self._shader_start = time.perf_counter()
+
+        self.general            = Shader( self.context, "general", templated = True, deferred = True )
+        self.skybox             = Shader( self.context, "skybox", deferred = True )
+        self.skybox_proc        = Shader( self.context, "skybox_proc", deferred = True )
+        self.gamma              = Shader( self.context, "gamma", deferred = True )
+        self.color              = Shader( self.context, "color", deferred = True )
+        self.debug              = Shader( self.context, "debug", deferred = True )
+        self.resolve            = Shader( self.context, "resolve", deferred = True ) # deprecated
+        self.shadowmap          = Shader( self.context, "shadowmap", templated = True, deferred = True )
+        self.fog                = Shader( self.context, "fog", templated = True, deferred = True )
+
+        self.object_modelmatrix = Shader( self.context, "object_modelmatrix", compute=True, deferred = True )
+        self.indirect           = Shader( self.context, "indirect", compute=True, deferred = True )
 
         # Full GPU driven
-        self.gpu_driven_batch_counter       = Shader( self.context, "gpu_driven_batch_counter", compute=True )
-        self.gpu_driven_batch_compact       = Shader( self.context, "gpu_driven_batch_compact", compute=True )
-        self.gpu_driven_build_instances     = Shader( self.context, "gpu_driven_build_instances", compute=True )
+        self.gpu_driven_batch_counter       = Shader( self.context, "gpu_driven_batch_counter", compute=True, deferred = True )
+        self.gpu_driven_batch_compact       = Shader( self.context, "gpu_driven_batch_compact", compute=True, deferred = True )
+        self.gpu_driven_build_instances     = Shader( self.context, "gpu_driven_build_instances", compute=True, deferred = True )
         
-        self.gpu_driven_build_object_buffer = Shader( self.context, "gpu_driven_build_object_buffer", compute=True )
-
-    #
-    # UBO / SSBO
-    #
+        self.gpu_driven_build_object_buffer = Shader( self.context, "gpu_driven_build_object_buffer", compute=True, deferred = True )
 
-    
-    #
-    # editor visuals
-    #
-    def create_grid_vbo( self, size, spacing ):
-        lines = []
-        for i in np.arange(-size, size + spacing, spacing):
-            # lines along Z
-            lines.append([i, 0, -size])
-            lines.append([i, 0, size])
-            # lines along X
-            lines.append([-size, 0, i])
-            lines.append([size, 0, i])
-        lines = np.array(lines, dtype=np.float32)
-    
-        # create VAO and VBO
-        vao = glGenVertexArrays(1)
-        glBindVertexArray(vao)
-    
-        vbo = glGenBuffers(1)
-        glBindBuffer(GL_ARRAY_BUFFER, vbo)
-        glBufferData(GL_ARRAY_BUFFER, lines.nbytes, lines, GL_STATIC_DRAW)
-    
-        # position attribute
-        glEnableVertexAttribArray(0)
-        glVertexAttribPointer(0, 3, GL_FLOAT, GL_FALSE, 0, None)
-    
-        glBindVertexArray(0)
+        self.shaders : list[Shader] = [
+            self.general, self.skybox, self.skybox_proc, self.gamma, self.color, self.debug, self.resolve, self.shadowmap, self.fog,
+            self.object_modelmatrix, self.indirect, 
+            self.gpu_driven_batch_counter, self.gpu_driven_batch_compact, self.gpu_driven_build_instances, self.gpu_driven_build_object_buffer
+        ]
 
-        return vao, len(lines)
+        # hot reload
+        self._shader_mtimes     : dict[str, int] = {}
+        self._shader_next_check : float = 0.0
 
-    def create_axis_vbo( self, length: float = 1.0, centered: bool = False ):
-        if centered:
-            start = -length
-            end   =  length
-        else:
-            start = 0.0
-            end   = length
+    def finish_shaders( self ) -> None:
+        """Wait for all submitted shader programs, finishing them in completion order"""
+        pending = [ shader for shader in self.shaders if shader.pending is not None ]
 
-        vertices = np.array([
-            # X axis : red
-            start, 0.0,   0.0,
-            end,   0.0,   0.0,
+        while pending:
+            pending = [ shader for shader in pending if not shader.poll() ]
 
-            # Y axis : green
-            0.0,   start, 0.0,
-            0.0,   end,   0.0,
+            if pending:
+                time.sleep( 0.0005 )
 
-            # Z axis : blue
-            0.0,   0.0,   start,
-            0.0,   0.0,   end,
-        ], dtype=np.float32)
+        _total = ( time.perf_counter() - self._shader_start ) * 1000.0
+        _cached = sum( shader.from_cache for shader in self.shaders )
+        self.context.console.note( f"Shaders ready in {_total:.1f} ms ({_cached}/{len(self.shaders)} from binary cache)" )
 
-        vao = glGenVertexArrays(1)
-        glBindVertexArray(vao)
+        # shared per-frame uniforms, explicit binding for GLSL < 420 (no layout binding qualifier)
+        for shader in self.shaders:
+            shader.bind_uniform_block( UBO.FrameUBO.BLOCK_NAME, UBO.FrameUBO.BINDING )
 
-        vbo = glGenBuffers(1)
-        glBindBuffer(GL_ARRAY_BUFFER, vbo)
-        glBufferData(
-            GL_ARRAY_BUFFER,
-            vertices.nbytes,
-            vertices,
-            GL_STATIC_DRAW
-        )
+        self._shader_mtimes = self._shader_file_mtimes()
 
-        glEnableVertexAttribArray(0)
-        glVertexAttribPointer(
-            0,              # location
-            3,              # vec3
-            GL_FLOAT,
-            GL_FALSE,
-            0,
-            None
-        )
+    def _shader_file_mtimes( self ) -> dict[str, int]:
+        mtimes = {}
 
-        glBindVertexArray(0)
+        for shader in self.shaders:
+            for path in shader.dependencies:
+                if path not in mtimes:
+                    try:
+                        mtimes[path] = os.stat( path ).st_mtime_ns
+                    except OSError:
+                        mtimes[path] = 0
 
-        return vao
+        return mtimes
 
-    def create_editor_vaos( self ) -> None:
-        self.editor_grid_vao, self.editor_grid_lines = self.create_grid_vbo( 
-            size    = self.settings.grid_size, 
-            spacing = self.settings.grid_spacing 
-        )
+    def update_shaders( self ) -> None:
+        """Hot reload, resubmit shaders whose source or any #include changed on disk.
+        Finished programs are swapped in, until then (or on errors) the previous program stays bound"""
+        for shader in self.shaders:
+            if shader.pending is not None:
+                shader.poll()
 
-        self.editor_axis_vao = self.create_axis_vbo(
-            length      = 100.0,
-            centered    = False
-        )
-    
-    def draw_grid( self ):
-        """Draw the horizontal grid to the framebuffer"""
-        if not self.settings.drawGrid or not self.editor_grid_vao:
+        if not self.settings.shader_hot_reload:
             return
 
-        self.use_shader( self.color )
-
-        glUniformMatrix4fv( self.shader.uniforms['uPMatrix'], 1, GL_FALSE, self.projection )
-        glUniformMatrix4fv( self.shader.uniforms['uVMatrix'], 1, GL_FALSE, self.view )
-        glUniformMatrix4fv( self.shader.uniforms['uMMatrix'], 1, GL_FALSE, self.identity_matrix )
-
-        # color
-        grid_color = self.settings.grid_color
-        glUniform4f( self.shader.uniforms['uColor'],  grid_color[0],  grid_color[1], grid_color[2], 1.0 )
-           
-        glBindVertexArray( self.editor_grid_vao )
-        glDrawArrays( GL_LINES, 0, self.editor_grid_lines )
-        glBindVertexArray( 0 )
-
-        # deprecated (26-12-2025)
-        # switched to VAO
-        #size = self.settings.grid_size
-        #spacing = self.settings.grid_spacing
-        #
-        ## Draw the grid lines on the XZ plane
-        #for i in np.arange(-size, size + spacing, spacing):
-        #    # Draw lines parallel to Z axis
-        #    glBegin(GL_LINES)
-        #    glVertex3f(i, 0, -size)
-        #    glVertex3f(i, 0, size)
-        #    glEnd()
-        #
-        #    # Draw lines parallel to X axis
-        #    glBegin(GL_LINES)
-        #    glVertex3f(-size, 0, i)
-        #    glVertex3f(size, 0, i)
-        #    glEnd()
-
-    def draw_axis( self, width : float = 3.0 ):
-        """Draw axis lines. width and length can be adjust, also if axis is centered or half-axis"""
-        if not self.settings.drawAxis or not self.editor_axis_vao:
+        now = time.perf_counter()
+        if now < self._shader_next_check:
             return
-        
-        depth_test_enabled  = glIsEnabled( GL_DEPTH_TEST )
-        depth_write_mask    = glGetBooleanv( GL_DEPTH_WRITEMASK )
 
-        glDisable( GL_DEPTH_TEST )
-        glDepthMask( GL_FALSE )
+        self._shader_next_check = now + self.settings.shader_hot_reload_interval
 
-        self.use_shader( self.color )
-        glLineWidth( width )
-        
-        glUniformMatrix4fv( self.shader.uniforms['uPMatrix'], 1, GL_FALSE, self.projection )
-        glUniformMatrix4fv( self.shader.uniforms['uVMatrix'], 1, GL_FALSE, self.view )
-        glUniformMatrix4fv( self.shader.uniforms['uMMatrix'], 1, GL_FALSE, self.identity_matrix)
-
-        glBindVertexArray( self.editor_axis_vao )
-
-        # X axis : red
-        glUniform4f( self.shader.uniforms['uColor'], 1, 0, 0, 1 )
-        glDrawArrays( GL_LINES, 0, 2 )
-
-        # Y axis : green
-        glUniform4f( self.shader.uniforms['uColor'], 0, 1, 0, 1 )
-        glDrawArrays(GL_LINES, 2, 2)
-
-        # Z axis : blue
-        glUniform4f( self.shader.uniforms['uColor'], 0, 0, 1, 1 )
-        glDrawArrays( GL_LINES, 4, 2 )
+        mtimes = self._shader_file_mtimes()
+        changed = { path for path, mtime in mtimes.items() if self._shader_mtimes.get( path ) != mtime }
+        self._shader_mtimes = mtimes
 
-        glBindVertexArray( 0 )
-        glLineWidth( 1.0 )
+        if not changed:
+            return
 
-        if depth_test_enabled:
-            glEnable( GL_DEPTH_TEST )
+        for shader in self.shaders:
+            if shader.dependencies & changed:
+                self.context.console.note( f"Reloading shader [{shader.uid}]" )
+                shader.submit()
 
-        glDepthMask( depth_write_mask )
+    #
+    # UBO / SSBO
+    #
 
-        # deprecated (26-12-2025)
-        # switched to VAO
-        #glLineWidth(width)
-        #
-        #self.use_shader(self.color)
-        #
-        ## bind projection matrix
-        #glUniformMatrix4fv(self.shader.uniforms['uPMatrix'], 1, GL_FALSE, self.projection)
-        #
-        ## viewmatrix
-        #glUniformMatrix4fv(self.shader.uniforms['uVMatrix'], 1, GL_FALSE, self.view)
-        #
-        ## modelamtrix identrity
-        #glUniformMatrix4fv(self.shader.uniforms['uMMatrix'], 1, GL_FALSE, self.identity_matrix)
-        #
-        #
-        #if centered:
-        #    start = -length
-        #    end   = +length
-        #else:
-        #    start = 0.0
-        #    end   = length
-        #
-        ## X axis : red
-        #glUniform4f(self.shader.uniforms['uColor'], 1.0, 0.0, 0.0, 1.0)
-        #glBegin(GL_LINES)
-        #glVertex3f(start, 0.0,   0.0)
-        #glVertex3f(end,   0.0,   0.0)
-        #glEnd()
-        #
-        ## Y axis : green
-        #glUniform4f(self.shader.uniforms['uColor'], 0.0, 1.0, 0.0, 1.0)
-        #glBegin(GL_LINES)
-        #glVertex3f(0.0, start,   0.0)
-        #glVertex3f(0.0, end,     0.0)
-        #glEnd()
-        #
-        ## Z axis : blue
-        #glUniform4f(self.shader.uniforms['uColor'], 0.0, 0.0, 1.0, 1.0)
-        #glBegin(GL_LINES)
-        #glVertex3f(0.0,   0.0, start)
-        #glVertex3f(0.0,   0.0, end)
-        #glEnd()
-        #
-        #glLineWidth(1.0)
     
     #
     # projection
@@ -1005,20 +888,20 @@ class Renderer:
     #
     def _initPhysics( self ):
         """Initialize the pybullter physics engine and set gravity"""
-        self.physics_client = p.connect(p.DIRECT)
+        self.physics_time   : PhysicsTime = PhysicsTime( self.settings )
+        self.physics_server : PhysicsServer = None
+
+        # optional worker process, pybullet calls are forwarded by modules.physicsApi
+        if self.settings.physics_server:
+            self.physics_server = PhysicsServer( self.physics_time.time_step, self.physics_time.max_substeps )
+            p.server = self.physics_server
+        else:
+            self.physics_client = p.connect(p.DIRECT)
 
         #p.setAdditionalSearchPath(pybullet_data.getDataPath())
         p.setGravity(0, -10, 0)
+        p.setTimeStep(self.physics_time.time_step)
 
-        self.physics_step = 1.0 / 240.0
-        p.setTimeStep(self.physics_step)
-
-        #p.setPhysicsEngineParameter(
-        #    numSolverIterations    = 10,
-        #    numSubSteps            = 1
-        #)
-
-        self.physics_accumulator = 0.0
         # debug print list of available functions
         #for name in dir(p):
         #    if callable(getattr(p, name)):
@@ -1026,17 +909,31 @@ class Renderer:
 
     def _runPhysics( self ):
         """Run the step simulation when game is running"""
+        _physics_sync = self.context.physics_sync
+
         if not self.game_running:
+            if self.physics_server:
+                self.physics_server.set_running( False )
+
+            self.physics_time.reset()
+            _physics_sync.reset()
             return
 
-        self.physics_accumulator += self.deltaTime
-        max_steps = 8
-        steps = 0
+        # step rate, substeps and solver budget of the current scene
+        self.physics_time.configure( self.context.scene.getCurrentScene(), self.physics_server, self.context.world.physics_bases.values() )
+
+        # the physics server steps on its own, sample its published states
+        if self.physics_server:
+            self.physics_server.set_running( True )
+            _physics_sync.update()
+            return
 
-        while self.physics_accumulator >= self.physics_step and steps < max_steps:
-            p.stepSimulation()
-            self.physics_accumulator -= self.physics_step
-            steps += 1
+        # bulk readback of all runtime bodies after stepping
+        if self.physics_time.advance( self.deltaTime ):
+            _physics_sync.read()
+
+        # interpolated between the previous and current step, consumed by PhysicBase and PhysicLink _runPhysics
+        _physics_sync.update( self.physics_time.alpha )
 
     #
     # shadowmap
@@ -1101,46 +998,6 @@ class Renderer:
     def addDrawItem( self, model_index : int, mesh_index : int, world_matrix : Matrix44, uuid ):
         self.draw_list.append( DrawItem( model_index, mesh_index, world_matrix, uuid ) )
 
-    #
-    # non-indirect (simple)
-    #
-    def submitDrawItem( self, model_index : int , mesh_index : int , model_matrix : Matrix44 ):
-        """Render the mesh from a node
-
-        :param model_index: The index of a loaded model
-        :type model_index: int
-        :param mesh_index:  The index of a mesh within that model
-        :type mesh_index: int
-        :param model_matrix: The transformation model matrix, used along with view and projection matrices
-        :type model_matrix: matrix44
-        """
-        mesh : "Models.Mesh" = self.context.models.model_mesh[model_index][mesh_index]
-
-        # bind material
-        if "u_MaterialIndex" in self.shader.uniforms:
-            glUniform1i( self.shader.uniforms['u_MaterialIndex'], int(mesh["material"]) )
-
-        # directly bind 2D samplers in non-bindless mode:
-        if not self.USE_BINDLESS_TEXTURES:
-            self.context.materials.bind( mesh["material"] )
-
-        glUniformMatrix4fv( self.shader.uniforms['uMMatrix'], 1, GL_FALSE, model_matrix )
-
-        # Bind VAO that stores all attribute and buffer state
-        # 
-        # in case of shared VAO, this is not the right place. but ok for now
-        # this mode is used in older system with shared VAO disabled
-        # or for instant rendering which is only used for editor rendering (colliders)
-        glBindVertexArray( mesh["vao_simple"].vao )
-
-        if self.SHARED_VAO:
-            glDrawElementsBaseVertex( GL_TRIANGLES, mesh["num_indices"], GL_UNSIGNED_INT,
-                ctypes.c_void_p(mesh["firstIndex"] * 4),
-                mesh["baseVertex"]
-            )
-        else:
-            glDrawElements( GL_TRIANGLES, mesh["num_indices"], GL_UNSIGNED_INT, None )
-
     #
     # indirect
     #
@@ -1190,36 +1047,18 @@ class Renderer:
     #
     # Renderpasses
     #
-    def prepareMainRenderpass( self, _scene : SceneManager.Scene, 
+    def update_frame_uniforms( self, _scene : SceneManager.Scene, 
                                light_view : Matrix44 = None, 
                                light_projection : Matrix44 = None
         ) -> None:
-        self.use_shader( self.general )
-
-        if self.USE_INDIRECT:
-            # shadowmap
-            glUniform1i( self.shader.uniforms['ushadowmapEnabled'], int(_scene["shadowmap_enabled"]) )
-            if _scene["shadowmap_enabled"]:
-                glUniformMatrix4fv( self.shader.uniforms['uLightPMatrix'], 1, GL_FALSE, light_projection )
-                glUniformMatrix4fv( self.shader.uniforms['uLightVMatrix'], 1, GL_FALSE, light_view )
-                self.context.images.bind_gl( self.shadowmap_fbo["depth_image"], GL_TEXTURE7, "sShadowMap", 7 )
-
-        # bind the projection and view  matrix beginning (until shader switch)
-        glUniformMatrix4fv( self.shader.uniforms['uPMatrix'], 1, GL_FALSE, self.projection )
-        glUniformMatrix4fv( self.shader.uniforms['uVMatrix'], 1, GL_FALSE, self.view )
-
-        # static textures
-        self.context.cubemaps.bind( self.context.environment_map, GL_TEXTURE5, "sEnvironment", 5 )
-        self.context.images.bind( self.context.cubemaps.brdf_lut, GL_TEXTURE6, "sBRDF", 6 )
-
-        # editor uniforms
-        glUniform1i( self.shader.uniforms['in_renderMode'], self.renderMode )
-        glUniform1f( self.shader.uniforms['in_roughnessOverride'], self.context.roughnessOverride  )
-        glUniform1f( self.shader.uniforms['in_metallicOverride'], self.context.metallicOverride )
-
-        # camera origin
-        glUniform4f( self.shader.uniforms['u_ViewOrigin'], self.camera.camera_pos[0], self.camera.camera_pos[1], self.camera.camera_pos[2], 0.0 )
+        """Write the shared FrameUniforms UBO once per frame, every pass reads camera, 
+        shadowmap and sun state from it (see common_structs.glsl)
 
+        :param light_view: The shadowmap view matrix, None when shadows are disabled
+        :type light_view: Matrix44
+        :param light_projection: The shadowmap projection matrix, None when shadows are disabled
+        :type light_projection: Matrix44
+        """
         # sun direction, position and color
         _sun : "GameObject" = self.context.scene.getSun()
         _sun_active = _sun and _sun.hierachyActive()
@@ -1230,29 +1069,57 @@ class Renderer:
         light_dir   = _sun.transform.local_position if _sun_active else self.settings.default_light_color
         light_color = _sun.light.light_color        if _sun_active else self.settings.default_ambient_color
 
-        glUniform4f( self.shader.uniforms['in_lightdir'], light_dir[0], light_dir[1], light_dir[2], 0.0 )
-        glUniform4f( self.shader.uniforms['in_lightcolor'], light_color[0], light_color[1], light_color[2], 1.0 )
-        glUniform4f( self.shader.uniforms['in_ambientcolor'], _scene["ambient_color"][0], _scene["ambient_color"][1], _scene["ambient_color"][2], 1.0 )
+        self.ubo.ubo_frame.update(
+            view                = self.view,
+            projection          = self.projection,
+            light_view          = light_view if light_view is not None else self.identity_matrix,
+            light_projection    = light_projection if light_projection is not None else self.identity_matrix,
+            view_origin         = self.camera.camera_pos,
+            light_dir           = light_dir,
+            light_color         = light_color,
+            ambient_color       = _scene["ambient_color"]
+        )
+
+        self.ubo.ubo_frame.bind( state = self.state )
+
+    def prepareMainRenderpass( self, _scene : SceneManager.Scene ) -> None:
+        self.use_shader( self.general )
+
+        if self.USE_INDIRECT:
+            # shadowmap
+            self.state.uniform_1i( self.shader.uniforms['ushadowmapEnabled'], int(_scene["shadowmap_enabled"]) )
+            if _scene["shadowmap_enabled"]:
+                self.context.images.bind_gl( self.shadowmap_fbo["depth_image"], GL_TEXTURE7, "sShadowMap", 7 )
+
+        # static textures
+        self.context.cubemaps.bind_environment( self.context.environment_map, GL_TEXTURE5, "sEnvironment", 5 )
+        self.context.images.bind( self.context.cubemaps.brdf_lut, GL_TEXTURE6, "sBRDF", 6 )
+
+        # editor uniforms
+        self.state.uniform_1i( self.shader.uniforms['in_renderMode'], self.renderMode )
+        self.state.uniform_1f( self.shader.uniforms['in_roughnessOverride'], self.context.roughnessOverride  )
+        self.state.uniform_1f( self.shader.uniforms['in_metallicOverride'], self.context.metallicOverride )
 
         # lights
+        _sun : "GameObject" = self.context.scene.getSun()
         self.ubo._upload_lights_ubo( _sun )
-        self.ubo.ubo_lights.bind( binding = 0 )  
+        self.ubo.ubo_lights.bind( binding = 0, state = self.state )  
 
         # materials
         self.ubo._upload_material_ubo()
-        self.ubo.ubo_materials.bind( binding = 1 )
+        self.ubo.ubo_materials.bind( binding = 1, state = self.state )
 
     def submitMainRenderpassIndirect( self, 
                                       num_batches : int,               # used for drawcount using instancing
                                       draw_ranges : dict[(int, int), (int, int)]    # only used for per mesh
         ) -> None:
         if self.settings.drawWireframe:
-            glPolygonMode( GL_FRONT_AND_BACK, GL_LINE )
+            self.state.set_polygon_mode( GL_LINE )
     
         self.ubo.indirect_ssbo.bind_buffer()
 
         if self.SHARED_VAO:
-            glBindVertexArray( self.context.models.shared_vao.vao )
+            self.state.bind_vao( self.context.models.shared_vao.vao )
     
         #for model_index, mesh_index in draw_ranges:
         #    mesh = self.context.models.model_mesh[model_index][mesh_index]
@@ -1261,7 +1128,7 @@ class Renderer:
         # support for indirect, bindless, and shared VAO is enabled.
         # allowing to render the scene in one indirect instanced drawcall
         if self.context.renderer.USE_GPU_DRIVEN_RENDERING: 
-            glMultiDrawElementsIndirect(
+            fastGL.glMultiDrawElementsIndirect(
                 GL_TRIANGLES,
                 GL_UNSIGNED_INT,
                 ctypes.c_void_p(0),
@@ -1279,9 +1146,9 @@ class Renderer:
                     self.context.materials.bind( mesh["material"] )
             
                 if not self.SHARED_VAO:
-                    glBindVertexArray( mesh["vao_simple"].vao )
+                    self.state.bind_vao( mesh["vao_simple"].vao )
             
-                glMultiDrawElementsIndirect(
+                fastGL.glMultiDrawElementsIndirect(
                     GL_TRIANGLES,
                     GL_UNSIGNED_INT,
                     ctypes.c_void_p(start_offset * ctypes.sizeof(DrawElementsIndirectCommand)),
@@ -1290,45 +1157,98 @@ class Renderer:
                 )
 
         if self.settings.drawWireframe:
-            glPolygonMode( GL_FRONT_AND_BACK, GL_FILL )
+            self.state.set_polygon_mode( GL_FILL )
 
     def submitMainRenderpassSimple( self, _draw_list : list[DrawItem] ) -> None:
+        """Instanced rendering without indirect support (GL 3.3).
+
+            Draw items are sorted by VAO, material and mesh, items sharing a mesh become 
+            a single glDrawElementsInstanced call. All model matrices are streamed into one 
+            instance buffer per frame, each batch points the matrix attribute at its range.
+
+        :param _draw_list: The collected draw items
+        :type _draw_list: list[DrawItem]
+        """
+        self.simple_draw_calls = 0
+        self.simple_draw_items = len(_draw_list)
+
+        if not _draw_list:
+            return
+
+        model_mesh = self.context.models.model_mesh
+
+        def sort_key( item : DrawItem ):
+            mesh = model_mesh[item.model_index][item.mesh_index]
+            return ( mesh["vao_simple"].vao, mesh["material"], item.model_index, item.mesh_index )
+
+        _draw_list = sorted( _draw_list, key=sort_key )
+
+        # stream matrices, orphaning the previous frame's storage
+        matrices = np.array( [ item.matrix for item in _draw_list ], dtype=np.float32 )
+
+        glBindBuffer( GL_ARRAY_BUFFER, self.instance_vbo )
+        glBufferData( GL_ARRAY_BUFFER, matrices.nbytes, matrices, GL_STREAM_DRAW )
+
+        _material_location = self.shader.uniforms.get( 'u_MaterialIndex', -1 )
+
         if self.settings.drawWireframe:
-            glPolygonMode( GL_FRONT_AND_BACK, GL_LINE )
+            self.state.set_polygon_mode( GL_LINE )
+
+        num_items   = len(_draw_list)
+        first       = 0
+
+        while first < num_items:
+            model_index = _draw_list[first].model_index
+            mesh_index  = _draw_list[first].mesh_index
+
+            last = first + 1
+            while last < num_items and _draw_list[last].model_index == model_index and _draw_list[last].mesh_index == mesh_index:
+                last += 1
+
+            mesh : "Models.Mesh" = model_mesh[model_index][mesh_index]
+
+            # bind material
+            if _material_location != -1:
+                self.state.uniform_1i( _material_location, mesh["material"] )
+
+            if not self.USE_BINDLESS_TEXTURES:
+                self.context.materials.bind( mesh["material"] )
 
-        for item in _draw_list:
-            self.submitDrawItem( item.model_index, item.mesh_index, item.matrix )
+            vao : VAO = mesh["vao_simple"]
+            self.state.bind_vao( vao.vao )
+            vao.set_instance_matrices( self.instance_vbo, first * VAO.INSTANCE_MATRIX_STRIDE )
+
+            if self.SHARED_VAO:
+                fastGL.glDrawElementsInstancedBaseVertex( GL_TRIANGLES, mesh["num_indices"], GL_UNSIGNED_INT,
+                    ctypes.c_void_p(mesh["firstIndex"] * 4),
+                    last - first,
+                    mesh["baseVertex"]
+                )
+            else:
+                fastGL.glDrawElementsInstanced( GL_TRIANGLES, mesh["num_indices"], GL_UNSIGNED_INT, None, last - first )
+
+            self.simple_draw_calls += 1
+            first = last
 
         if self.settings.drawWireframe:
-            glPolygonMode( GL_FRONT_AND_BACK, GL_FILL )
+            self.state.set_polygon_mode( GL_FILL )
 
     def submitShadowRenderpass( self, 
                                 num_batches : int, 
-                                draw_ranges : dict[(int, int), (int, int)], 
-                                light_view : Matrix44, 
-                                light_projection : Matrix44 
+                                draw_ranges : dict[(int, int), (int, int)]
         ):
+        """Render depth from the sun, light matrices are read from the FrameUniforms UBO"""
         self.bind_fbo( self.shadowmap_fbo, GL_DEPTH_BUFFER_BIT )
         self.use_shader (self.shadowmap )
 
-        glEnable( GL_CULL_FACE )
+        self.state.enable( GL_CULL_FACE )
         glCullFace( GL_FRONT )  # reduce peter-panning
 
-        glUniformMatrix4fv(
-            self.shader.uniforms["uVMatrix"],
-            1, GL_FALSE, light_view
-        )
-
-        glUniformMatrix4fv(
-            self.shader.uniforms["uPMatrix"],
-            1, GL_FALSE, light_projection
-        )
-
         if self.SHARED_VAO:
-            glBindVertexArray( self.context.models.shared_vao.vao )
+            self.state.bind_vao( self.context.models.shared_vao.vao )
 
         if self.context.renderer.USE_GPU_DRIVEN_RENDERING: 
-            glMultiDrawElementsIndirect(
+            fastGL.glMultiDrawElementsIndirect(
                 GL_TRIANGLES,
                 GL_UNSIGNED_INT,
                 ctypes.c_void_p(0),
@@ -1340,9 +1260,9 @@ class Renderer:
                 mesh = self.context.models.model_mesh[model_index][mesh_index]
 
                 if not self.SHARED_VAO:
-                    glBindVertexArray( mesh["vao_simple"].vao )
+                    self.state.bind_vao( mesh["vao_simple"].vao )
 
-                glMultiDrawElementsIndirect(
+                fastGL.glMultiDrawElementsIndirect(
                     GL_TRIANGLES,
                     GL_UNSIGNED_INT,
                     ctypes.c_void_p(start_offset * ctypes.sizeof(DrawElementsIndirectCommand)),
@@ -1351,7 +1271,7 @@ class Renderer:
                 )
 
         #glCullFace(GL_BACK)
-        glDisable(GL_CULL_FACE)
+        self.state.disable( GL_CULL_FACE )
 
         self.unbind_fbo()
     
@@ -1359,10 +1279,6 @@ class Renderer:
         self.bind_fbo( self.fog_fbo )
         self.use_shader( self.fog )
 
-        glUniformMatrix4fv( self.shader.uniforms['uPMatrix'], 1, GL_FALSE, self.projection )
-        glUniformMatrix4fv( self.shader.uniforms['uVMatrix'], 1, GL_FALSE, self.view )
-        glUniform4f( self.shader.uniforms['u_ViewOrigin'], self.camera.camera_pos[0], self.camera.camera_pos[1], self.camera.camera_pos[2], 0.0 )
-
         _sun : "GameObject" = self.context.scene.getSun()
         _sun_active = _sun and _sun.hierachyActive()
 
@@ -1373,16 +1289,16 @@ class Renderer:
         fog_color = _scene["fog_color"]
 
         #glUniform4f( self.shader.uniforms['in_lightdir'], light_dir[0], light_dir[1], light_dir[2], 0.0 )
-        glUniform4f( self.shader.uniforms['in_lightcolor'], fog_color[0], fog_color[1], fog_color[2], 1.0 )
-        glUniform1f( self.shader.uniforms['ufogDensity'], _scene["fog_density"] )
-        glUniform1f( self.shader.uniforms['ufogHeight'], _scene["fog_height"] )
-        glUniform1f( self.shader.uniforms['ufogFalloff'], _scene["fog_falloff"] )
-        glUniform1i( self.shader.uniforms['ufogLightsContrib'], int(_scene["fog_lights_contrib"]) )
+        self.state.uniform_4f( self.shader.uniforms['ufogColor'], fog_color[0], fog_color[1], fog_color[2], 1.0 )
+        self.state.uniform_1f( self.shader.uniforms['ufogDensity'], _scene["fog_density"] )
+        self.state.uniform_1f( self.shader.uniforms['ufogHeight'], _scene["fog_height"] )
+        self.state.uniform_1f( self.shader.uniforms['ufogFalloff'], _scene["fog_falloff"] )
+        self.state.uniform_1i( self.shader.uniforms['ufogLightsContrib'], int(_scene["fog_lights_contrib"]) )
 
         # lights
-        self.ubo.ubo_lights.bind( binding = 0 )  
+        self.ubo.ubo_lights.bind( binding = 0, state = self.state )  
 
-        glDisable(GL_DEPTH_TEST)
+        self.state.disable( GL_DEPTH_TEST )
 
         self.context.images.bind_gl( current_image,  GL_TEXTURE0, "sColorTexture",     0 )
 
@@ -1391,7 +1307,7 @@ class Renderer:
         else:
             self.context.images.bind_gl( self.context.renderer.main_fbo['depth_image'], GL_TEXTURE1, "sDepthTexture",     1 )
    
-        glBindVertexArray( self.screenVAO )
+        self.state.bind_vao( self.screenVAO )
         glDrawArrays(GL_TRIANGLES, 0, 6)
 
         self.unbind_fbo()
@@ -1458,15 +1374,12 @@ class Renderer:
         self.use_shader( self.gpu_driven_batch_counter )
 
         # this lets the compute shader know the valid range of global invocation IDs (gid),
-        glUniform1ui( self.shader.uniforms['num_gameObjects'], num_gameObjects )
+        self.state.uniform_1ui( self.shader.uniforms['num_gameObjects'], num_gameObjects )
 
         # reset all 'mesh_instance_counter' entries
         glBindBuffer( GL_SHADER_STORAGE_BUFFER, self.ubo.mesh_instance_counter )
         glClearBufferData( GL_SHADER_STORAGE_BUFFER, GL_R32UI, GL_RED_INTEGER, GL_UNSIGNED_INT, None )          
 
-        glUniformMatrix4fv( self.shader.uniforms['uPMatrix'], 1, GL_FALSE, self.projection )
-        glUniformMatrix4fv( self.shader.uniforms['uVMatrix'], 1, GL_FALSE, self.view )
-
         # visbuf
         glBindBuffer( GL_SHADER_STORAGE_BUFFER, self.ubo.visbuf )
         glClearBufferData( GL_SHADER_STORAGE_BUFFER, GL_R32UI, GL_RED_INTEGER, GL_UNSIGNED_INT, np.array([0], dtype=np.uint32) )
@@ -1474,7 +1387,7 @@ class Renderer:
         # dispatch
         glMemoryBarrier(GL_SHADER_STORAGE_BARRIER_BIT)
         group_count = (num_gameObjects + 63) // 64
-        glDispatchCompute(group_count, 1, 1)
+        fastGL.glDispatchCompute(group_count, 1, 1)
         glMemoryBarrier(
             GL_SHADER_STORAGE_BARRIER_BIT |
             GL_COMMAND_BARRIER_BIT
@@ -1522,7 +1435,7 @@ class Renderer:
 
         glMemoryBarrier(GL_SHADER_STORAGE_BARRIER_BIT)
         group_count = (self.ubo.comp_meshnode_max + 127) // 128
-        glDispatchCompute(group_count, 1, 1)
+        fastGL.glDispatchCompute(group_count, 1, 1)
         glMemoryBarrier(
             GL_SHADER_STORAGE_BARRIER_BIT |
             GL_COMMAND_BARRIER_BIT
@@ -1535,14 +1448,14 @@ class Renderer:
         self.use_shader( self.gpu_driven_build_instances )
 
         # this lets the compute shader know the valid range of global invocation IDs (gid),
-        glUniform1ui( self.shader.uniforms['num_gameObjects'], num_gameObjects )
+        self.state.uniform_1ui( self.shader.uniforms['num_gameObjects'], num_gameObjects )
 
         glBindBuffer( GL_SHADER_STORAGE_BUFFER, self.ubo.mesh_instance_writer )
         glClearBufferData( GL_SHADER_STORAGE_BUFFER, GL_R32UI, GL_RED_INTEGER, GL_UNSIGNED_INT, None )        
 
         glMemoryBarrier(GL_SHADER_STORAGE_BARRIER_BIT)
         group_count = (num_gameObjects + 63) // 64
-        glDispatchCompute(group_count, 1, 1)
+        fastGL.glDispatchCompute(group_count, 1, 1)
         glMemoryBarrier(
             GL_SHADER_STORAGE_BARRIER_BIT |
             GL_COMMAND_BARRIER_BIT
@@ -1556,11 +1469,11 @@ class Renderer:
         self.use_shader( self.gpu_driven_build_object_buffer )
 
         # this lets the compute shader know the valid range of global invocation IDs (gid),
-        glUniform1ui( self.shader.uniforms['num_gameObjects'], num_gameObjects )
+        self.state.uniform_1ui( self.shader.uniforms['num_gameObjects'], num_gameObjects )
 
         glMemoryBarrier(GL_SHADER_STORAGE_BARRIER_BIT)
         group_count = (num_gameObjects + 127) // 128
-        glDispatchCompute(group_count, 1, 1)
+        fastGL.glDispatchCompute(group_count, 1, 1)
 
         # make SSBO writes visible to vertex/fragment shaders
         glMemoryBarrier(
@@ -1573,21 +1486,21 @@ class Renderer:
         num_gameObjects : int = len(self.context.world.transforms)
 
         # sadly, ton of uniforms
-        self.ubo.object_ssbo.bind_base( binding = 0 )
-        self.ubo.comp_meshnode_matrices_ssbo.bind_base( binding = 1 )
-        glBindBufferBase( GL_SHADER_STORAGE_BUFFER, 2, self.ubo.indirect_ssbo.ssbo )
-        self.ubo.batch_ssbo.bind_base( binding = 3 )
-        self.ubo.model_ssbo.bind_base( binding = 4 )
-        self.ubo.comp_gameobject_matrices_ssbo.bind_base( binding = 5 )
-        glBindBufferBase(GL_SHADER_STORAGE_BUFFER, 6, self.ubo.batch_counter)
-        glBindBufferBase(GL_SHADER_STORAGE_BUFFER, 7, self.ubo.mesh_instance_counter)
-        glBindBufferBase(GL_SHADER_STORAGE_BUFFER, 8, self.ubo.mesh_instance_writer)
-        self.ubo.instances_ssbo.bind_base( binding = 9 )
-        glBindBufferBase(GL_SHADER_STORAGE_BUFFER, 10, self.ubo.visbuf)
-        glBindBufferBase(GL_SHADER_STORAGE_BUFFER, 11, self.ubo.instance_counter)
-        glBindBufferBase(GL_SHADER_STORAGE_BUFFER, 12, self.ubo.meshnode_to_batch)
-        self.ubo.object_base_ssbo.bind_base( binding = 13 )
-        self.ubo.physic_ssbo.bind_base( binding = 14 )
+        self.ubo.object_ssbo.bind_base( binding = 0, state = self.state )
+        self.ubo.comp_meshnode_matrices_ssbo.bind_base( binding = 1, state = self.state )
+        self.state.bind_buffer_base( GL_SHADER_STORAGE_BUFFER, 2, self.ubo.indirect_ssbo.ssbo )
+        self.ubo.batch_ssbo.bind_base( binding = 3, state = self.state )
+        self.ubo.model_ssbo.bind_base( binding = 4, state = self.state )
+        self.ubo.comp_gameobject_matrices_ssbo.bind_base( binding = 5, state = self.state )
+        self.state.bind_buffer_base( GL_SHADER_STORAGE_BUFFER, 6, self.ubo.batch_counter )
+        self.state.bind_buffer_base( GL_SHADER_STORAGE_BUFFER, 7, self.ubo.mesh_instance_counter )
+        self.state.bind_buffer_base( GL_SHADER_STORAGE_BUFFER, 8, self.ubo.mesh_instance_writer )
+        self.ubo.instances_ssbo.bind_base( binding = 9, state = self.state )
+        self.state.bind_buffer_base( GL_SHADER_STORAGE_BUFFER, 10, self.ubo.visbuf )
+        self.state.bind_buffer_base( GL_SHADER_STORAGE_BUFFER, 11, self.ubo.instance_counter )
+        self.state.bind_buffer_base( GL_SHADER_STORAGE_BUFFER, 12, self.ubo.meshnode_to_batch )
+        self.ubo.object_base_ssbo.bind_base( binding = 13, state = self.state )
+        self.ubo.physic_ssbo.bind_base( binding = 14, state = self.state )
 
         # reset states
         self.ubo.object_ssbo.clear()
@@ -1616,7 +1529,7 @@ class Renderer:
         # number of work items = number of draw blocks
         # local_size_x = 64 -> ceil(num_draw_items / 64)
         group_count = (num_draw_items + 63) // 64
-        glDispatchCompute(group_count, 1, 1)
+        fastGL.glDispatchCompute(group_count, 1, 1)
 
         # make SSBO writes visible to vertex/fragment shaders
         glMemoryBarrier(
@@ -1627,14 +1540,14 @@ class Renderer:
     def _dispatch_compute_indirect_sbbo( self, num_batches ) -> None:
         self.use_shader( self.indirect )
 
-        self.ubo.comp_meshnode_matrices_ssbo.bind_base( binding = 1 )
-        glBindBufferBase( GL_SHADER_STORAGE_BUFFER, 2, self.ubo.indirect_ssbo.ssbo )
-        self.ubo.batch_ssbo.bind_base( binding = 3 )
+        self.ubo.comp_meshnode_matrices_ssbo.bind_base( binding = 1, state = self.state )
+        self.state.bind_buffer_base( GL_SHADER_STORAGE_BUFFER, 2, self.ubo.indirect_ssbo.ssbo )
+        self.ubo.batch_ssbo.bind_base( binding = 3, state = self.state )
 
         # number of work items = number of batches
         # local_size_x = 64 -> ceil(num_batches / 64)
         group_count = (num_batches + 63) // 64
-        glDispatchCompute(group_count, 1, 1)
+        fastGL.glDispatchCompute(group_count, 1, 1)
 
         # make SSBO writes visible to vertex/fragment shaders
         glMemoryBarrier(
@@ -1659,6 +1572,9 @@ class Renderer:
         imgui.new_frame()
         self.camera.new_frame()
 
+        # ImGui and loaders changed GL state outside of the state cache
+        self.state.invalidate()
+
 
         self.view = self.context.camera.get_view_matrix()
 
@@ -1678,6 +1594,14 @@ class Renderer:
             or create individual draw calls for each item. (simple rendering) 
 
         """
+        # shared camera, shadowmap and sun uniforms for every pass this frame
+        if self.USE_INDIRECT and _scene["shadowmap_enabled"]:
+            light_view, light_projection = self._compute_light_vp()
+        else:
+            light_view = light_projection = None
+
+        self.update_frame_uniforms( _scene, light_view, light_projection )
+
         # batch meshes (indirect rendering)
         if self.USE_INDIRECT:
             # upload transforms to SSBO (for compute shader)
@@ -1693,11 +1617,11 @@ class Renderer:
 
             # Hybrid, use GPU compute for draw and indirect buffers (if enabled)
             else:
-                self.ubo.instances_ssbo.bind_base( binding = 9 )
-                self.ubo.object_ssbo.bind_base( binding = 0 )
-                self.ubo.comp_meshnode_matrices_ssbo.bind_base( binding = 1 )
-                self.ubo.comp_gameobject_matrices_ssbo.bind_base( binding = 2 )
-                self.ubo.physic_ssbo.bind_base( binding = 3 )
+                self.ubo.instances_ssbo.bind_base( binding = 9, state = self.state )
+                self.ubo.object_ssbo.bind_base( binding = 0, state = self.state )
+                self.ubo.comp_meshnode_matrices_ssbo.bind_base( binding = 1, state = self.state )
+                self.ubo.comp_gameobject_matrices_ssbo.bind_base( binding = 2, state = self.state )
+                self.ubo.physic_ssbo.bind_base( binding = 3, state = self.state )
 
                 # sort by model and mesh index, constructing a batched VAO list
                 batches, num_draw_items = self.ubo._build_batched_draw_list( self.draw_list )
@@ -1713,10 +1637,7 @@ class Renderer:
 
             # shadowmap renderpass
             if _scene["shadowmap_enabled"]:
-                light_view, light_projection = self._compute_light_vp()
-                self.submitShadowRenderpass( num_batches, draw_ranges, light_view, light_projection )
-            else:
-                light_view = light_projection = None
+                self.submitShadowRenderpass( num_batches, draw_ranges )
 
             #
             # scene
@@ -1724,8 +1645,9 @@ class Renderer:
             self.bind_fbo( self.main_fbo )
 
             self.context.skybox.draw( _scene )
+            self.state.invalidate() # cubemap updates and readbacks bind untracked
 
-            self.prepareMainRenderpass( _scene, light_view, light_projection )
+            self.prepareMainRenderpass( _scene )
             self.submitMainRenderpassIndirect( num_batches, draw_ranges )
 
         # create individual draw calls for each item in the draw list (simple rendering)
@@ -1736,11 +1658,12 @@ class Renderer:
             self.bind_fbo( self.main_fbo )
 
             self.context.skybox.draw( _scene )
+            self.state.invalidate() # cubemap updates and readbacks bind untracked
 
-            self.prepareMainRenderpass( _scene, None, None )
+            self.prepareMainRenderpass( _scene )
             self.submitMainRenderpassSimple( self.draw_list )
 
-        glBindVertexArray(0)
+        self.state.bind_vao( 0 )
 
     def dispatch_postprocess( self ) -> None:
         _scene : SceneManager.Scene = self.context.scene.getCurrentScene()
@@ -1763,7 +1686,7 @@ class Renderer:
         if self.game_stop:
             self.game_stop = False
 
-        glUseProgram( 0 )
+        self.state.use_program( 0 )
         glFlush()
 
         # stop rendering to main FBO
@@ -1791,6 +1714,7 @@ class Renderer:
 
         self.check_opengl_error()
 
+        self.state.end_frame()
         self.draw_list.clear()
 
         # upload to swapchain image
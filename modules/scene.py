@@ -51,6 +51,12 @@ class SceneManager:
         fog_height          : float
         fog_falloff         : float
 
+        physics_step_rate           : float
+        physics_max_substeps        : int
+        physics_solver_iterations   : int
+        physics_sleeping            : bool
+        physics_sleep_threshold     : float
+
     class _GameObject(TypedDict):
         """Typedef for a gameObjects in a scene file"""
         instance    : str
@@ -500,6 +506,13 @@ class SceneManager:
         # shadowmap
         scene["shadowmap_enabled"]  = _scene["shadowmap_enabled"]
 
+        # physics
+        scene["physics_step_rate"]          = _scene["physics_step_rate"]
+        scene["physics_max_substeps"]       = _scene["physics_max_substeps"]
+        scene["physics_solver_iterations"]  = _scene["physics_solver_iterations"]
+        scene["physics_sleeping"]           = _scene["physics_sleeping"]
+        scene["physics_sleep_threshold"]    = _scene["physics_sleep_threshold"]
+
         _gameObjects : List[SceneManager._GameObject] = []
 
         self.saveGameObjectRecursive( 
@@ -560,6 +573,9 @@ class SceneManager:
         :param path: The path to a .py script file
         :type path: Path
         """
+        # recompile, even when saved within the modification time resolution
+        self.context.script_modules.invalidate( path )
+
         for obj in self.context.world.gameObjects.values():
             for script in obj.scripts:
                 if path != script.path:
@@ -766,6 +782,13 @@ class SceneManager:
                 # shadowmap
                 scene["shadowmap_enabled"]  = scene.get("shadowmap_enabled",      self.settings.default_sm_enabled )
 
+                # physics
+                scene["physics_step_rate"]          = scene.get("physics_step_rate",            self.settings.default_physics_step_rate )
+                scene["physics_max_substeps"]       = scene.get("physics_max_substeps",         self.settings.default_physics_max_substeps )
+                scene["physics_solver_iterations"]  = scene.get("physics_solver_iterations",    self.settings.default_physics_solver_iterations )
+                scene["physics_sleeping"]           = scene.get("physics_sleeping",             self.settings.default_physics_sleeping )
+                scene["physics_sleep_threshold"]    = scene.get("physics_sleep_threshold",      self.settings.default_physics_sleep_threshold )
+
                 if "gameObjects" in scene: 
                     self.loadGameObjectsRecursive( 
                         None, 
@@ -11,8 +11,9 @@ if TYPE_CHECKING:
     from main import EmberEngine
     from gameObjects.gameObject import GameObject
 
+import copy
 import inspect
-import importlib
+import time
 import traceback
 import uuid as uid
 
@@ -44,6 +45,17 @@ class Script:
         self.exports        : dict     = exports
         self._error         : str = None
 
+        # profiling of onUpdate, in ms
+        self.update_time        : float = 0.0   # last update
+        self.update_time_avg    : float = 0.0   # smoothed
+        self.update_time_max    : float = 0.0
+        self.over_budget        : bool  = False
+
+        # reduced-rate updates
+        self._frames            : int   = 0     # frames since the last update
+        self._elapsed           : float = 0.0   # seconds since the last update
+        self._tick              : float = 0.0   # fixed rate accumulator
+
     def __create_uuid( self ) -> uid.UUID:
         return uid.uuid4()
 
@@ -81,32 +93,6 @@ class Script:
     #
     # class
     #
-    def __get_class_name_from_script( self, path: Path ) -> str:
-        """Scan the content of the script to find the first class name.
-
-        :param path: The path to a .py script file
-        :type path: Path
-        :return: A class name if its found, return None otherwise
-        :rtype: str | None
-        """
-        filepath = (self.settings.rootdir / path).resolve()
-
-        if os.path.isfile(filepath):
-            code = filepath.read_text()
-        else:
-            return None
-
-        for line in code.splitlines():
-            if line.strip().startswith("class "):
-                class_name = line.strip().split()[1].split('(')[0]
-
-                if class_name.endswith(":"):
-                    return class_name[:-1]
-
-                return class_name
-
-        return None
-
     def __format_class_name( self, name : str ) -> str:
         """Format the classname
         
@@ -123,17 +109,6 @@ class Script:
 
         return formatted
 
-    def __set_class_name( self ) -> None:
-        """Gets the class name for a given scripts, also formats it for GUI
-        
-        :param script: The Script object containing a file path
-        :type script: GameObject.Script
-        """
-        class_name = self.__get_class_name_from_script( self.path )
-
-        self.class_name = class_name or "Invalid"
-        self.class_name_f = self.__format_class_name( self.class_name )
-
     #
     # attribute export
     #
@@ -152,6 +127,8 @@ class Script:
 
         for class_attr_name, class_attr in _ScriptClass.__dict__.items():
             if isinstance(class_attr, ScriptBehaivior.Exported):
+                # the class is shared by all scripts of the file, each script holds its own export values
+                class_attr = copy.copy( class_attr )
                 _exports[class_attr_name] = class_attr
 
                 class_attr_value = class_attr.get()
@@ -269,9 +246,6 @@ class Script:
                 self.console.note( f"[{__func_name__}] '{self.class_name}' is not active, skip" )
                 return False
 
-            # find and set class name
-            self.__set_class_name()
-
             # destroy, somewhat ..
             # avoid storing direct references to objects inside script["instance"] 
             self.instance = None
@@ -279,75 +253,29 @@ class Script:
             # Resolve the absolute script file path
             _found, file_path = self.__resolve_script_path()
             if not _found:
+                self.class_name     = "Invalid"
+                self.class_name_f   = self.__format_class_name( self.class_name )
                 raise FileNotFoundError( f"Script '{file_path}' not found!")
 
-            # Derive a simple module name from the file name
-            module_name = os.path.splitext(os.path.basename(file_path))[0]
-
-            # Remove from sys.modules if already loaded (hot reload)
-            if module_name in sys.modules:
-                del sys.modules[module_name]
+            # compiled once per file, shared by all instances (see ScriptModules)
+            _module = self.context.script_modules.get( file_path )
 
-            # Load the module from the file path
-            spec = importlib.util.spec_from_file_location(module_name, file_path)
-            if spec is None or spec.loader is None:
-                self.console.error( f"[{__func_name__}] Failed to load spec for {file_path}" )
-                raise ImportError(f"Cannot import module from {file_path}")
-
-            module = importlib.util.module_from_spec(spec)
-        
-            # Load ScriptBehaivior
-            _script_behavior = importlib.import_module("gameObjects.scriptBehaivior")
-            ScriptBehaivior = getattr(_script_behavior, "ScriptBehaivior")
-
-            # define class attribute export method from ScriptBehaivior
-            # making it callable from a dynamic script
-            module.__dict__["export"] = ScriptBehaivior.export
-
-            # import exportable engine types
-            for _engine_type_class in EngineTypes.registry().keys():
-                module.__dict__[_engine_type_class.__name__] = _engine_type_class
-
-            # auto import modules
-            for auto_mod_name, auto_mod_as in self.settings.SCRIPT_AUTO_IMPORT_MODULES.items():
-                imported = importlib.import_module(auto_mod_name)
-
-                if auto_mod_as is not None:
-                    module.__dict__[auto_mod_as] = imported
-                else:
-                    module.__dict__[auto_mod_name] = imported
-
-            sys.modules[module_name] = module
-            spec.loader.exec_module(module)
-
-            if not hasattr(module, self.class_name):
-                self.console.error( f"[{__func_name__}] No class named '{self.class_name}' found in {file_path}" )
-                raise AttributeError(
-                    f"[{__func_name__}] No class named '{self.class_name}' found in {file_path}"
-                )
-
-            _ScriptClass = getattr(module, self.class_name)
+            # find and set class name
+            self.class_name     = _module.class_name
+            self.class_name_f   = self.__format_class_name( self.class_name )
 
             # load and initialize exported script attributes
             # either with class default, or stored value from scene
-            self.__load_script_exported_attributes( _ScriptClass )
-
-            class ClassPlaceholder(_ScriptClass, ScriptBehaivior):
-                def __init__(self, context, gameObject):
-                    ScriptBehaivior.__init__(self, context, gameObject)
-                    if hasattr(_ScriptClass, "__init__"):
-                        try:
-                            _ScriptClass.__init__(self)
-                        except TypeError:
-                            pass
-
-            self.instance = ClassPlaceholder(self.context, self.gameObject)
+            self.__load_script_exported_attributes( _module.module_class )
+
+            self.instance = _module.script_class(self.context, self.gameObject)
         
             # apply exported class attributes as script instance attributes
             self.__apply_script_exported_attributes( )
 
             # clear existing errors
             self._error = None
+            self.reset_profile()
 
             # cache base methods
             self.base_methods = {
@@ -372,3 +300,83 @@ class Script:
             return False
 
         return True
+
+    #
+    # update
+    #
+    def reset_profile( self ) -> None:
+        """Clear the measured onUpdate cost and the update rate state"""
+        self.update_time        = 0.0
+        self.update_time_avg    = 0.0
+        self.update_time_max    = 0.0
+        self.over_budget        = False
+
+        self._frames            = 0
+        self._elapsed           = 0.0
+        self._tick              = 0.0
+
+    def _is_due( self, delta_time : float ) -> bool:
+        """Check the update_interval or update_rate of the script class
+
+        :param delta_time: Elapsed frame time in seconds
+        :type delta_time: float
+        :return: True if onUpdate should run this frame
+        :rtype: bool
+        """
+        self._frames    += 1
+        self._elapsed   += delta_time
+
+        rate = self.instance.update_rate
+
+        # fixed tick, does not catch up on missed ticks
+        if rate > 0.0:
+            period = 1.0 / rate
+            self._tick += delta_time
+
+            # tolerance for accumulated frame times
+            if self._tick < period - 1e-6:
+                return False
+
+            self._tick = self._tick - period if self._tick < period * 2.0 else 0.0
+            return True
+
+        return self._frames >= max( 1, int( self.instance.update_interval ) )
+
+    def update( self, delta_time : float ) -> None:
+        """Invoke onUpdate of the script instance when it is due, 
+        measuring its cost against Settings.script_budget_ms
+
+        :param delta_time: Elapsed frame time in seconds
+        :type delta_time: float
+        """
+        _on_update = self.base_methods.get( "onUpdate" )
+
+        if _on_update is None or not self._is_due( delta_time ):
+            return
+
+        self.instance.update_delta = self._elapsed
+        self._frames    = 0
+        self._elapsed   = 0.0
+
+        start = time.perf_counter()
+
+        try:
+            _on_update()
+
+        finally:
+            elapsed = ( time.perf_counter() - start ) * 1000.0
+
+            self.update_time        = elapsed
+            self.update_time_avg   += ( elapsed - self.update_time_avg ) * 0.1
+            self.update_time_max    = max( self.update_time_max, elapsed )
+
+            over_budget = elapsed > self.settings.script_budget_ms
+
+            # report once when a script starts exceeding the budget
+            if over_budget and not self.over_budget:
+                self.console.warn( 
+                    f"Script: [{self.path.name}] on [{self.gameObject.name}] onUpdate took {elapsed:.2f} ms, "
+                    f"budget {self.settings.script_budget_ms:.2f} ms" 
+                )
+
+            self.over_budget = over_budget
@@ -0,0 +1,189 @@
+import os, sys
+from pathlib import Path
+
+from typing import TYPE_CHECKING, Dict
+
+from modules.context import Context
+from modules.engineTypes import EngineTypes
+
+from gameObjects.scriptBehaivior import ScriptBehaivior
+
+if TYPE_CHECKING:
+    from main import EmberEngine
+
+import importlib
+import importlib.util
+
+class ScriptModules( Context ):
+    """Cache of compiled script modules, shared by all Script instances of a file.
+
+    A script file is read, compiled and executed once, keyed by its resolved path,
+    modification time and size. Script.init_instance() creates instances from the cached
+    class, so class-level state of a script is shared between its instances.
+    A changed file is reloaded on the next init, invalidate() forces a reload of one file.
+    """
+    class Module:
+        def __init__( self, key : tuple, code, module, class_name : str, module_class : type, script_class : type ) -> None:
+            """Compiled script file
+
+            :param key: Modification time and size of the file when it was loaded
+            :type key: tuple
+            :param code: The compiled code object
+            :type code: CodeType
+            :param module: The executed module
+            :type module: ModuleType
+            :param class_name: The name of the first class in the file
+            :type class_name: str
+            :param module_class: The script class as declared in the file, holds the exported attributes
+            :type module_class: type
+            :param script_class: The script class combined with ScriptBehaivior, instantiated per script
+            :type script_class: type
+            """
+            self.key            : tuple = key
+            self.code           = code
+            self.module         = module
+            self.class_name     : str = class_name
+            self.module_class   : type = module_class
+            self.script_class   : type = script_class
+
+    def __init__( self, context ) -> None:
+        """Script module cache
+
+        :param context: This is the main context of the application
+        :type context: EmberEngine
+        """
+        super().__init__( context )
+
+        self.modules    : Dict[Path, ScriptModules.Module] = {}
+
+        # number of files compiled and executed since start
+        self.loads      : int = 0
+
+    @staticmethod
+    def resolve( path : Path ) -> Path:
+        """Resolve the absolute file path of a script,
+        relative paths are resolved against the current working directory (project root)
+
+        :param path: The path to a .py script file
+        :type path: Path
+        :return: The absolute path
+        :rtype: Path
+        """
+        if not os.path.isabs( path ):
+            path = os.path.join( os.getcwd(), path )
+
+        return Path( os.path.normpath( path ) )
+
+    @staticmethod
+    def _find_class_name( source : str ) -> str:
+        """Scan the source of a script to find the first class name.
+
+        :param source: The content of a .py script file
+        :type source: str
+        :return: A class name if its found, return None otherwise
+        :rtype: str | None
+        """
+        for line in source.splitlines():
+            if line.strip().startswith("class "):
+                class_name = line.strip().split()[1].split('(')[0]
+
+                if class_name.endswith(":"):
+                    return class_name[:-1]
+
+                return class_name
+
+        return None
+
+    def invalidate( self, path : Path = None ) -> None:
+        """Reload a script file on its next use, eg. after it was saved in the editor
+
+        :param path: The path to a .py script file, if None all files are reloaded
+        :type path: Path
+        """
+        if path is None:
+            self.modules.clear()
+            return
+
+        self.modules.pop( self.resolve( path ), None )
+
+    def get( self, path : Path ) -> "ScriptModules.Module":
+        """Get the compiled module of a script file, (re)load when it is not cached or changed
+
+        :param path: The path to a .py script file
+        :type path: Path
+        :return: The cached module
+        :rtype: ScriptModules.Module
+        """
+        file_path   = self.resolve( path )
+        stat        = os.stat( file_path )
+        key         = ( stat.st_mtime_ns, stat.st_size )
+
+        cached = self.modules.get( file_path )
+
+        if cached is not None and cached.key == key:
+            return cached
+
+        self.modules[file_path] = self._load( file_path, key )
+        return self.modules[file_path]
+
+    def _load( self, file_path : Path, key : tuple ) -> "ScriptModules.Module":
+        """Compile and execute a script file, then derive its script class"""
+        source      = file_path.read_text( encoding="utf8" )
+        class_name  = self._find_class_name( source )
+
+        if class_name is None:
+            raise AttributeError( f"No class found in {file_path}" )
+
+        code = compile( source, str(file_path), "exec" )
+
+        # Derive a simple module name from the file name
+        module_name = file_path.stem
+
+        # Remove from sys.modules if already loaded (hot reload)
+        if module_name in sys.modules:
+            del sys.modules[module_name]
+
+        spec = importlib.util.spec_from_file_location( module_name, file_path )
+        if spec is None or spec.loader is None:
+            raise ImportError( f"Cannot import module from {file_path}" )
+
+        module = importlib.util.module_from_spec( spec )
+
+        # define class attribute export method from ScriptBehaivior
+        # making it callable from a dynamic script
+        module.__dict__["export"] = ScriptBehaivior.export
+
+        # import exportable engine types
+        for _engine_type_class in EngineTypes.registry().keys():
+            module.__dict__[_engine_type_class.__name__] = _engine_type_class
+
+        # auto import modules
+        for auto_mod_name, auto_mod_as in self.settings.SCRIPT_AUTO_IMPORT_MODULES.items():
+            imported = importlib.import_module( auto_mod_name )
+
+            if auto_mod_as is not None:
+                module.__dict__[auto_mod_as] = imported
+            else:
+                module.__dict__[auto_mod_name] = imported
+
+        sys.modules[module_name] = module
+        exec( code, module.__dict__ )
+
+        if not hasattr( module, class_name ):
+            raise AttributeError( f"No class named '{class_name}' found in {file_path}" )
+
+        _ScriptClass = getattr( module, class_name )
+
+        class ClassPlaceholder(_ScriptClass, ScriptBehaivior):
+            def __init__(self, context, gameObject):
+                ScriptBehaivior.__init__(self, context, gameObject)
+                if hasattr(_ScriptClass, "__init__"):
+                    try:
+                        _ScriptClass.__init__(self)
+                    except TypeError:
+                        pass
+
+        self.loads += 1
+        self.console.log( f"Compiled script: {file_path.name}" )
+
+        return ScriptModules.Module( key, code, module, class_name, _ScriptClass, ClassPlaceholder )
@@ -57,6 +57,52 @@ class Settings:
         # shadowmap
         self.default_sm_enabled                 : bool = False
 
+        # physics
+        self.default_physics_step_rate          : float = 240.0
+        self.default_physics_max_substeps       : int = 8
+        self.default_physics_solver_iterations  : int = 50
+        self.default_physics_sleeping           : bool = True
+        self.default_physics_sleep_threshold    : float = 0.0
+
+        # texture streaming
+        self.image_decode_workers   : int  = 4
+        self.image_use_pbo          : bool = True
+
+        # decoded textures (flipped, full mip chain) are cached on disk and memory-mapped on load
+        self.texture_cache_path     : str  = f"{self.rootdir}\\.cache\\textures\\"
+        self.texture_cache_enabled  : bool = True
+        self.texture_cache_compress : bool = True   # store S3TC when GL_EXT_texture_compression_s3tc is supported
+
+        # split-sum BRDF lut, generated once and cached on disk by size and sample count
+        self.lut_cache_path         : str  = f"{self.rootdir}\\.cache\\luts\\"
+        self.brdf_lut_size          : int  = 256
+        self.brdf_lut_samples       : int  = 512
+        self.brdf_lut_use_compute   : bool = True
+
+        # environment processing, GGX prefiltered specular mip chain and SH irradiance, cached on disk
+        self.env_cache_path         : str  = f"{self.rootdir}\\.cache\\environment\\"
+        self.env_prefilter_size     : int  = 128
+        self.env_prefilter_samples  : int  = 64
+
+        # procedural sky cubemap updates, faces rendered per frame and minimum sun movement (degrees)
+        self.sky_faces_per_frame    : int   = 1
+        self.sky_update_angle       : float = 0.5
+
+        # linked shader program binaries, keyed by preprocessed source and driver
+        self.shader_cache_path      : str  = f"{self.rootdir}\\.cache\\shaders\\"
+        self.shader_cache_enabled   : bool = True
+
+        # recompile shaders when a source or included file changes, checked every interval (seconds)
+        self.shader_hot_reload          : bool  = not self.is_app_exported()
+        self.shader_hot_reload_interval : float = 0.5
+
+        # per-frame GPU upload budget (models and textures), remaining work carries over
+        self.upload_budget_ms       : float = 4.0
+        self.upload_budget_bytes    : int   = 64 * 1024 * 1024
+
+        # per-script onUpdate budget, scripts exceeding it are reported in the console
+        self.script_budget_ms       : float = 2.0
+
         # grid parameters
         self.grid_color     = ( 0.83, 0.74, 94.0, 1.0 )
         self.grid_size      = 10.0
@@ -68,11 +114,15 @@ class Settings:
         self.drawWireframe  = False
         self.drawColliders  = False
 
+        # physics
+        # run pybullet in a worker process, stepping in parallel with rendering
+        self.physics_server = os.getenv("EE_PHYSICS_SERVER") == "1"
+
         # scriptable behaivior
         self.SCRIPT_AUTO_IMPORT_MODULES = {
             # module        # as
             "pygame"                : None,
-            "pybullet"              : "p",
+            "modules.physicsApi"    : "p",  # pybullet, in-process or physics server
             #"modules.transform"     : None
         }
 
@@ -0,0 +1,366 @@
+from typing import TYPE_CHECKING, Dict, List, Union
+
+from pyrr import Matrix44, Quaternion
+import numpy as np
+
+from modules.context import Context
+
+if TYPE_CHECKING:
+    from main import EmberEngine
+    from gameObjects.gameObject import GameObject
+
+import uuid as uid
+
+class TransformSystem( Context ):
+    """Batched world matrix propagation for gameObject transforms.
+
+    The hierarchy is flattened into a depth-sorted (topological) array of parent indices,
+    rebuilt only when the hierarchy changes. Dirty transforms are recomposed in one vectorized
+    pass and their world matrices are propagated level by level, parents before children.
+
+    Physic shapes (collision/visual) are not part of the hierarchy, they keep updating their
+    own matrices relative to the gameObject transform.
+
+    Scripts moving many gameObjects use the bulk API (self.transforms in a script), local
+    positions, rotations and scales are read and written as (n, 3) arrays::
+
+        positions = self.transforms.get_local_positions( objects )
+        positions[:, 1] += 1.0 * self.update_delta
+        self.transforms.set_local_positions( objects, positions )
+
+    objects is a list of gameObjects, or a gameObject to address the group of its children.
+    """
+    def __init__( self, context ) -> None:
+        """Transform system
+
+        :param context: This is the main context of the application
+        :type context: EmberEngine
+        """
+        super().__init__( context )
+
+        # gameObjects with an out-of-date world matrix
+        self.pending        : Dict[uid.UUID, "GameObject"] = {}
+
+        # flattened hierarchy, depth sorted
+        self._objects       : List["GameObject"] = []
+        self._index         : Dict[uid.UUID, int] = {}
+        self._parent        : np.ndarray = np.empty( 0, dtype=np.int32 )
+        self._depth         : np.ndarray = np.empty( 0, dtype=np.int32 )
+        self._world         : np.ndarray = np.empty( (0, 4, 4), dtype=np.float64 )
+        self._invalid       : bool = True
+
+    def invalidate( self ) -> None:
+        """Hierarchy changed (add, remove or reparent), rebuild the flattened arrays on the next update"""
+        self._invalid = True
+
+    def mark( self, gameObject : "GameObject" ) -> bool:
+        """Queue the world matrix of a gameObject for the next batch
+
+        :param gameObject: The gameObject whose local transform changed
+        :type gameObject: GameObject
+        :return: True when it was not pending yet
+        :rtype: bool
+        """
+        if gameObject.uuid in self.pending:
+            return False
+
+        self.pending[gameObject.uuid] = gameObject
+        return True
+
+    def resolve( self, gameObject : "GameObject" ) -> None:
+        """Ensure the world matrix of a gameObject is up to date,
+        runs a batch for all pending transforms when it is not.
+
+        :param gameObject: The gameObject that is about to use its world matrix
+        :type gameObject: GameObject
+        """
+        if gameObject.uuid in self.pending:
+            self.update()
+
+    def hierarchy_order( self, gameObjects : List["GameObject"] ) -> List["GameObject"]:
+        """Sort gameObjects parents before children (breadth-first hierarchy order)
+
+        :param gameObjects: The gameObjects to sort
+        :type gameObjects: List[GameObject]
+        :return: The sorted gameObjects, those that are not part of the world are left out
+        :rtype: List[GameObject]
+        """
+        if self._invalid:
+            self._rebuild()
+
+        index   = self._index
+        objects = self._objects
+
+        ordered = [ ( i, obj ) for obj in gameObjects
+                    if ( i := index.get( obj.uuid ) ) is not None and objects[i] is obj ]
+        ordered.sort( key=lambda x: x[0] )
+
+        return [ obj for _, obj in ordered ]
+
+    def _rebuild( self ) -> None:
+        """Flatten the hierarchy breadth-first, so every parent index is smaller than its child index"""
+        gameObjects = self.context.world.gameObjects
+
+        level : List["GameObject"] = [ obj for obj in gameObjects.values()
+                                        if obj.parent is None or obj.parent.uuid not in gameObjects ]
+
+        objects : List["GameObject"] = []
+        depth   : List[int] = []
+        d       : int = 0
+
+        while level:
+            objects.extend( level )
+            depth.extend( [d] * len(level) )
+
+            level = [ child for obj in level for child in obj.children.values() if child.uuid in gameObjects ]
+            d += 1
+
+        self._objects   = objects
+        self._index     = { obj.uuid : i for i, obj in enumerate( objects ) }
+        self._depth     = np.asarray( depth, dtype=np.int32 )
+        self._parent    = np.asarray( [ self._index.get( obj.parent.uuid, -1 ) if obj.parent is not None else -1
+                                        for obj in objects ], dtype=np.int32 )
+        self._world     = np.zeros( ( len(objects), 4, 4 ), dtype=np.float64 )
+        self._invalid   = False
+
+    #
+    # vectorized math, matches Transform.euler_to_quat and Transform.compose_matrix (pyrr)
+    #
+    @staticmethod
+    def quat_multiply( a : np.ndarray, b : np.ndarray ) -> np.ndarray:
+        """Row-wise pyrr quaternion product a * b (x, y, z, w)"""
+        ax, ay, az, aw = a[:, 0], a[:, 1], a[:, 2], a[:, 3]
+        bx, by, bz, bw = b[:, 0], b[:, 1], b[:, 2], b[:, 3]
+
+        return np.stack( [
+             ax * bw + ay * bz - az * by + aw * bx,
+            -ax * bz + ay * bw + az * bx + aw * by,
+             ax * by - ay * bx + az * bw + aw * bz,
+            -ax * bx - ay * by - az * bz + aw * bw,
+        ], axis=1 )
+
+    @staticmethod
+    def euler_to_quats( euler : np.ndarray, order : str ) -> np.ndarray:
+        """Quaternions from (n, 3) euler angles in radians
+
+        :param euler: (n, 3) x, y, z rotations
+        :type euler: np.ndarray
+        :param order: Mapped multiplication order, see Settings.ENGINE_ROTATION_MAP
+        :type order: str
+        :return: (n, 4) quaternions, x, y, z, w
+        :rtype: np.ndarray
+        """
+        half    = euler * 0.5
+        s, c    = np.sin( half ), np.cos( half )
+        zero    = np.zeros( len(euler) )
+
+        axis = {
+            "X" : np.stack( [ s[:, 0], zero, zero, c[:, 0] ], axis=1 ),
+            "Y" : np.stack( [ zero, s[:, 1], zero, c[:, 1] ], axis=1 ),
+            "Z" : np.stack( [ zero, zero, s[:, 2], c[:, 2] ], axis=1 ),
+        }
+
+        q = TransformSystem.quat_multiply( axis[order[0]], axis[order[1]] )
+        return TransformSystem.quat_multiply( q, axis[order[2]] )
+
+    @staticmethod
+    def compose_matrices( position : np.ndarray, quat : np.ndarray, scale : np.ndarray ) -> np.ndarray:
+        """Local matrices T * R * S (pyrr, row-major) of n transforms
+
+        :return: (n, 4, 4) matrices
+        :rtype: np.ndarray
+        """
+        quat = quat / np.linalg.norm( quat, axis=1, keepdims=True )
+        x, y, z, w = quat[:, 0], quat[:, 1], quat[:, 2], quat[:, 3]
+
+        R = np.stack( [
+            1.0 - 2.0 * ( y * y + z * z ),  2.0 * ( x * y - z * w ),        2.0 * ( x * z + y * w ),
+            2.0 * ( x * y + z * w ),        1.0 - 2.0 * ( x * x + z * z ),  2.0 * ( y * z - x * w ),
+            2.0 * ( x * z - y * w ),        2.0 * ( y * z + x * w ),        1.0 - 2.0 * ( x * x + y * y ),
+        ], axis=1 ).reshape( -1, 3, 3 )
+
+        matrices = np.zeros( ( len(quat), 4, 4 ) )
+        matrices[:, :3, :3] = R * scale[:, :, None]
+        matrices[:, 3, :3]  = position
+        matrices[:, 3, 3]   = 1.0
+
+        return matrices
+
+    #
+    # update
+    #
+    def update( self ) -> None:
+        """Recompose all pending local matrices and propagate world matrices level by level,
+        results are written back to Transform.world_model_matrix and Transform._local_rotation_quat
+        """
+        if not self.pending:
+            return
+
+        if self._invalid:
+            self._rebuild()
+
+        pending     = self.pending
+        self.pending = {}
+
+        batch : List[int] = []
+
+        for obj in pending.values():
+            i = self._index.get( obj.uuid )
+
+            # not (yet) part of the world, eg. during scene loading
+            if i is None or self._objects[i] is not obj:
+                obj.transform._local_rotation_quat = obj.transform.euler_to_quat( obj.transform.local_rotation )
+                obj.transform._createWorldModelMatrix()
+                continue
+
+            batch.append( i )
+
+        if not batch:
+            return
+
+        index       = np.sort( np.asarray( batch, dtype=np.int32 ) )
+        transforms  = [ self._objects[i].transform for i in index ]
+
+        # properties, physics-owned transforms derive their locals on read
+        position    = np.array( [ t.local_position  for t in transforms ], dtype=np.float64 )
+        rotation    = np.array( [ t.local_rotation  for t in transforms ], dtype=np.float64 )
+        scale       = np.array( [ t.local_scale     for t in transforms ], dtype=np.float64 )
+
+        order       = self.settings.ENGINE_ROTATION_MAP[self.settings.ENGINE_ROTATION]
+        quats       = self.euler_to_quats( rotation, order )
+
+        world       = self._world
+        world[index] = self.compose_matrices( position, quats, scale )
+
+        # parents outside of the batch provide their current world matrix
+        parent      = self._parent[index]
+        external    = np.setdiff1d( parent[parent >= 0], index )
+
+        for p in external:
+            world[p] = self._objects[p].transform.world_model_matrix
+
+        # parents are always on a lower level, process levels in ascending order
+        depth = self._depth[index]
+
+        for d in np.unique( depth ):
+            level = ( depth == d ) & ( parent >= 0 )
+
+            if not level.any():
+                continue
+
+            child = index[level]
+            world[child] = np.matmul( world[child], world[parent[level]] )
+
+        for j, t in enumerate( transforms ):
+            t._local_rotation_quat  = Quaternion( quats[j] )
+            t.world_model_matrix    = Matrix44( world[index[j]].copy() )
+
+    #
+    # bulk script API
+    #
+    @staticmethod
+    def _group( objects : Union[List["GameObject"], "GameObject"] ) -> List["GameObject"]:
+        """A list of gameObjects, or the children of a gameObject"""
+        if hasattr( objects, "children" ):
+            return list( objects.children.values() )
+
+        return objects
+
+    def _get_locals( self, objects : Union[List["GameObject"], "GameObject"], name : str ) -> np.ndarray:
+        """Gather a local vector of many transforms into one (n, 3) array"""
+        # properties, physics-owned transforms derive their locals on read
+        return np.array( [ getattr( obj.transform, name ) for obj in self._group( objects ) ], dtype=np.float64 ).reshape( -1, 3 )
+
+    def _set_locals( self, objects : Union[List["GameObject"], "GameObject"], name : str, values ) -> None:
+        """Write a local vector of many transforms and mark them dirty in one pass,
+        without per-element change callbacks. The world matrices follow in the next batch.
+        """
+        objects = self._group( objects )
+        rows    = np.broadcast_to( np.asarray( values, dtype=np.float64 ), ( len(objects), 3 ) ).tolist()
+
+        for obj, row in zip( objects, rows ):
+            transform = obj.transform
+
+            if transform._local_stale:
+                transform._sync_local_from_physics()
+
+            # bypass vectorInterface.__setitem__, marked dirty once below
+            list.__setitem__( getattr( transform, name ), slice(None), row )
+            obj._mark_dirty( obj.DirtyFlag_.transform )
+
+    def get_local_positions( self, objects : Union[List["GameObject"], "GameObject"] ) -> np.ndarray:
+        """Local positions of many gameObjects
+
+        :param objects: The gameObjects, or a gameObject for the group of its children
+        :type objects: List[GameObject] | GameObject
+        :return: (n, 3) positions, a copy
+        :rtype: np.ndarray
+        """
+        return self._get_locals( objects, "local_position" )
+
+    def set_local_positions( self, objects : Union[List["GameObject"], "GameObject"], positions ) -> None:
+        """Set the local positions of many gameObjects
+
+        :param objects: The gameObjects, or a gameObject for the group of its children
+        :type objects: List[GameObject] | GameObject
+        :param positions: (n, 3) positions, or one (3,) position for all
+        :type positions: np.ndarray
+        """
+        self._set_locals( objects, "_local_position", positions )
+
+    def get_local_rotations( self, objects : Union[List["GameObject"], "GameObject"] ) -> np.ndarray:
+        """Local rotations of many gameObjects
+
+        :param objects: The gameObjects, or a gameObject for the group of its children
+        :type objects: List[GameObject] | GameObject
+        :return: (n, 3) euler rotations in radians, a copy
+        :rtype: np.ndarray
+        """
+        return self._get_locals( objects, "local_rotation" )
+
+    def set_local_rotations( self, objects : Union[List["GameObject"], "GameObject"], rotations ) -> None:
+        """Set the local rotations of many gameObjects
+
+        :param objects: The gameObjects, or a gameObject for the group of its children
+        :type objects: List[GameObject] | GameObject
+        :param rotations: (n, 3) euler rotations in radians, or one (3,) rotation for all
+        :type rotations: np.ndarray
+        """
+        self._set_locals( objects, "_local_rotation", rotations )
+
+    def get_local_scales( self, objects : Union[List["GameObject"], "GameObject"] ) -> np.ndarray:
+        """Local scales of many gameObjects
+
+        :param objects: The gameObjects, or a gameObject for the group of its children
+        :type objects: List[GameObject] | GameObject
+        :return: (n, 3) scales, a copy
+        :rtype: np.ndarray
+        """
+        return self._get_locals( objects, "local_scale" )
+
+    def set_local_scales( self, objects : Union[List["GameObject"], "GameObject"], scales ) -> None:
+        """Set the local scales of many gameObjects
+
+        :param objects: The gameObjects, or a gameObject for the group of its children
+        :type objects: List[GameObject] | GameObject
+        :param scales: (n, 3) scales, or one (3,) scale for all
+        :type scales: np.ndarray
+        """
+        self._set_locals( objects, "_local_scale", scales )
+
+    def get_world_positions( self, objects : Union[List["GameObject"], "GameObject"] ) -> np.ndarray:
+        """World positions of many gameObjects, runs the pending batch first
+
+        :param objects: The gameObjects, or a gameObject for the group of its children
+        :type objects: List[GameObject] | GameObject
+        :return: (n, 3) positions
+        :rtype: np.ndarray
+        """
+        self.update()
+
+        matrices = [ obj.transform.world_model_matrix for obj in self._group( objects ) ]
+
+        if not matrices:
+            return np.zeros( (0, 3), dtype=np.float64 )
+
+        return np.asarray( matrices, dtype=np.float64 )[:, 3, :3]
@@ -0,0 +1,117 @@
+from typing import TYPE_CHECKING, Dict, List
+
+from modules.context import Context
+
+if TYPE_CHECKING:
+    from main import EmberEngine
+    from gameObjects.gameObject import GameObject
+
+import uuid as uid
+
+class UpdateScheduler( Context ):
+    """Active-set scheduling of the per-frame gameObject updates.
+
+    Instead of walking every gameObject every frame, explicit sets are kept of the gameObjects
+    that need work: dirty (any DirtyFlag_), and while the game is running, script-bearing and
+    physics-driven (world.physics_bases and world.physic_links). Only those are updated,
+    parents before children. A static scene costs close to nothing.
+
+    Frames that start or stop the game still walk the full hierarchy from the root index,
+    every gameObject is enabled or disabled there, see EmberEngine.prepare_gameObjects().
+    """
+    def __init__( self, context ) -> None:
+        """Update scheduler
+
+        :param context: This is the main context of the application
+        :type context: EmberEngine
+        """
+        super().__init__( context )
+
+        # gameObjects of the world without a parent
+        self.roots      : Dict[uid.UUID, "GameObject"] = {}
+
+        # gameObjects with dirty flag(s), consumed every frame
+        self.dirty      : Dict[uid.UUID, "GameObject"] = {}
+
+        # gameObjects of the world with scripts attached
+        self.scripted   : Dict[uid.UUID, "GameObject"] = {}
+
+        # number of gameObjects updated last frame
+        self.updated    : int = 0
+
+    def _in_world( self, gameObject : "GameObject" ) -> bool:
+        return self.context.world.gameObjects.get( gameObject.uuid ) is gameObject
+
+    def add( self, gameObject : "GameObject" ) -> None:
+        """Index a gameObject that was added to the world
+
+        :param gameObject: The added gameObject
+        :type gameObject: GameObject
+        """
+        self.reparent( gameObject )
+        self.set_scripted( gameObject )
+
+        if gameObject._dirty:
+            self.mark_dirty( gameObject )
+
+    def clear( self ) -> None:
+        """All gameObjects were removed from the world"""
+        self.roots.clear()
+        self.dirty.clear()
+        self.scripted.clear()
+
+    def reparent( self, gameObject : "GameObject" ) -> None:
+        """Update the root index after the parent of a gameObject changed
+
+        :param gameObject: The reparented gameObject
+        :type gameObject: GameObject
+        """
+        if gameObject.parent is None and self._in_world( gameObject ):
+            self.roots[gameObject.uuid] = gameObject
+        else:
+            self.roots.pop( gameObject.uuid, None )
+
+    def mark_dirty( self, gameObject : "GameObject" ) -> None:
+        """Queue a gameObject with dirty flag(s) for the next update
+
+        :param gameObject: The dirty gameObject
+        :type gameObject: GameObject
+        """
+        self.dirty[gameObject.uuid] = gameObject
+
+    def set_scripted( self, gameObject : "GameObject" ) -> None:
+        """Update the script index after scripts were attached or removed
+
+        :param gameObject: The gameObject whose scripts changed
+        :type gameObject: GameObject
+        """
+        if gameObject.scripts and self._in_world( gameObject ):
+            self.scripted[gameObject.uuid] = gameObject
+        else:
+            self.scripted.pop( gameObject.uuid, None )
+
+    def collect( self ) -> List["GameObject"]:
+        """The gameObjects that need an update this frame, parents before children.
+        Dirty gameObjects marked while these are updated are collected next frame.
+
+        :return: The gameObjects to update
+        :rtype: List[GameObject]
+        """
+        world   = self.context.world
+        active  = self.dirty
+        self.dirty = {}
+
+        if self.renderer.game_running:
+            active.update( self.scripted )
+            active.update( ( uuid, base.gameObject ) for uuid, base in world.physics_bases.items() )
+            active.update( ( uuid, link.gameObject ) for uuid, link in world.physic_links.items() )
+
+        # dirty gameObjects that are not (yet) part of the world are queued again by add()
+        ordered = self.context.transform_system.hierarchy_order( active.values() )
+        self.updated = len(ordered)
+
+        return ordered
+
+    def discard_dirty( self ) -> None:
+        """Forget the queued dirty gameObjects, eg. when a full hierarchy walk updates all of them"""
+        self.dirty = {}
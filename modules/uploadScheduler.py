@@ -0,0 +1,173 @@
+import sys
+import time
+import traceback
+from typing import TYPE_CHECKING, List, Callable
+
+import numpy as np
+
+from modules.context import Context
+
+from dataclasses import dataclass, field
+
+if TYPE_CHECKING:
+    from main import EmberEngine
+    from modules.images import Images
+    from modules.models import Models
+
+class UploadScheduler( Context ):
+    class Kind_:
+        model   = 0
+        texture = 1
+
+    @dataclass(slots=True)
+    class Job:
+        """A single GPU upload, executed on the main thread
+
+        :param kind: model or texture, see UploadScheduler.Kind_
+        :param index: The model or image index
+        :param nbytes: Approximate bytes transferred to the GPU
+        :param execute: Performs the upload
+        :param seq: Submission order, used as tie-breaker
+        """
+        kind        : int
+        index       : int
+        nbytes      : int
+        execute     : Callable[[], None]
+        seq         : int = field( default=0 )
+
+    def __init__( self, context ):
+        """Unified per-frame budgeted scheduler for model and texture uploads.
+        Collects ready work from the model loader and image decode queues, orders it by priority
+        and executes what fits in the frame budget. The rest carries over to the next frames.
+
+        :param context: This is the main context of the application
+        :type context: EmberEngine
+        """
+        super().__init__( context )
+
+        self.pending    : List[UploadScheduler.Job] = []
+        self._seq       : int = 0
+
+        # progress of the current load burst, reset once idle
+        self.total      : int = 0
+        self.done       : int = 0
+
+        # last frame stats
+        self.frame_jobs     : int = 0
+        self.frame_bytes    : int = 0
+        self.frame_time_ms  : float = 0.0
+
+    def submit( self, kind : int, index : int, nbytes : int, execute : Callable[[], None] ) -> None:
+        """Queue an upload job
+
+        :param kind: see UploadScheduler.Kind_
+        :type kind: int
+        :param index: The model or image index
+        :type index: int
+        :param nbytes: Approximate bytes transferred to the GPU
+        :type nbytes: int
+        :param execute: Performs the upload on the main thread
+        :type execute: Callable
+        """
+        self.pending.append( UploadScheduler.Job( kind, index, nbytes, execute, self._seq ) )
+        self._seq += 1
+        self.total += 1
+
+    def has_pending( self, kind : int = None ) -> bool:
+        if kind is None:
+            return bool( self.pending )
+
+        return any( job.kind == kind for job in self.pending )
+
+    @property
+    def progress( self ) -> float:
+        """Progress of the current load burst [0.0 - 1.0]"""
+        return self.done / self.total if self.total else 1.0
+
+    def _collect( self ) -> None:
+        """Move ready work from the loader queues into the pending list"""
+        models : "Models" = self.context.models
+        images : "Images" = self.context.images
+
+        while not models.model_ready_queue.empty():
+            index, cpu_meshes = models.model_ready_queue.get()
+            nbytes = sum( m.combined.nbytes + m.indices.nbytes for m in cpu_meshes )
+
+            self.submit( UploadScheduler.Kind_.model, index, nbytes,
+                lambda index=index, cpu_meshes=cpu_meshes: models.finish_load( index, cpu_meshes ) )
+
+        while not images.upload_queue.empty():
+            item = images.upload_queue.get()
+            nbytes = len( item.base.buffer ) + sum( len(mip[2]) for mip in ( item.base.mips or [] ) )
+
+            self.submit( UploadScheduler.Kind_.texture, item.image_index, nbytes,
+                lambda item=item: images.upload( item ) )
+
+    def _sort( self ) -> None:
+        """Order pending jobs: selected object first, then models nearest to the camera, then textures smallest first"""
+        if len(self.pending) < 2:
+            return
+
+        selected = getattr( self.context.gui, "selectedObject", None )
+        selected_model = selected.model.handle if selected is not None and getattr( selected, "model", None ) else -1
+
+        # nearest instance distance per model handle
+        camera_pos = np.array( self.context.camera.camera_pos, dtype=np.float32 )
+        distance = {}
+
+        for model in self.context.world.models.values():
+            if model.gameObject is None or model.gameObject.transform is None:
+                continue
+
+            d = float( np.linalg.norm( np.array( model.gameObject.transform.position, dtype=np.float32 ) - camera_pos ) )
+            distance[model.handle] = min( d, distance.get( model.handle, d ) )
+
+        def key( job : UploadScheduler.Job ):
+            if job.kind == UploadScheduler.Kind_.model:
+                return ( 0 if job.index == selected_model else 1, distance.get( job.index, float("inf") ), job.seq )
+
+            return ( 2, job.nbytes, job.seq )
+
+        self.pending.sort( key=key )
+
+    def flush( self ) -> None:
+        """Execute pending uploads within the per-frame time and byte budget.
+        At least one job runs each frame, so progress is guaranteed."""
+        self.context.images.poll_uploads()
+        self._collect()
+
+        self.frame_jobs     = 0
+        self.frame_bytes    = 0
+        self.frame_time_ms  = 0.0
+
+        if not self.pending:
+            self.total = self.done = 0
+            return
+
+        self._sort()
+
+        budget_s    = self.settings.upload_budget_ms / 1000.0
+        budget_b    = self.settings.upload_budget_bytes
+        start       = time.perf_counter()
+        executed    = 0
+
+        for job in self.pending:
+            if executed and ( time.perf_counter() - start >= budget_s or self.frame_bytes + job.nbytes > budget_b ):
+                break
+
+            executed            += 1
+            self.frame_bytes    += job.nbytes
+
+            # a failed upload is dropped, the model or image keeps its default
+            try:
+                job.execute()
+
+            except Exception as e:
+                _, _, exc_tb = sys.exc_info()
+                self.console.error( e, traceback.format_tb( exc_tb ) )
+
+        del self.pending[:executed]
+
+        self.done          += executed
+        self.frame_jobs     = executed
+        self.frame_time_ms  = ( time.perf_counter() - start ) * 1000.0
@@ -31,7 +31,7 @@ from modules.gui.sceneSettings import SceneSettings
 from modules.gui.viewport import Viewport
 from modules.gui.rendererInfo import RendererInfo
 
-import pybullet as p
+import modules.physicsApi as p
 
 class UserInterface( Context ):
 
@@ -115,7 +115,7 @@ class UserInterface( Context ):
                     continue
                 
                 icon_id = path.name.replace( path.suffix, "")
-                self.icons[f".{icon_id}"] = self.context.images.loadOrFindFullPath( path, flip_y=False )
+                self.icons[f".{icon_id}"] = self.context.images.acquire( self.context.images.loadOrFindFullPath( path, flip_y=False ) )
 
     # https://github.com/pyimgui/pyimgui/blob/9adcc0511c5ce869c39ced7a2b423aa641f3e7c6/doc/examples/integrations_glfw3_docking.py#L10
     def docking_space(self, name: str):
@@ -246,6 +246,24 @@ class UserInterface( Context ):
 
                 imgui.menu_item( f"{frame_time:.3f} ms/frame ({fps:.1f} FPS)", "", False, False  )
 
+                gl_state = self.renderer.state
+                imgui.menu_item( f"GL calls {gl_state.frame_issued} ({gl_state.frame_skipped} skipped)", "", False, False )
+
+                if not self.renderer.USE_INDIRECT:
+                    imgui.menu_item( f"Draws {self.renderer.simple_draw_calls} ({self.renderer.simple_draw_items} items)", "", False, False )
+
+                if self.renderer.game_running:
+                    if self.renderer.physics_server:
+                        imgui.menu_item( f"Physics server", "", False, False )
+                    else:
+                        physics_time = self.renderer.physics_time
+                        dropped = f" ({physics_time.dropped:.2f}s dropped)" if physics_time.dropped > 0.0 else ""
+                        imgui.menu_item( f"Physics {physics_time.steps} steps {physics_time.step_time:.2f} ms{dropped}", "", False, False )
+
+                uploads = self.context.uploads
+                if uploads.has_pending():
+                    imgui.menu_item( f"Uploading {uploads.done}/{uploads.total} ({uploads.progress * 100.0:.0f}%)", "", False, False )
+
                 imgui.end_menu_bar()
             imgui.end()
 
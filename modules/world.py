@@ -58,8 +58,13 @@ class World( Context ):
         self.physics_bases.clear()
         self.physic_links.clear()
 
+        self.context.transform_system.invalidate()
+        self.context.update_scheduler.clear()
+
     def addGameObject( self, obj : GameObject ) -> GameObject:
         self.gameObjects[obj.uuid] = obj
+        self.context.transform_system.invalidate()
+        self.context.update_scheduler.add( obj )
         return obj
 
     def addEmptyGameObject( self ) -> GameObject:
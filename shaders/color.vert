@@ -1,8 +1,8 @@
 #version 330 core
 
+#include "common_structs.glsl"
+
 uniform mat4 uMMatrix;
-uniform mat4 uVMatrix;
-uniform mat4 uPMatrix;
 
 uniform vec4 uColor;
 
@@ -1,3 +1,23 @@
+// per-frame camera and scene state shared by every program, see UBO.FrameUBO
+// older GLSL versions get the binding point from the application
+#define FRAME_UNIFORMS_BINDING 2
+
+#if __VERSION__ >= 420
+layout( std140, binding = FRAME_UNIFORMS_BINDING ) uniform FrameUniforms
+#else
+layout( std140 ) uniform FrameUniforms
+#endif
+{
+	mat4 uVMatrix;			// camera view
+	mat4 uPMatrix;			// camera projection
+	mat4 uLightVMatrix;		// shadowmap view
+	mat4 uLightPMatrix;		// shadowmap projection
+	vec4 u_ViewOrigin;		// camera position
+	vec4 in_lightdir;		// sun direction
+	vec4 in_lightcolor;		// sun color
+	vec4 in_ambientcolor;
+};
+
 struct ObjectBlock
 {
 	mat4 model;        // 64 bytes
@@ -0,0 +1,20 @@
+#version 330 core
+
+#include "common_structs.glsl"
+
+// 0: world space lines, 1: instanced shapes and meshes
+uniform int uInstanced;
+
+layout(location = 0) in vec3 aVertex;
+layout(location = 5) in mat4 aModelMatrix;	// per instance, locations 5-8
+layout(location = 9) in vec4 aColor;		// per vertex (lines) or per instance
+
+out vec4 var_Color;
+
+void main()
+{
+	mat4 model = ( uInstanced != 0 ) ? aModelMatrix : mat4( 1.0 );
+
+	gl_Position = ( uPMatrix * uVMatrix * model ) * vec4( aVertex, 1.0 );
+	var_Color = aColor;
+}
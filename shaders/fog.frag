@@ -3,17 +3,14 @@
 in vec2 fragTexCoord;
 out vec4 out_color;
 
-uniform mat4 uVMatrix;
-uniform mat4 uPMatrix;
-
-uniform vec4 u_ViewOrigin;
+#include "common_structs.glsl"
 
 uniform float ufogDensity;
 uniform float ufogHeight;
 uniform float ufogFalloff;
 uniform int ufogLightsContrib;
 
-uniform vec4 in_lightcolor;
+uniform vec4 ufogColor;
 
 uniform sampler2D sColorTexture;
 uniform sampler2D sDepthTexture;
@@ -128,7 +125,7 @@ void main()
     vec3 viewPos    = reconstructViewPos(fragTexCoord, depth);
     vec3 worldPos   = (inverse(uVMatrix) * vec4(viewPos, 1.0)).xyz;
     vec3 cameraPos  = u_ViewOrigin.xyz;
-    vec3 fogColor   = in_lightcolor.rgb;
+    vec3 fogColor   = ufogColor.rgb;
 
     // additive
     if(ufogLightsContrib == 1)
@@ -10,6 +10,8 @@ precision highp float;
 
 #define PI 3.1415926535897932384626433832795
 
+#include "common_structs.glsl"
+
 uniform samplerCube sEnvironment;
 uniform sampler2D sBRDF;
 #ifdef USE_SHADOWMAP
@@ -37,9 +39,13 @@ flat in int var_material_index;
 
 out vec4 out_color;
 
-uniform vec4 u_ViewOrigin;
 uniform int in_renderMode;
 
+// environment: prefiltered specular mip chain and SH irradiance
+uniform float in_envMaxLod;
+uniform int in_shEnabled;
+uniform vec3 u_SH[9];
+
 #define LIGHT_TYPE_DIRECTIONAL	0
 #define LIGHT_TYPE_SPOT			1
 #define LIGHT_TYPE_AREA			2
@@ -203,12 +209,31 @@ vec3 CalcIBLContribution( in float roughness, in vec3 N, in vec3 E,
 	vec3 R = reflect(-E, N);
 	R.y *= -1.0f;
 	
-	vec3 cubeLightColor = textureLod(sEnvironment, R, roughness * 6).rgb * 1.0;
+	vec3 cubeLightColor = textureLod(sEnvironment, R, roughness * in_envMaxLod).rgb * 1.0;
 	vec2 EnvBRDF = texture(sBRDF, vec2(NE, 1.0 - roughness)).rg;
 
 	return cubeLightColor * (specular.rgb * EnvBRDF.x + EnvBRDF.y);
 }
 
+// Ramamoorthi & Hanrahan, irradiance from 9 radiance SH coefficients
+vec3 CalcSHIrradiance( in vec3 N )
+{
+	const float c1 = 0.429043;
+	const float c2 = 0.511664;
+	const float c3 = 0.743125;
+	const float c4 = 0.886227;
+	const float c5 = 0.247708;
+
+	vec3 n = vec3(N.x, -N.y, N.z);
+
+	return c1 * u_SH[8] * (n.x * n.x - n.y * n.y)
+		 + c3 * u_SH[6] * n.z * n.z
+		 + c4 * u_SH[0]
+		 - c5 * u_SH[6]
+		 + 2.0 * c1 * (u_SH[4] * n.x * n.y + u_SH[7] * n.x * n.z + u_SH[5] * n.y * n.z)
+		 + 2.0 * c2 * (u_SH[3] * n.x + u_SH[1] * n.y + u_SH[2] * n.z);
+}
+
 float CalcLightAttenuation(float normDist)
 {
 	// zero light at 1.0, approximating q3 style
@@ -357,6 +382,10 @@ void main()
 		specular.rgb = vec3(var_metallicOverride);
 	}
 
+	if ( in_shEnabled != 0 ) {
+		ambientColor += max( CalcSHIrradiance( N ), vec3( 0.0 ) ) / PI;
+	}
+
 	ambientColor *= AO;
 
 	vec3  H  = normalize( L + E );
@@ -2,24 +2,8 @@
 
 #extension GL_ARB_shading_language_include : require
 
-#ifdef USE_INDIRECT
 #include "common_structs.glsl"
-#endif
-
-#ifndef USE_INDIRECT
-uniform mat4 uMMatrix;
-#endif
-uniform mat4 uVMatrix;
-uniform mat4 uPMatrix;
-#ifdef USE_SHADOWMAP
-uniform mat4 uLightPMatrix;
-uniform mat4 uLightVMatrix;
-#endif
-uniform vec4 u_ViewOrigin;
 
-uniform vec4 in_lightdir;
-uniform vec4 in_lightcolor;
-uniform vec4 in_ambientcolor;
 
 uniform float in_roughnessOverride;
 uniform float in_metallicOverride;
@@ -32,6 +16,9 @@ layout(location = 1) in vec2 aTexCoord;
 layout(location = 2) in vec3 aNormal;
 layout(location = 3) in vec3 aTangent;
 layout(location = 4) in vec3 aBiTangent;
+#ifndef USE_INDIRECT
+layout(location = 5) in mat4 aModelMatrix;	// per instance, locations 5-8 (see VAO.set_instance_matrices)
+#endif
 
 out vec2 vTexCoord;
 out float var_roughnessOverride;
@@ -65,6 +52,8 @@ void main(){
 #ifdef USE_INDIRECT
 	ObjectBlock d = object[instance[gl_BaseInstance + gl_InstanceID].ObjectId];
 	mat4 uMMatrix = d.model;
+#else
+	mat4 uMMatrix = aModelMatrix;
 #endif
 
     gl_Position = (uPMatrix * uVMatrix * uMMatrix) * vec4(position, 1.0);
@@ -2,17 +2,12 @@
 
 #extension GL_ARB_shading_language_include : require
 
-#ifdef USE_INDIRECT
 #include "common_structs.glsl"
-#endif
 
 #ifndef USE_INDIRECT
 uniform mat4 uMMatrix;
 #endif
 
-uniform mat4 uVMatrix;
-uniform mat4 uPMatrix;
-
 layout(location = 0) in vec3 aVertex;
 
 #ifdef USE_INDIRECT
@@ -27,5 +22,5 @@ void main()
     mat4 uMMatrix = d.model;
 #endif
 
-    gl_Position = uPMatrix * uVMatrix * uMMatrix * vec4(aVertex, 1.0);
+    gl_Position = uLightPMatrix * uLightVMatrix * uMMatrix * vec4(aVertex, 1.0);
 }
\ No newline at end of file
@@ -1,8 +1,8 @@
 #version 330 core
 
+#include "common_structs.glsl"
+
 uniform mat4 uMMatrix;	// not required, keep for shader uniform location compat with general shader
-uniform mat4 uVMatrix;
-uniform mat4 uPMatrix;
  
 layout(location = 0) in vec3 aVertex;
 